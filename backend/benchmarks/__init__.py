@@ -0,0 +1 @@
+"""Ad-hoc performance benchmarks for the surface-processing backend."""
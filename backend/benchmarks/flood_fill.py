@@ -0,0 +1,59 @@
+"""Compare the labelling flood fill against the breadth-first reference.
+
+Run from the backend directory::
+
+    uv run python -m benchmarks.flood_fill
+    uv run python -m benchmarks.flood_fill --size 200 --skip-reference
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backend.geometry.surface_reconstruction import (
+    _flood_fill_outside_air_bfs,
+    flood_fill_outside_air,
+)
+
+
+def make_workspace_air(size: int) -> np.ndarray:
+    # A thick spherical shell with an enclosed cavity, similar to a sampled reach envelope.
+    axis = np.linspace(-1.0, 1.0, size, dtype=np.float32)
+    x, y, z = np.meshgrid(axis, axis, axis, indexing="ij", sparse=True)
+    radius = np.sqrt(x * x + y * y + z * z)
+    solid = (radius > 0.55) & (radius < 0.8)
+    return ~solid
+
+
+def _time(fn, air: np.ndarray) -> tuple[float, np.ndarray]:
+    start = time.perf_counter()
+    result = fn(air)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, nargs="+", default=[120, 200])
+    parser.add_argument("--skip-reference", action="store_true")
+    args = parser.parse_args()
+
+    # Warm up scipy's imports and first-call setup outside the timings.
+    flood_fill_outside_air(make_workspace_air(8))
+    for size in args.size:
+        air = make_workspace_air(size)
+        label_seconds, outside = _time(flood_fill_outside_air, air)
+        print(f"grid={size}^3 label={label_seconds:.3f}s")
+
+        if not args.skip_reference:
+            bfs_seconds, reference = _time(_flood_fill_outside_air_bfs, air)
+            speedup = bfs_seconds / label_seconds
+            print(f"grid={size}^3 bfs={bfs_seconds:.3f}s speedup={speedup:.1f}x")
+            if not np.array_equal(outside, reference):
+                raise SystemExit(f"outside masks differ at {size}^3")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare the copying PCD2 upload decode against decoding into the assembly.
+
+Run from the backend directory::
+
+    uv run python -m benchmarks.pcd2_decode --points 8000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from backend.geometry.pointcloud_transport import (
+    PcdAssembly,
+    decode_pcd2_chunk,
+    decode_pcd2_header,
+    iter_encoded_pcd2_chunks,
+)
+
+
+def decode_via_chunks(payloads: list[bytes]) -> np.ndarray:
+    # The previous upload path: copy out of the payload, copy into qbuf, then
+    # convert with a temporary per arithmetic step.
+    first = decode_pcd2_chunk(payloads[0])
+    qbuf = np.empty((first.total_points, 3), dtype=np.uint16)
+    for payload in payloads:
+        chunk = decode_pcd2_chunk(payload)
+        qbuf[chunk.start_index:chunk.start_index + chunk.point_count, :] = chunk.quantized_points
+    return first.minv[None, :] + qbuf.astype(np.float32) * first.scale[None, :]
+
+
+def decode_into_assembly(payloads: list[bytes]) -> np.ndarray:
+    assembly = PcdAssembly.from_header(decode_pcd2_header(payloads[0]))
+    for payload in payloads:
+        points = assembly.add_payload(payload)
+    return points
+
+
+def _measure(fn, payloads: list[bytes], repeats: int) -> tuple[float, int, np.ndarray]:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(payloads)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(payloads)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=8_000_000)
+    parser.add_argument("--chunk-points", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-2.0, 2.0, size=(args.points, 3)).astype(np.float32)
+    payloads = [
+        payload
+        for payload, _ in iter_encoded_pcd2_chunks(points, chunk_points=args.chunk_points, seq_id=1)
+    ]
+    total_bytes = sum(len(payload) for payload in payloads)
+
+    results = []
+    for name, fn in (("chunks", decode_via_chunks), ("into", decode_into_assembly)):
+        seconds, peak, result = _measure(fn, payloads, args.repeats)
+        results.append(result)
+        print(
+            f"{name:>6}: {seconds:.3f}s {total_bytes / seconds / 1e6:.0f} MB/s "
+            f"peak_alloc={peak / 1e6:.0f} MB"
+        )
+    if not np.array_equal(results[0], results[1]):
+        raise SystemExit("decoded points differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Measure event-loop lag while a surface job runs in a thread or a worker process.
+
+Run from the backend directory::
+
+    uv run python -m benchmarks.surface_event_loop_lag --points 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from backend.geometry.surface_reconstruction import compute_surface_points_from_xyz
+from backend.runtime.surface_worker import SurfaceReconstructionWorker
+
+
+def make_shell_points(count: int, radius: float = 0.5) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    directions = rng.normal(size=(count, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    radii = radius * (1.0 + 0.05 * rng.random((count, 1)))
+    return (directions * radii).astype(np.float32)
+
+
+async def _measure_lag(stop: asyncio.Event, interval: float) -> list[float]:
+    lags = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+    return lags
+
+
+async def _run(mode: str, points: np.ndarray, options: dict, interval: float) -> None:
+    worker = SurfaceReconstructionWorker() if mode == "process" else None
+    if worker is not None:
+        # Spawn the worker up front so the measurement excludes interpreter start-up.
+        await worker.run(points[:1000], min_points=1, **options)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_lag(stop, interval))
+    start = time.perf_counter()
+    try:
+        if worker is None:
+            await asyncio.to_thread(compute_surface_points_from_xyz, points, **options)
+        else:
+            await worker.run(points, **options)
+    finally:
+        elapsed = time.perf_counter() - start
+        stop.set()
+        lags = np.asarray(await lag_task) * 1000.0
+        if worker is not None:
+            worker.shutdown()
+
+    print(
+        f"mode={mode} job={elapsed:.2f}s ticks={lags.size} "
+        f"lag_p50={np.percentile(lags, 50):.1f}ms lag_p99={np.percentile(lags, 99):.1f}ms "
+        f"lag_max={lags.max():.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=500_000)
+    parser.add_argument("--voxel-size", type=float, default=0.01)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--mode", choices=["thread", "process", "both"], default="both")
+    args = parser.parse_args()
+
+    points = make_shell_points(args.points)
+    options = {
+        "voxel_size": args.voxel_size,
+        "sigma": 2 * args.voxel_size,
+        "field_band_sigmas": 3.0,
+    }
+    modes = ["thread", "process"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        asyncio.run(_run(mode, points, options, args.interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""Time the surface pipeline, the point cloud codecs and the surface websocket
+on synthetic workspaces, and write the results as JSON for diffing.
+
+Run from the backend directory::
+
+    uv run python -m benchmarks.surface_suite --preset low --output low.json
+    uv run python -m benchmarks.surface_suite --preset high --workspace envelope --websocket
+    uv run python -m benchmarks.surface_suite --preset low --compare low.json
+
+``--points-scale`` shrinks every preset's point count for quick runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Self
+
+import numpy as np
+
+from backend.geometry.pointcloud_transport import (
+    PcdAssembly,
+    decode_pcd2_header,
+    iter_encoded_pcd_chunks,
+)
+from backend.geometry.surface_reconstruction import (
+    SurfaceReconstructionStats,
+    _max_rss_bytes,
+    compute_surface_points_from_xyz,
+)
+from benchmarks.workspaces import PRESETS, WORKSPACES
+
+# The frontend's upload chunk size and its reconstruction settings above 750k points.
+UPLOAD_CHUNK_POINTS = 200_000
+RECONSTRUCTION_OPTIONS = {
+    "sigma": 0.02,
+    "iso_level": 0.3,
+    "padding": 0.05,
+    "closing_radius": 0,
+    "min_points": 200,
+    "map_mode": "nn",
+}
+
+
+def _current_rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class RssSampler:
+    """Samples resident memory in a thread so each stage gets its own peak."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.peak = _current_rss_bytes() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            rss = _current_rss_bytes()
+            if rss is not None:
+                self.peak = max(self.peak, rss)
+
+    def take_peak(self) -> int:
+        """Peak since the previous call."""
+        peak = max(self.peak, _current_rss_bytes() or 0)
+        self.peak = _current_rss_bytes() or 0
+        return peak
+
+
+def _stage_table(events: list[tuple[float, str, int]], total_seconds: float) -> dict:
+    """Pairs `<stage>_start` with the next `<stage>_done`/`_ready` event."""
+    stages: dict[str, dict[str, float | int]] = {}
+    open_stages: dict[str, tuple[float, int]] = {}
+    peak_since: dict[str, int] = {}
+    for when, name, peak in events:
+        for key in open_stages:
+            peak_since[key] = max(peak_since.get(key, 0), peak)
+        for suffix in ("_start", "_done", "_ready"):
+            if not name.endswith(suffix):
+                continue
+            stage = name[: -len(suffix)]
+            if suffix == "_start":
+                open_stages[stage] = (when, 0)
+                peak_since[stage] = 0
+            elif stage in open_stages:
+                started, _ = open_stages.pop(stage)
+                entry = stages.setdefault(stage, {"seconds": 0.0, "peak_rss_bytes": 0})
+                entry["seconds"] += when - started
+                entry["peak_rss_bytes"] = max(entry["peak_rss_bytes"], peak_since.pop(stage))
+    setup = events[0][0] if events else total_seconds
+    stages["setup"] = {"seconds": setup, "peak_rss_bytes": events[0][2] if events else 0}
+    return stages
+
+
+def bench_reconstruction(points: np.ndarray, voxel_size: float) -> tuple[dict, np.ndarray]:
+    events: list[tuple[float, str, int]] = []
+    stats = SurfaceReconstructionStats()
+    rss_before = _current_rss_bytes()
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+
+        def status_cb(stage: str, message: str | None = None) -> None:
+            events.append((time.perf_counter() - start, stage, sampler.take_peak()))
+
+        result = compute_surface_points_from_xyz(
+            points,
+            voxel_size=voxel_size,
+            stats=stats,
+            status_cb=status_cb,
+            **RECONSTRUCTION_OPTIONS,
+        )
+        total = time.perf_counter() - start
+    return (
+        {
+            "seconds": total,
+            "result_points": int(result.shape[0]),
+            "estimated_working_set_bytes": stats.peak_working_set_bytes,
+            "rss_before_bytes": rss_before,
+            "stages": _stage_table(events, total),
+            "stage_metrics": [dataclasses.asdict(metrics) for metrics in stats.stages],
+        },
+        result,
+    )
+
+
+def bench_codec(points: np.ndarray, result_format: str, chunk_points: int) -> dict:
+    start = time.perf_counter()
+    payloads = [
+        payload
+        for payload, _chunk in iter_encoded_pcd_chunks(
+            points, result_format=result_format, chunk_points=chunk_points, seq_id=1
+        )
+    ]
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assembly = PcdAssembly.from_header(decode_pcd2_header(payloads[0]))
+    for payload in payloads:
+        assembly.add_payload(payload)
+    decode_seconds = time.perf_counter() - start
+    return {
+        "chunks": len(payloads),
+        "bytes": sum(len(payload) for payload in payloads),
+        "encode_seconds": encode_seconds,
+        "decode_seconds": decode_seconds,
+    }
+
+
+def bench_websocket(points: np.ndarray, voxel_size: float) -> dict:
+    """Upload, reconstruct in-process and download through /ws/surface."""
+    from fastapi.testclient import TestClient
+
+    from backend.app import create_app
+
+    app = create_app()
+    app.state.surface_worker = None
+    app.state.surface_cache = None
+    config = {_camel(key): value for key, value in RECONSTRUCTION_OPTIONS.items()}
+    config["voxelSize"] = voxel_size
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        start = time.perf_counter()
+        websocket.send_json({"type": "beginSurfaceUpload", "requestId": "bench", "config": config})
+        job_id = websocket.receive_json()["jobId"]
+        for payload, _chunk in iter_encoded_pcd_chunks(
+            points, result_format="pcd2", chunk_points=UPLOAD_CHUNK_POINTS, seq_id=1
+        ):
+            websocket.send_bytes(payload)
+        while websocket.receive_json()["type"] != "surfaceUploadCompleted":
+            pass
+        uploaded = time.perf_counter()
+
+        websocket.send_json({"type": "finishSurfaceUpload", "requestId": "bench", "jobId": job_id})
+        while (ready := websocket.receive_json())["type"] != "surfaceJobReady":
+            if ready["type"] == "surfaceJobError":
+                raise RuntimeError(ready["message"])
+        processed = time.perf_counter()
+
+        received_bytes = 0
+        while True:
+            message = websocket.receive()
+            if message.get("bytes") is not None:
+                received_bytes += len(message["bytes"])
+            elif json.loads(message["text"])["type"] == "surfaceResultStreamCompleted":
+                break
+        done = time.perf_counter()
+    return {
+        "upload_seconds": uploaded - start,
+        "process_seconds": processed - uploaded,
+        "download_seconds": done - processed,
+        "download_bytes": received_bytes,
+        "result_points": ready["resultPointCount"],
+    }
+
+
+def _camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def run_case(workspace: str, preset: str, *, points_scale: float, websocket: bool) -> dict:
+    spec = PRESETS[preset]
+    count = max(1000, int(spec.points * points_scale))
+    points = WORKSPACES[workspace](count)
+    case = {
+        "workspace": workspace,
+        "preset": preset,
+        "points": count,
+        "voxel_size": spec.voxel_size,
+        "upload": {
+            fmt: bench_codec(points, fmt, UPLOAD_CHUNK_POINTS) for fmt in ("pcd2", "pcd3")
+        },
+    }
+    case["reconstruction"], result = bench_reconstruction(points, spec.voxel_size)
+    case["result"] = {
+        fmt: bench_codec(result, fmt, UPLOAD_CHUNK_POINTS) for fmt in ("pcd2", "pcd3")
+    }
+    if websocket:
+        case["websocket"] = bench_websocket(points, spec.voxel_size)
+    case["max_rss_bytes"] = _max_rss_bytes() or 0
+    return case
+
+
+def _flatten(value, prefix: str = "") -> dict[str, float]:
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else key))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: float(value)}
+    return {}
+
+
+def compare(baseline: dict, current: dict) -> None:
+    """Print every numeric metric that both runs share, with its ratio."""
+    old_cases = {(c["workspace"], c["preset"]): c for c in baseline["cases"]}
+    for case in current["cases"]:
+        old = old_cases.get((case["workspace"], case["preset"]))
+        if old is None:
+            continue
+        print(f"{case['workspace']}/{case['preset']}")
+        old_flat, new_flat = _flatten(old), _flatten(case)
+        for key, value in new_flat.items():
+            if key in old_flat and old_flat[key] and key.endswith(("seconds", "bytes")):
+                print(f"  {key:<55} {old_flat[key]:>14.4g} -> {value:>14.4g} "
+                      f"({value / old_flat[key]:.2f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), action="append")
+    parser.add_argument("--workspace", choices=sorted(WORKSPACES), action="append")
+    parser.add_argument("--points-scale", type=float, default=1.0)
+    parser.add_argument("--websocket", action="store_true")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="print ratios against an earlier JSON result")
+    args = parser.parse_args()
+
+    # Pay for the lazy scipy import and first-call allocations before timing.
+    compute_surface_points_from_xyz(
+        WORKSPACES["shell"](20_000), voxel_size=0.05, **RECONSTRUCTION_OPTIONS
+    )
+    cases = []
+    for preset in args.preset or ["low"]:
+        for workspace in args.workspace or sorted(WORKSPACES):
+            case = run_case(
+                workspace, preset, points_scale=args.points_scale, websocket=args.websocket
+            )
+            reconstruction = case["reconstruction"]
+            print(
+                f"{workspace}/{preset}: points={case['points']} "
+                f"reconstruct={reconstruction['seconds']:.2f}s "
+                f"result={reconstruction['result_points']} "
+                f"max_rss={case['max_rss_bytes'] / 2**20:.0f} MiB"
+            )
+            cases.append(case)
+
+    results = {
+        "created": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "points_scale": args.points_scale,
+        "cases": cases,
+    }
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+    if args.compare:
+        with open(args.compare) as handle:
+            compare(json.load(handle), results)
+
+
+if __name__ == "__main__":
+    main()
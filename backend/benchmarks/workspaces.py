@@ -0,0 +1,98 @@
+"""Deterministic synthetic workspace clouds for the surface benchmarks.
+
+Each generator samples points uniformly inside a solid, like the frontend's
+sampled reachable tool positions, and always returns the same cloud for the
+same arguments.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class WorkspacePreset:
+    points: int
+    voxel_size: float
+
+
+# Mirrors WORKSPACE_RESOLUTIONS in the frontend's workspaceSurfaceGeneration.ts.
+PRESETS = {
+    "low": WorkspacePreset(points=1_000_000, voxel_size=0.02),
+    "medium": WorkspacePreset(points=4_000_000, voxel_size=0.015),
+    "high": WorkspacePreset(points=8_000_000, voxel_size=0.01),
+}
+
+_BATCH = 1 << 20
+
+
+def _sample_solid(
+    count: int,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    inside: Callable[[np.ndarray], np.ndarray],
+    seed: int,
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    out = np.empty((count, 3), dtype=np.float32)
+    filled = 0
+    while filled < count:
+        candidates = rng.uniform(lower, upper, size=(_BATCH, 3))
+        accepted = candidates[inside(candidates)][: count - filled]
+        out[filled:filled + accepted.shape[0]] = accepted
+        filled += accepted.shape[0]
+    return out
+
+
+def shell(count: int, *, seed: int = 0) -> np.ndarray:
+    """Thick spherical shell, r in [0.3, 0.8] m, with an unreachable core."""
+
+    def inside(p: np.ndarray) -> np.ndarray:
+        r = np.linalg.norm(p, axis=1)
+        return (r >= 0.3) & (r <= 0.8)
+
+    return _sample_solid(count, np.full(3, -0.8), np.full(3, 0.8), inside, seed)
+
+
+def torus(count: int, *, seed: int = 0) -> np.ndarray:
+    """Solid torus around z, major radius 0.6 m, tube radius 0.2 m."""
+
+    def inside(p: np.ndarray) -> np.ndarray:
+        ring = np.hypot(p[:, 0], p[:, 1]) - 0.6
+        return ring * ring + p[:, 2] * p[:, 2] <= 0.04
+
+    return _sample_solid(
+        count, np.array([-0.8, -0.8, -0.2]), np.array([0.8, 0.8, 0.2]), inside, seed
+    )
+
+
+def reach_envelope(count: int, *, seed: int = 0) -> np.ndarray:
+    """Six-axis-arm-like envelope: a shoulder-centred shell between 0.25 and
+    0.9 m, above the floor, minus a wedge behind the base and the base column."""
+    shoulder = np.array([0.0, 0.0, 0.4])
+
+    def inside(p: np.ndarray) -> np.ndarray:
+        r = np.linalg.norm(p - shoulder, axis=1)
+        azimuth = np.arctan2(p[:, 1], p[:, 0])
+        column = np.hypot(p[:, 0], p[:, 1]) < 0.12
+        return (
+            (r >= 0.25)
+            & (r <= 0.9)
+            & (p[:, 2] >= 0.0)
+            & (np.abs(azimuth) <= np.deg2rad(150.0))
+            & ~column
+        )
+
+    return _sample_solid(
+        count, np.array([-0.9, -0.9, 0.0]), np.array([0.9, 0.9, 1.3]), inside, seed
+    )
+
+
+WORKSPACES = {
+    "shell": shell,
+    "torus": torus,
+    "envelope": reach_envelope,
+}
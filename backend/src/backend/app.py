@@ -1,17 +1,89 @@
 from __future__ import annotations
+import asyncio
+import contextlib
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from backend.geometry.surface_reconstruction import shutdown_tile_pool
+from backend.runtime.surface_cache import SurfaceCache
+from backend.runtime.surface_scheduler import SurfaceJobScheduler
+from backend.runtime.surface_worker import SurfaceReconstructionWorker
 from backend.services.runtime_registry import RuntimeRegistry
 from backend.websocket.router import websocket_endpoint
 from backend.websocket.surface_router import websocket_surface_endpoint
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sweeper = asyncio.create_task(
+        sweep_detached_surface_uploads(app.state.registry, surface_upload_ttl_seconds())
+    )
+    yield
+    sweeper.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await sweeper
+    worker = getattr(app.state, "surface_worker", None)
+    if worker is not None:
+        worker.shutdown()
+    shutdown_tile_pool()
+
+
+def surface_upload_ttl_seconds() -> float:
+    # How long an upload whose connection dropped stays resumable.
+    return float(os.getenv("SURFACE_UPLOAD_TTL_SECONDS", "600"))
+
+
+async def sweep_detached_surface_uploads(registry: RuntimeRegistry, ttl_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(max(1.0, ttl_seconds / 4))
+        registry.expire_detached_surface_jobs(ttl_seconds)
+
+
+def surface_cache_options() -> dict[str, object] | None:
+    # SURFACE_CACHE_MB=0 without SURFACE_CACHE_DIR turns the reconstruction cache off.
+    mib = 1024 * 1024
+    max_mb = float(os.getenv("SURFACE_CACHE_MB", "512"))
+    spill_dir = os.getenv("SURFACE_CACHE_DIR") or None
+    if max_mb <= 0 and spill_dir is None:
+        return None
+    spill_mb = os.getenv("SURFACE_CACHE_SPILL_MB")
+    return {
+        "max_bytes": int(max(0.0, max_mb) * mib),
+        "spill_dir": spill_dir,
+        "spill_max_bytes": int(float(spill_mb) * mib) if spill_mb else None,
+    }
+
+
+def create_surface_worker(
+    cache_options: dict[str, object] | None = None,
+) -> SurfaceReconstructionWorker | None:
+    # SURFACE_WORKER_PROCESSES=0 keeps reconstruction in a thread of the server process.
+    processes = int(os.getenv("SURFACE_WORKER_PROCESSES", "1"))
+    if processes <= 0:
+        return None
+    return SurfaceReconstructionWorker(max_workers=processes, cache_options=cache_options)
+
+
+def create_surface_scheduler(
+    worker: SurfaceReconstructionWorker | None,
+) -> SurfaceJobScheduler:
+    # Defaults to one reconstruction slot per worker process.
+    default_slots = worker.max_workers if worker is not None else 1
+    slots = int(os.getenv("SURFACE_JOB_SLOTS", str(default_slots)))
+    return SurfaceJobScheduler(slots=max(1, slots))
+
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="WebSkillComposition 2 Backend")
+    app = FastAPI(title="WebSkillComposition 2 Backend", lifespan=lifespan)
     app.state.registry = RuntimeRegistry()
+    cache_options = surface_cache_options()
+    app.state.surface_worker = create_surface_worker(cache_options)
+    app.state.surface_scheduler = create_surface_scheduler(app.state.surface_worker)
+    # Used when reconstruction runs in-process; worker processes keep their own.
+    app.state.surface_cache = SurfaceCache(**cache_options) if cache_options else None
     app.add_api_websocket_route("/ws", websocket_endpoint)
     app.add_api_websocket_route("/ws/surface", websocket_surface_endpoint)
 
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+
+def _require_scipy():
+    try:
+        from scipy import ndimage
+        from scipy.spatial import cKDTree
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            "Surface reconstruction requires scipy. Install the backend surface-processing dependencies."
+        ) from exc
+    return cKDTree, ndimage
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.geometry.pointcloud_transport import _quantize
+from backend.geometry.surface_mesh import SurfaceMesh
+
+# MSH1 streams an indexed triangle mesh: every vertex chunk comes first, as
+# uint16 xyz quantized over the mesh bounds (like PCD2), followed by triangle
+# chunks of raw uint32 vertex indices. `start_index`/`item_count` count
+# vertices or triangles depending on `kind`; both kinds share one chunk count.
+MESH_MAGIC = b"MSH1"
+MESH_HEADER_FORMAT = "<4s7I6fB3x"
+MESH_HEADER_SIZE = struct.calcsize(MESH_HEADER_FORMAT)
+MESH_KIND_VERTICES = 0
+MESH_KIND_TRIANGLES = 1
+
+
+@dataclass(slots=True)
+class MeshChunkHeader:
+    seq_id: int
+    chunk_index: int
+    chunk_count: int
+    total_vertices: int
+    total_triangles: int
+    start_index: int
+    item_count: int
+    minv: np.ndarray
+    scale: np.ndarray
+    kind: int
+
+
+def _item_chunks(total: int, chunk_items: int) -> int:
+    return (int(total) + chunk_items - 1) // chunk_items
+
+
+def mesh_chunk_count(
+    vertex_count: int, triangle_count: int, *, vertex_chunk: int, triangle_chunk: int
+) -> int:
+    return _item_chunks(vertex_count, vertex_chunk) + _item_chunks(triangle_count, triangle_chunk)
+
+
+def iter_encoded_mesh_chunks(
+    mesh: SurfaceMesh,
+    *,
+    vertex_chunk: int,
+    triangle_chunk: int,
+    seq_id: int,
+):
+    """Yield `(payload, chunk)` pairs, vertex chunks first, then triangle chunks."""
+    vertices = np.asarray(mesh.vertices, dtype=np.float32)
+    triangles = np.ascontiguousarray(mesh.triangles, dtype=np.uint32)
+    total_vertices = int(vertices.shape[0])
+    total_triangles = int(triangles.shape[0])
+    if total_vertices <= 0:
+        return
+
+    minv = vertices.min(axis=0)
+    scale = np.maximum(vertices.max(axis=0) - minv, 1e-9) / 65535.0
+    chunk_count = mesh_chunk_count(
+        total_vertices,
+        total_triangles,
+        vertex_chunk=vertex_chunk,
+        triangle_chunk=triangle_chunk,
+    )
+    parts = [
+        (MESH_KIND_VERTICES, start, min(start + vertex_chunk, total_vertices))
+        for start in range(0, total_vertices, vertex_chunk)
+    ] + [
+        (MESH_KIND_TRIANGLES, start, min(start + triangle_chunk, total_triangles))
+        for start in range(0, total_triangles, triangle_chunk)
+    ]
+    for chunk_index, (kind, start, end) in enumerate(parts):
+        if kind == MESH_KIND_VERTICES:
+            data = _quantize(vertices[start:end], minv, scale).tobytes(order="C")
+        else:
+            data = triangles[start:end].tobytes(order="C")
+        header = struct.pack(
+            MESH_HEADER_FORMAT,
+            MESH_MAGIC,
+            seq_id,
+            chunk_index,
+            chunk_count,
+            total_vertices,
+            total_triangles,
+            start,
+            end - start,
+            *(float(value) for value in minv),
+            *(float(value) for value in scale),
+            kind,
+        )
+        chunk = {
+            "chunk_index": chunk_index,
+            "kind": kind,
+            "start_index": start,
+            "item_count": end - start,
+        }
+        yield header + data, chunk
+
+
+def _mesh_item_bytes(kind: int) -> int:
+    return 3 * (2 if kind == MESH_KIND_VERTICES else 4)
+
+
+def decode_mesh_header(payload: bytes | bytearray | memoryview) -> MeshChunkHeader:
+    """Parse and check an MSH1 chunk header, including its data length."""
+    if len(payload) < MESH_HEADER_SIZE:
+        raise ValueError(f"MSH1 payload too small: expected at least {MESH_HEADER_SIZE} bytes.")
+    magic, *values, kind = struct.unpack_from(MESH_HEADER_FORMAT, payload, 0)
+    if magic != MESH_MAGIC:
+        raise ValueError("MSH1 payload has invalid magic header.")
+    if kind not in (MESH_KIND_VERTICES, MESH_KIND_TRIANGLES):
+        raise ValueError(f"MSH1 payload has unknown chunk kind {kind}.")
+    (
+        seq_id,
+        chunk_index,
+        chunk_count,
+        total_vertices,
+        total_triangles,
+        start_index,
+        item_count,
+        minx,
+        miny,
+        minz,
+        scalex,
+        scaley,
+        scalez,
+    ) = values
+    expected_data_len = int(item_count) * _mesh_item_bytes(kind)
+    data_len = len(payload) - MESH_HEADER_SIZE
+    if data_len != expected_data_len:
+        raise ValueError(
+            f"MSH1 payload has wrong data length: got {data_len}, expected {expected_data_len}."
+        )
+    return MeshChunkHeader(
+        seq_id=int(seq_id),
+        chunk_index=int(chunk_index),
+        chunk_count=int(chunk_count),
+        total_vertices=int(total_vertices),
+        total_triangles=int(total_triangles),
+        start_index=int(start_index),
+        item_count=int(item_count),
+        minv=np.array([minx, miny, minz], dtype=np.float32),
+        scale=np.array([scalex, scaley, scalez], dtype=np.float32),
+        kind=int(kind),
+    )
+
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import numpy as np
+
+from backend.geometry._scipy import _require_scipy
+
+_DOWNSAMPLE_MODES = ("representative", "centroid")
+_QUERY_BATCH = 1 << 16
+
+
+def _voxel_cells(points: np.ndarray, voxel_size: float) -> tuple[np.ndarray, int]:
+    """Dense cell index per point and the number of occupied cells.
+
+    Cells are aligned to the world origin, so the same region always maps to
+    the same cells regardless of the cloud's extent.
+    """
+    cells = np.floor(points / voxel_size).astype(np.int64)
+    cells -= cells.min(axis=0)
+    dims = cells.max(axis=0) + 1
+    keys = np.ravel_multi_index(cells.T, tuple(int(d) for d in dims))
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return inverse.ravel(), int(unique.shape[0])
+
+
+def voxel_downsample(
+    points: np.ndarray,
+    voxel_size: float,
+    *,
+    mode: str = "representative",
+) -> np.ndarray:
+    """Keep one point per occupied `voxel_size` cell.
+
+    `representative` keeps the input point closest to its cell's centroid, so
+    the result is still a subset of `points`; `centroid` returns the centroids.
+    """
+    if voxel_size <= 0.0:
+        raise ValueError("voxel_size must be > 0.")
+    if mode not in _DOWNSAMPLE_MODES:
+        raise ValueError(f"mode must be one of {_DOWNSAMPLE_MODES}, got {mode!r}.")
+    pts = np.asarray(points, dtype=np.float32)
+    if pts.shape[0] == 0:
+        return pts
+
+    inverse, cell_count = _voxel_cells(pts, float(voxel_size))
+    counts = np.bincount(inverse, minlength=cell_count).astype(np.float64)
+    centroids = np.empty((cell_count, 3), dtype=np.float64)
+    for axis in range(3):
+        centroids[:, axis] = np.bincount(inverse, weights=pts[:, axis], minlength=cell_count)
+    centroids /= counts[:, None]
+    if mode == "centroid":
+        return centroids.astype(np.float32)
+
+    offsets = pts - centroids[inverse]
+    distances = np.einsum("ij,ij->i", offsets, offsets)
+    order = np.lexsort((distances, inverse))
+    firsts = np.ones(order.shape[0], dtype=bool)
+    firsts[1:] = inverse[order[1:]] != inverse[order[:-1]]
+    return pts[np.sort(order[firsts])]
+
+
+def statistical_outlier_mask(
+    points: np.ndarray,
+    *,
+    neighbors: int = 8,
+    std_ratio: float = 2.0,
+    tree=None,
+    checkpoint=None,
+) -> np.ndarray:
+    """Mask of points whose mean distance to their `neighbors` nearest points is
+    at most `std_ratio` standard deviations above the cloud-wide mean.
+
+    Neighbours are queried in batches; `checkpoint(done, total)` runs before each.
+    """
+    if neighbors < 1:
+        raise ValueError("neighbors must be >= 1.")
+    pts = np.asarray(points, dtype=np.float32)
+    count = pts.shape[0]
+    if count <= neighbors:
+        return np.ones(count, dtype=bool)
+    if tree is None:
+        cKDTree, _ndimage = _require_scipy()
+        tree = cKDTree(pts)
+
+    mean_distances = np.empty(count, dtype=np.float64)
+    for start in range(0, count, _QUERY_BATCH):
+        if checkpoint is not None:
+            checkpoint(start, count)
+        end = min(start + _QUERY_BATCH, count)
+        distances, _indices = tree.query(pts[start:end], k=neighbors + 1, workers=-1)
+        # The first neighbour is the point itself.
+        mean_distances[start:end] = distances[:, 1:].mean(axis=1)
+    threshold = mean_distances.mean() + std_ratio * mean_distances.std()
+    return mean_distances <= threshold
+
+
+def estimate_normals(
+    points: np.ndarray,
+    cloud: np.ndarray,
+    *,
+    neighbors: int = 16,
+    tree=None,
+    checkpoint=None,
+) -> np.ndarray:
+    """Unit normals at `points` from a PCA of their `neighbors` nearest `cloud` points.
+
+    Each normal is the eigenvector of the smallest eigenvalue of the local
+    covariance, so its sign is arbitrary. `tree` must be built over `cloud`;
+    neighbours are queried and decomposed in batches, and `checkpoint(done,
+    total)` runs before each batch.
+    """
+    if neighbors < 3:
+        raise ValueError("neighbors must be >= 3.")
+    pts = np.asarray(points, dtype=np.float32)
+    ref = np.asarray(cloud, dtype=np.float32)
+    count = pts.shape[0]
+    normals = np.zeros((count, 3), dtype=np.float32)
+    k = min(int(neighbors), ref.shape[0])
+    if count == 0 or k < 3:
+        return normals
+    if tree is None:
+        cKDTree, _ndimage = _require_scipy()
+        tree = cKDTree(ref)
+
+    for start in range(0, count, _QUERY_BATCH):
+        if checkpoint is not None:
+            checkpoint(start, count)
+        end = min(start + _QUERY_BATCH, count)
+        _distances, indices = tree.query(pts[start:end], k=k, workers=-1)
+        local = ref[indices].astype(np.float64)
+        local -= local.mean(axis=1, keepdims=True)
+        covariance = np.einsum("bki,bkj->bij", local, local)
+        # eigh sorts eigenvalues ascending, so column 0 is the surface normal.
+        _values, vectors = np.linalg.eigh(covariance)
+        normals[start:end] = vectors[:, :, 0]
+    return normals
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import lzma
 import struct
+import zlib
 from dataclasses import dataclass
 
 import numpy as np
@@ -10,6 +13,39 @@ PCD_MAGIC = b"PCD2"
 PCD_HEADER_FORMAT = "<4s6I6f"
 PCD_HEADER_SIZE = struct.calcsize(PCD_HEADER_FORMAT)
 
+# PCD3 keeps the PCD2 header and appends codec and word-size bytes. Its payload
+# is the chunk's quantized points as zigzag-coded per-axis deltas, split into a
+# low byte plane and a bit-packed high plane, and compressed.
+PCD3_MAGIC = b"PCD3"
+PCD3_HEADER_FORMAT = "<4s6I6fBB2x"
+PCD3_HEADER_SIZE = struct.calcsize(PCD3_HEADER_FORMAT)
+PCD_CODEC_NONE = 0
+PCD_CODEC_ZLIB = 1
+PCD_CODEC_LZMA = 2
+_PCD3_CODECS = {"zlib": PCD_CODEC_ZLIB, "lzma": PCD_CODEC_LZMA}
+# Word sizes tried, smallest first, when chunk-local bounds meet a precision target.
+PCD_PACKED_BITS = (8, 10, 16)
+
+# NRM1 frames follow the point chunk they belong to and carry one octahedral
+# int16 pair per point, in the same order as that chunk's points.
+NRM_MAGIC = b"NRM1"
+NRM_HEADER_FORMAT = "<4s4I"
+NRM_HEADER_SIZE = struct.calcsize(NRM_HEADER_FORMAT)
+
+
+@dataclass(slots=True)
+class Pcd2ChunkHeader:
+    seq_id: int
+    chunk_index: int
+    chunk_count: int
+    total_points: int
+    start_index: int
+    point_count: int
+    minv: np.ndarray
+    scale: np.ndarray
+    codec: int = PCD_CODEC_NONE
+    bits: int = 16
+
 
 @dataclass(slots=True)
 class DecodedPcdChunk:
@@ -24,12 +60,97 @@ class DecodedPcdChunk:
     quantized_points: np.ndarray
 
 
+@dataclass(slots=True)
+class DecodedNormalChunk:
+    seq_id: int
+    chunk_index: int
+    start_index: int
+    point_count: int
+    normals: np.ndarray
+
+
+def pcd2_chunk_count(total_points: int, chunk_points: int) -> int:
+    return (int(total_points) + chunk_points - 1) // chunk_points
+
+
+def _part1by2(values: np.ndarray) -> np.ndarray:
+    v = values.astype(np.uint64)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FF0000FF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00F00F00F00F)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0C30C30C30C3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x249249249249)
+    return v
+
+
+def morton_order(quantized: np.ndarray) -> np.ndarray:
+    """Indices that sort uint16 xyz triplets along a Z-order curve."""
+    q = np.asarray(quantized, dtype=np.uint16)
+    codes = _part1by2(q[:, 0])
+    codes |= _part1by2(q[:, 1]) << np.uint64(1)
+    codes |= _part1by2(q[:, 2]) << np.uint64(2)
+    return np.argsort(codes, kind="stable")
+
+
+def octahedral_encode(normals: np.ndarray) -> np.ndarray:
+    """Unit vectors as int16 (u, v) pairs on the octahedron, folded for z < 0."""
+    n = np.asarray(normals, dtype=np.float32)
+    n = n / np.maximum(np.abs(n).sum(axis=1, keepdims=True), 1e-12)
+    u, v = n[:, 0], n[:, 1]
+    lower = n[:, 2] < 0.0
+    sign_u = np.where(u >= 0.0, 1.0, -1.0)
+    sign_v = np.where(v >= 0.0, 1.0, -1.0)
+    u, v = (
+        np.where(lower, (1.0 - np.abs(v)) * sign_u, u),
+        np.where(lower, (1.0 - np.abs(u)) * sign_v, v),
+    )
+    return np.round(np.stack([u, v], axis=1) * 32767.0).astype(np.int16)
+
+
+def octahedral_decode(encoded: np.ndarray) -> np.ndarray:
+    uv = np.asarray(encoded, dtype=np.float32) / 32767.0
+    n = np.empty((uv.shape[0], 3), dtype=np.float32)
+    n[:, :2] = uv
+    n[:, 2] = 1.0 - np.abs(uv).sum(axis=1)
+    fold = np.maximum(-n[:, 2], 0.0)
+    n[:, :2] -= np.where(n[:, :2] >= 0.0, fold[:, None], -fold[:, None])
+    n /= np.linalg.norm(n, axis=1, keepdims=True)
+    return n
+
+
+def _quantize(
+    points: np.ndarray, minv: np.ndarray, scale: np.ndarray, levels: int = 65535
+) -> np.ndarray:
+    return np.round((points - minv) / scale).clip(0, levels).astype(np.uint16)
+
+
+def _chunk_bits(extent: np.ndarray, max_error: float) -> int:
+    for bits in PCD_PACKED_BITS:
+        # Rounding to the nearest step is off by at most half a step.
+        if float(extent.max()) / ((1 << bits) - 1) <= 2.0 * max_error:
+            return bits
+    return 16
+
+
 def quantize_points_to_pcd2_chunks(
     points: np.ndarray,
     *,
     chunk_points: int,
     seq_id: int,
+    spatial_order: bool = False,
+    chunk_bounds: bool = False,
+    max_error: float | None = None,
+    normals: np.ndarray | None = None,
 ):
+    """Yield quantized chunk dicts; `spatial_order` Morton-sorts the points first.
+
+    Sorting reorders the cloud, so only use it where point order is free (e.g.
+    surface results); it makes neighbouring points share chunks and small deltas.
+    With `chunk_bounds` every chunk is quantized over its own bounding box, using
+    the smallest of `PCD_PACKED_BITS` that keeps the error within `max_error`
+    (16 bits if none does). `max_error` defaults to the error of the global
+    16-bit quantization, so no chunk comes out coarser than without bounds.
+    `normals`, one per point, follow the same order as octahedral pairs.
+    """
     pts = np.asarray(points, dtype=np.float32)
     total = int(pts.shape[0])
     if total <= 0:
@@ -39,33 +160,46 @@ def quantize_points_to_pcd2_chunks(
     maxv = pts.max(axis=0)
     extent = np.maximum(maxv - minv, 1e-9)
     scale = extent / 65535.0
-    chunk_count = (total + chunk_points - 1) // chunk_points
+    chunk_count = pcd2_chunk_count(total, chunk_points)
+    if max_error is None:
+        max_error = 0.5 * float(scale.max())
+    order = None
+    if spatial_order:
+        order = morton_order(_quantize(pts, minv, scale))
 
     for chunk_index in range(chunk_count):
         start = chunk_index * chunk_points
         end = min(start + chunk_points, total)
-        sub = pts[start:end]
-        quantized = np.round((sub - minv) / scale).clip(0, 65535).astype(np.uint16)
-        yield {
+        rows = slice(start, end) if order is None else order[start:end]
+        sub = pts[rows]
+        bits = 16
+        chunk_minv, chunk_scale = minv, scale
+        if chunk_bounds:
+            chunk_minv = sub.min(axis=0)
+            chunk_extent = np.maximum(sub.max(axis=0) - chunk_minv, 1e-9)
+            bits = _chunk_bits(chunk_extent, max_error)
+            chunk_scale = chunk_extent / float((1 << bits) - 1)
+        chunk = {
             "seq_id": seq_id,
             "chunk_index": chunk_index,
             "chunk_count": chunk_count,
             "total_points": total,
             "start_index": start,
             "point_count": int(end - start),
-            "minv": minv,
-            "scale": scale,
-            "quantized_points": quantized,
+            "minv": chunk_minv,
+            "scale": chunk_scale,
+            "bits": bits,
+            "quantized_points": _quantize(sub, chunk_minv, chunk_scale, (1 << bits) - 1),
         }
+        if normals is not None:
+            chunk["normals"] = octahedral_encode(normals[rows])
+        yield chunk
 
 
-def encode_pcd2_chunk(chunk: dict[str, object]) -> bytes:
+def _pcd_header_values(chunk: dict[str, object]) -> tuple[object, ...]:
     minv = np.asarray(chunk["minv"], dtype=np.float32)
     scale = np.asarray(chunk["scale"], dtype=np.float32)
-    quantized = np.asarray(chunk["quantized_points"], dtype=np.uint16)
-    header = struct.pack(
-        PCD_HEADER_FORMAT,
-        PCD_MAGIC,
+    return (
         int(chunk["seq_id"]),
         int(chunk["chunk_index"]),
         int(chunk["chunk_count"]),
@@ -79,32 +213,216 @@ def encode_pcd2_chunk(chunk: dict[str, object]) -> bytes:
         float(scale[1]),
         float(scale[2]),
     )
+
+
+def encode_pcd2_chunk(chunk: dict[str, object]) -> bytes:
+    quantized = np.asarray(chunk["quantized_points"], dtype=np.uint16)
+    header = struct.pack(PCD_HEADER_FORMAT, PCD_MAGIC, *_pcd_header_values(chunk))
     return header + quantized.tobytes(order="C")
 
 
+def _pcd3_raw_size(point_count: int, bits: int) -> int:
+    values = 3 * point_count
+    return values + (values * max(bits - 8, 0) + 7) // 8
+
+
+def _pcd3_pack(quantized: np.ndarray, bits: int = 16) -> bytes:
+    # Per-axis deltas modulo the word size, zigzagged so small steps either way
+    # only use the low bits; the bits above the first byte are packed densely.
+    mask = np.uint16((1 << bits) - 1)
+    planar = np.ascontiguousarray(quantized.T)
+    deltas = np.diff(planar, axis=1, prepend=np.zeros((3, 1), dtype=np.uint16)) & mask
+    zigzag = (((deltas << 1) & mask) ^ ((deltas >> (bits - 1)) * mask)).ravel()
+    parts = [(zigzag & 0xFF).astype(np.uint8).tobytes()]
+    high_bits = bits - 8
+    if high_bits == 8:
+        parts.append((zigzag >> 8).astype(np.uint8).tobytes())
+    elif high_bits > 0:
+        high = np.unpackbits((zigzag >> 8).astype(np.uint8)[:, None], axis=1, bitorder="little")
+        parts.append(np.packbits(high[:, :high_bits], bitorder="little").tobytes())
+    return b"".join(parts)
+
+
+def _pcd3_unpack_into(raw: bytes, out: np.ndarray, bits: int = 16) -> None:
+    count = out.shape[0]
+    values = 3 * count
+    mask = np.uint16((1 << bits) - 1)
+    data = np.frombuffer(raw, dtype=np.uint8)
+    zigzag = data[:values].astype(np.uint16)
+    high_bits = bits - 8
+    if high_bits == 8:
+        zigzag |= data[values:].astype(np.uint16) << 8
+    elif high_bits > 0:
+        high = np.unpackbits(data[values:], count=values * high_bits, bitorder="little")
+        high = np.packbits(high.reshape(values, high_bits), axis=1, bitorder="little")
+        zigzag |= high.ravel().astype(np.uint16) << 8
+    zigzag = zigzag.reshape(3, count)
+    deltas = (zigzag >> 1) ^ ((zigzag & 1) * mask)
+    np.cumsum(deltas, axis=1, dtype=np.uint16, out=out.T)
+    if bits < 16:
+        np.bitwise_and(out, mask, out=out)
+
+
+def encode_pcd3_chunk(chunk: dict[str, object], *, codec: str = "zlib") -> bytes:
+    codec_id = _PCD3_CODECS.get(codec)
+    if codec_id is None:
+        raise ValueError(f"Unsupported PCD3 codec: {codec!r}.")
+    bits = int(chunk.get("bits", 16))
+    raw = _pcd3_pack(np.asarray(chunk["quantized_points"], dtype=np.uint16), bits)
+    if codec_id == PCD_CODEC_ZLIB:
+        body = zlib.compress(raw, 6)
+    else:
+        body = lzma.compress(raw, preset=1)
+    header = struct.pack(
+        PCD3_HEADER_FORMAT, PCD3_MAGIC, *_pcd_header_values(chunk), codec_id, bits
+    )
+    return header + body
+
+
+def encode_normal_chunk(chunk: dict[str, object]) -> bytes:
+    encoded = np.asarray(chunk["normals"], dtype=np.int16)
+    header = struct.pack(
+        NRM_HEADER_FORMAT,
+        NRM_MAGIC,
+        int(chunk["seq_id"]),
+        int(chunk["chunk_index"]),
+        int(chunk["start_index"]),
+        int(chunk["point_count"]),
+    )
+    return header + encoded.tobytes(order="C")
+
+
+def decode_normal_chunk(payload: bytes | bytearray | memoryview) -> DecodedNormalChunk:
+    if len(payload) < NRM_HEADER_SIZE:
+        raise ValueError(f"NRM1 payload too small: expected at least {NRM_HEADER_SIZE} bytes.")
+    magic, seq_id, chunk_index, start_index, point_count = struct.unpack_from(
+        NRM_HEADER_FORMAT, payload, 0
+    )
+    if magic != NRM_MAGIC:
+        raise ValueError("NRM1 payload has invalid magic header.")
+    expected_data_len = int(point_count) * 2 * 2
+    data_len = len(payload) - NRM_HEADER_SIZE
+    if data_len != expected_data_len:
+        raise ValueError(
+            f"NRM1 payload has wrong data length: got {data_len}, expected {expected_data_len}."
+        )
+    encoded = np.frombuffer(payload, dtype=np.int16, count=point_count * 2, offset=NRM_HEADER_SIZE)
+    return DecodedNormalChunk(
+        seq_id=int(seq_id),
+        chunk_index=int(chunk_index),
+        start_index=int(start_index),
+        point_count=int(point_count),
+        normals=octahedral_decode(encoded.reshape(-1, 2)),
+    )
+
+
 def iter_encoded_pcd2_chunks(
     points: np.ndarray,
     *,
     chunk_points: int,
     seq_id: int,
+    normals: np.ndarray | None = None,
 ):
     for chunk in quantize_points_to_pcd2_chunks(
         points,
         chunk_points=chunk_points,
         seq_id=seq_id,
+        normals=normals,
     ):
         yield encode_pcd2_chunk(chunk), chunk
 
 
-def decode_pcd2_chunk(payload: bytes) -> DecodedPcdChunk:
+def iter_encoded_pcd3_chunks(
+    points: np.ndarray,
+    *,
+    chunk_points: int,
+    seq_id: int,
+    codec: str = "zlib",
+    max_error: float | None = None,
+    normals: np.ndarray | None = None,
+):
+    """Encode a cloud whose point order is free as Morton-sorted PCD3 chunks.
+
+    Each chunk carries its own bounds; see `quantize_points_to_pcd2_chunks`.
+    """
+    for chunk in quantize_points_to_pcd2_chunks(
+        points,
+        chunk_points=chunk_points,
+        seq_id=seq_id,
+        spatial_order=True,
+        chunk_bounds=True,
+        max_error=max_error,
+        normals=normals,
+    ):
+        yield encode_pcd3_chunk(chunk, codec=codec), chunk
+
+
+def iter_encoded_pcd_chunks(
+    points: np.ndarray,
+    *,
+    result_format: str,
+    chunk_points: int,
+    seq_id: int,
+    codec: str = "zlib",
+    max_error: float | None = None,
+    normals: np.ndarray | None = None,
+):
+    """Yield `(payload, chunk)` pairs in `result_format`; `codec` applies to PCD3.
+
+    With `normals`, each chunk also lists its NRM1 frame under
+    `chunk["attribute_frames"]`, to be sent right after `payload`.
+    """
+    if result_format == "pcd3":
+        chunks = iter_encoded_pcd3_chunks(
+            points,
+            chunk_points=chunk_points,
+            seq_id=seq_id,
+            codec=codec,
+            max_error=max_error,
+            normals=normals,
+        )
+    elif result_format == "pcd2":
+        chunks = iter_encoded_pcd2_chunks(
+            points, chunk_points=chunk_points, seq_id=seq_id, normals=normals
+        )
+    else:
+        raise ValueError(f"Unsupported point cloud format: {result_format!r}.")
+    if normals is None:
+        return chunks
+    return _with_normal_frames(chunks)
+
+
+def _with_normal_frames(chunks):
+    for payload, chunk in chunks:
+        chunk["attribute_frames"] = [encode_normal_chunk(chunk)]
+        yield payload, chunk
+
+
+def decode_pcd2_header(payload: bytes | bytearray | memoryview) -> Pcd2ChunkHeader:
+    """Parse and check a PCD2 or PCD3 chunk header without touching its point data."""
     if len(payload) < PCD_HEADER_SIZE:
         raise ValueError(f"PCD2 payload too small: expected at least {PCD_HEADER_SIZE} bytes.")
 
-    if payload[:4] != PCD_MAGIC:
+    magic = bytes(payload[:4])
+    if magic == PCD3_MAGIC:
+        if len(payload) < PCD3_HEADER_SIZE:
+            raise ValueError(
+                f"PCD3 payload too small: expected at least {PCD3_HEADER_SIZE} bytes."
+            )
+        _magic, *values, codec, bits = struct.unpack_from(PCD3_HEADER_FORMAT, payload, 0)
+        if codec not in _PCD3_CODECS.values():
+            raise ValueError(f"PCD3 payload has unknown codec {codec}.")
+        bits = bits or 16
+        if bits not in PCD_PACKED_BITS:
+            raise ValueError(f"PCD3 payload has unsupported word size {bits}.")
+    elif magic == PCD_MAGIC:
+        _magic, *values = struct.unpack_from(PCD_HEADER_FORMAT, payload, 0)
+        codec = PCD_CODEC_NONE
+        bits = 16
+    else:
         raise ValueError("PCD2 payload has invalid magic header.")
 
     (
-        _magic,
         seq_id,
         chunk_index,
         chunk_count,
@@ -117,17 +435,17 @@ def decode_pcd2_chunk(payload: bytes) -> DecodedPcdChunk:
         scalex,
         scaley,
         scalez,
-    ) = struct.unpack_from(PCD_HEADER_FORMAT, payload, 0)
+    ) = values
 
-    expected_data_len = int(point_count) * 3 * 2
-    data = payload[PCD_HEADER_SIZE:]
-    if len(data) != expected_data_len:
-        raise ValueError(
-            f"PCD2 payload has wrong data length: got {len(data)}, expected {expected_data_len}."
-        )
+    if codec == PCD_CODEC_NONE:
+        expected_data_len = int(point_count) * 3 * 2
+        data_len = len(payload) - PCD_HEADER_SIZE
+        if data_len != expected_data_len:
+            raise ValueError(
+                f"PCD2 payload has wrong data length: got {data_len}, expected {expected_data_len}."
+            )
 
-    quantized = np.frombuffer(data, dtype=np.uint16).reshape(-1, 3)
-    return DecodedPcdChunk(
+    return Pcd2ChunkHeader(
         seq_id=int(seq_id),
         chunk_index=int(chunk_index),
         chunk_count=int(chunk_count),
@@ -136,12 +454,85 @@ def decode_pcd2_chunk(payload: bytes) -> DecodedPcdChunk:
         point_count=int(point_count),
         minv=np.array([minx, miny, minz], dtype=np.float32),
         scale=np.array([scalex, scaley, scalez], dtype=np.float32),
-        quantized_points=quantized.copy(),
+        codec=int(codec),
+        bits=int(bits),
+    )
+
+
+def _pcd2_payload_view(payload: bytes | bytearray | memoryview, point_count: int) -> np.ndarray:
+    # Read-only view over the payload bytes; nothing is copied here.
+    return np.frombuffer(
+        payload, dtype=np.uint16, count=point_count * 3, offset=PCD_HEADER_SIZE
+    ).reshape(-1, 3)
+
+
+def _decompress_pcd3(payload: bytes | bytearray | memoryview, header: Pcd2ChunkHeader) -> bytes:
+    expected = _pcd3_raw_size(header.point_count, header.bits)
+    if header.codec == PCD_CODEC_ZLIB:
+        decompressor = zlib.decompressobj()
+    else:
+        decompressor = lzma.LZMADecompressor()
+    try:
+        # Bounded, so a corrupt or hostile chunk cannot expand past its point count.
+        raw = decompressor.decompress(memoryview(payload)[PCD3_HEADER_SIZE:], expected)
+    except (zlib.error, lzma.LZMAError) as exc:
+        raise ValueError(f"PCD3 payload could not be decompressed: {exc}.") from exc
+    if len(raw) != expected or not decompressor.eof:
+        raise ValueError(
+            f"PCD3 payload has wrong data length: expected {expected} bytes after decompression."
+        )
+    return raw
+
+
+def _decode_pcd_points_into(
+    payload: bytes | bytearray | memoryview,
+    header: Pcd2ChunkHeader,
+    out: np.ndarray,
+) -> None:
+    if header.codec == PCD_CODEC_NONE:
+        out[...] = _pcd2_payload_view(payload, header.point_count)
+    else:
+        _pcd3_unpack_into(_decompress_pcd3(payload, header), out, header.bits)
+
+
+def decode_pcd2_chunk(payload: bytes) -> DecodedPcdChunk:
+    """Decode a PCD2 or PCD3 chunk into an owned uint16 array."""
+    header = decode_pcd2_header(payload)
+    quantized = np.empty((header.point_count, 3), dtype=np.uint16)
+    _decode_pcd_points_into(payload, header, quantized)
+    return DecodedPcdChunk(
+        seq_id=header.seq_id,
+        chunk_index=header.chunk_index,
+        chunk_count=header.chunk_count,
+        total_points=header.total_points,
+        start_index=header.start_index,
+        point_count=header.point_count,
+        minv=header.minv,
+        scale=header.scale,
+        quantized_points=quantized,
     )
 
 
 class PcdAssembly:
-    __slots__ = ("total_points", "chunk_count", "received_chunks", "minv", "scale", "qbuf")
+    """Collects the chunks of one upload into a uint16 buffer.
+
+    Chunks may arrive in any order; `received` is a per-chunk bitmap, so a
+    repeated chunk is rejected before it is decoded and `missing_chunks()`
+    tells a resuming client what to send. Chunks may share the cloud's bounds
+    or carry their own; `chunk_bounds` keeps each chunk's range and bounds for
+    the final float conversion.
+    """
+
+    __slots__ = (
+        "chunk_bounds",
+        "chunk_count",
+        "minv",
+        "qbuf",
+        "received",
+        "received_chunks",
+        "scale",
+        "total_points",
+    )
 
     def __init__(
         self,
@@ -157,17 +548,121 @@ class PcdAssembly:
         self.minv = np.asarray(minv, dtype=np.float32)
         self.scale = np.asarray(scale, dtype=np.float32)
         self.qbuf = np.empty((self.total_points, 3), dtype=np.uint16)
+        self.received = np.zeros(self.chunk_count, dtype=bool)
+        self.chunk_bounds: dict[int, tuple[int, int, np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_header(cls, header: Pcd2ChunkHeader | DecodedPcdChunk) -> PcdAssembly:
+        return cls(
+            total_points=header.total_points,
+            chunk_count=header.chunk_count,
+            minv=header.minv,
+            scale=header.scale,
+        )
+
+    def missing_chunks(self) -> list[int]:
+        return np.flatnonzero(~self.received).tolist()
 
     def add_chunk(self, chunk: DecodedPcdChunk) -> np.ndarray | None:
+        self._check_chunk(chunk)
+        self._target_slice(chunk)[...] = chunk.quantized_points
+        return self._count_chunk(chunk)
+
+    def add_payload(
+        self,
+        payload: bytes | bytearray | memoryview,
+        header: Pcd2ChunkHeader | None = None,
+    ) -> np.ndarray | None:
+        """Decode an encoded PCD2/PCD3 chunk straight into the assembly buffer.
+
+        PCD2 point data is copied once, from the payload bytes into its slice of
+        `qbuf`, and PCD3 is decompressed and integrated into it; pass `header` if
+        the caller already parsed it.
+        """
+        if header is None:
+            header = decode_pcd2_header(payload)
+        self._check_chunk(header)
+        _decode_pcd_points_into(payload, header, self._target_slice(header))
+        return self._count_chunk(header)
+
+    def _check_chunk(self, chunk: Pcd2ChunkHeader | DecodedPcdChunk) -> None:
+        if (
+            chunk.total_points != self.total_points
+            or chunk.chunk_count != self.chunk_count
+            or not 0 <= chunk.chunk_index < self.chunk_count
+        ):
+            raise ValueError("PCD2 chunk does not belong to the upload in progress.")
+        if self.received[chunk.chunk_index]:
+            raise ValueError(f"PCD2 chunk {chunk.chunk_index} was already received.")
+        # Overlaps are rejected before the chunk is written, so a bad chunk
+        # never clobbers points that were already received.
+        end_index = chunk.start_index + chunk.point_count
+        for start, count, _minv, _scale in self.chunk_bounds.values():
+            if chunk.start_index < start + count and start < end_index:
+                raise ValueError("PCD2 chunks do not cover the upload without gaps or overlaps.")
+
+    def _target_slice(self, chunk: Pcd2ChunkHeader | DecodedPcdChunk) -> np.ndarray:
         end_index = chunk.start_index + chunk.point_count
         if chunk.start_index < 0 or end_index > self.total_points:
             raise ValueError(
                 f"PCD2 chunk range out of bounds: {chunk.start_index}:{end_index} of {self.total_points}."
             )
+        return self.qbuf[chunk.start_index:end_index]
 
-        self.qbuf[chunk.start_index:end_index, :] = chunk.quantized_points
+    def _count_chunk(self, chunk: Pcd2ChunkHeader | DecodedPcdChunk) -> np.ndarray | None:
+        # Non-overlapping ranges that sum to the total leave no gaps; checking
+        # before recording lets a rejected last chunk be sent again.
+        if self.received_chunks + 1 == self.chunk_count:
+            covered = chunk.point_count + sum(
+                count for _start, count, _minv, _scale in self.chunk_bounds.values()
+            )
+            if covered != self.total_points:
+                raise ValueError("PCD2 chunks do not cover the upload without gaps or overlaps.")
+        self.chunk_bounds[chunk.chunk_index] = (
+            chunk.start_index,
+            chunk.point_count,
+            np.asarray(chunk.minv, dtype=np.float32),
+            np.asarray(chunk.scale, dtype=np.float32),
+        )
+        self.received[chunk.chunk_index] = True
         self.received_chunks += 1
         if self.received_chunks < self.chunk_count:
             return None
 
-        return self.minv[None, :] + self.qbuf.astype(np.float32) * self.scale[None, :]
+        # One float32 allocation for the whole cloud, scaled and offset in place.
+        points = self.qbuf.astype(np.float32)
+        if self._shares_bounds():
+            points *= self.scale
+            points += self.minv
+            return points
+        for start, count, minv, scale in self.chunk_bounds.values():
+            view = points[start:start + count]
+            view *= scale
+            view += minv
+        return points
+
+    def _shares_bounds(self) -> bool:
+        return all(
+            np.array_equal(minv, self.minv) and np.array_equal(scale, self.scale)
+            for _start, _count, minv, scale in self.chunk_bounds.values()
+        )
+
+    def content_digest(self) -> str:
+        """Hash of the quantized upload.
+
+        Stable across chunkings of the same points as long as the chunks share
+        the cloud's bounds; chunk-local bounds are hashed per chunk.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        if self._shares_bounds():
+            digest.update(self.minv.tobytes())
+            digest.update(self.scale.tobytes())
+        else:
+            for start, count, minv, scale in sorted(
+                self.chunk_bounds.values(), key=lambda bounds: bounds[0]
+            ):
+                digest.update(struct.pack("<2Q", start, count))
+                digest.update(minv.tobytes())
+                digest.update(scale.tobytes())
+        digest.update(memoryview(self.qbuf).cast("B"))
+        return digest.hexdigest()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def _require_skimage():
+    try:
+        from skimage.measure import marching_cubes
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            "Mesh output requires scikit-image. "
+            "Install the backend surface-processing dependencies."
+        ) from exc
+    return marching_cubes
+
+
+def ensure_mesh_support() -> None:
+    """Raise the error mesh extraction would, before any work is done."""
+    _require_skimage()
+
+
+@dataclass(slots=True)
+class SurfaceMesh:
+    """Indexed triangle mesh; `triangles` index into `vertices` and wind outward."""
+
+    vertices: np.ndarray
+    triangles: np.ndarray
+
+    @classmethod
+    def empty(cls) -> SurfaceMesh:
+        return cls(
+            vertices=np.empty((0, 3), dtype=np.float32),
+            triangles=np.empty((0, 3), dtype=np.uint32),
+        )
+
+    @property
+    def vertex_count(self) -> int:
+        return int(self.vertices.shape[0])
+
+    @property
+    def triangle_count(self) -> int:
+        return int(self.triangles.shape[0])
+
+
+def extract_outer_surface_mesh(
+    field: np.ndarray,
+    origin: np.ndarray,
+    voxel_size: float,
+    iso_level: float,
+    outside_air: np.ndarray,
+    *,
+    step_size: int = 1,
+) -> SurfaceMesh:
+    """Marching-cubes isosurface of `field` at `iso_level`, restricted to the
+    boundary of the outside air.
+
+    Every node that is not outside air (solid, enclosed cavities and voxels
+    filled by the closing) is lifted above `iso_level`, so triangles only
+    appear between outside air and the rest. Vertices are in world units on the
+    field's node grid.
+    """
+    marching_cubes = _require_skimage()
+
+    if not outside_air.any() or outside_air.all():
+        return SurfaceMesh.empty()
+    iso = float(iso_level)
+    levels = np.array(field, dtype=np.float32)
+    levels[~outside_air & (levels < iso)] = max(1.0, 2.0 * iso)
+    vertices, faces, _normals, _values = marching_cubes(
+        levels,
+        level=iso,
+        spacing=(float(voxel_size),) * 3,
+        step_size=int(step_size),
+        allow_degenerate=False,
+        # The field rises into the solid; "ascent" winds faces to face outward.
+        gradient_direction="ascent",
+    )
+    vertices = vertices.astype(np.float32, copy=False)
+    vertices += np.asarray(origin, dtype=np.float32)
+    return SurfaceMesh(vertices=vertices, triangles=faces.astype(np.uint32))
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+import math
+import os
+import sys
+import threading
+import time
 from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import field as dataclass_field
+from itertools import islice
 
 import numpy as np
 
+from backend.geometry._scipy import _require_scipy
+from backend.geometry.pointcloud_filters import (
+    estimate_normals,
+    statistical_outlier_mask,
+    voxel_downsample,
+)
+from backend.geometry.surface_mesh import SurfaceMesh, extract_outer_surface_mesh
 
-def _require_scipy():
-    try:
-        from scipy.ndimage import binary_closing
-        from scipy.spatial import cKDTree
-    except ModuleNotFoundError as exc:
-        raise RuntimeError(
-            "Surface reconstruction requires scipy. Install the backend surface-processing dependencies."
-        ) from exc
-    return cKDTree, binary_closing
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 
 def _neighbors6():
@@ -27,17 +38,307 @@ def _neighbors6():
     ]
 
 
-def build_field_from_points(
-    points: np.ndarray,
+# Rough bytes held per voxel of a tile block while its field and solid mask are
+# built; the distance transform keeps float64 distances and int32 feature indices.
+_TILE_BYTES_PER_VOXEL = {"kdtree": 12, "edt": 32}
+_EDT_TRANSIENT_BYTES_PER_VOXEL = 20
+# Tiled distance transforms only look this far past a tile for the nearest point;
+# field values beyond it (below exp(-16)) are treated as air.
+_TILE_FIELD_CUTOFF_SIGMAS = 4.0
+
+
+# Rough share of a job's compute per stage, in pipeline order; used to estimate
+# how much work a cancelled job skipped. Optional preprocessing and normals are
+# not counted.
+_STAGE_WORK_SHARES = {
+    "preprocess": 0.0,
+    "build_field": 0.70,
+    "closing": 0.05,
+    "flood_fill": 0.10,
+    "shell": 0.05,
+    "map_to_original": 0.10,
+    "normals": 0.0,
+}
+# Mesh jobs extract the isosurface where point jobs map the shell.
+_STAGE_WORK_SHARES["mesh"] = _STAGE_WORK_SHARES["map_to_original"]
+_MAP_QUERY_BATCH = 1 << 16
+# Distances, in voxels, at which a normal is probed against the outside air.
+_NORMAL_PROBE_VOXELS = (1.0, 2.0, 3.0, 4.0, 6.0, 8.0)
+
+
+def _work_fraction(stage: str, done: int, total: int) -> float:
+    before = 0.0
+    for name, share in _STAGE_WORK_SHARES.items():
+        if name == "mesh":
+            continue
+        if name == stage or (stage == "mesh" and name == "map_to_original"):
+            return before + share * min(1.0, done / max(1, total))
+        before += share
+    return before
+
+
+class SurfaceReconstructionCancelled(RuntimeError):
+    """Raised at a checkpoint once the job's cancellation token is set."""
+
+    def __init__(self, stage: str, fraction_done: float) -> None:
+        super().__init__(stage, fraction_done)
+        self.stage = stage
+        self.fraction_done = fraction_done
+
+    def __str__(self) -> str:
+        return (
+            f"Surface reconstruction cancelled during {self.stage} "
+            f"({self.fraction_done:.0%} done)."
+        )
+
+
+class CancellationToken:
+    """Cooperative cancel flag checked between slabs and stages.
+
+    `flag` may be any writable one-byte buffer; a shared-memory buffer lets a
+    worker process observe a cancel requested by its parent.
+    """
+
+    __slots__ = ("_flag",)
+
+    def __init__(self, flag=None) -> None:
+        self._flag = flag if flag is not None else bytearray(1)
+
+    def cancel(self) -> None:
+        self._flag[0] = 1
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self._flag[0])
+
+    def checkpoint(self, stage: str, done: int = 0, total: int = 1) -> None:
+        if self._flag[0]:
+            raise SurfaceReconstructionCancelled(stage, _work_fraction(stage, done, total))
+
+
+def _max_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass(slots=True)
+class SurfaceStageMetrics:
+    """Measurements for one pipeline stage.
+
+    CPU time covers every thread of the process running the stage; tiled stages
+    with a process pool only count the coordinating process. `active_voxels` is
+    the stage's output: solid voxels for the field build and closing, outside-air
+    voxels for the flood fill, shell voxels for the shell and the mapping.
+    `peak_rss_delta_bytes` is how far the process's peak RSS rose during the
+    stage, so it stays zero for stages that fit below an earlier peak.
+    """
+
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    grid_dims: tuple[int, int, int] | None = None
+    active_voxels: int | None = None
+    kd_queries: int = 0
+    peak_rss_delta_bytes: int | None = None
+
+
+@dataclass(slots=True)
+class SurfaceReconstructionStats:
+    peak_working_set_bytes: int = 0
+    tile_count: int = 1
+    input_point_count: int = 0
+    # Share of the input points kept by the optional preprocessing filters.
+    reduction_ratio: float = 1.0
+    stages: list[SurfaceStageMetrics] = dataclass_field(default_factory=list)
+
+    def stage_metrics_for(self, event: str) -> SurfaceStageMetrics | None:
+        """Metrics of the stage that a `<stage>_done` status event closes."""
+        if self.stages and event == f"{self.stages[-1].stage}_done":
+            return self.stages[-1]
+        return None
+
+
+class _QueryCountingTree:
+    """Forwards to a cKDTree and counts the query points it was asked about."""
+
+    __slots__ = ("queries", "tree")
+
+    def __init__(self, tree) -> None:
+        self.tree = tree
+        self.queries = 0
+
+    def query(self, x, *args, **kwargs):
+        self.queries += len(x)
+        return self.tree.query(x, *args, **kwargs)
+
+    def query_ball_point(self, x, *args, **kwargs):
+        self.queries += len(x)
+        return self.tree.query_ball_point(x, *args, **kwargs)
+
+    def sparse_distance_matrix(self, other, *args, **kwargs):
+        self.queries += other.n
+        return self.tree.sparse_distance_matrix(other, *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.tree, name)
+
+
+@dataclass(slots=True)
+class _ShellGuide:
+    """Coarse pass result that a finer pass refines.
+
+    `inside` marks coarse nodes not reachable from outside air; `band` marks the
+    nodes within two coarse voxels of its boundary, where a finer grid can
+    classify differently.
+    """
+
+    origin: np.ndarray
+    voxel_size: float
+    inside: np.ndarray
+    band: np.ndarray
+
+    @classmethod
+    def from_outside_air(cls, origin: np.ndarray, voxel_size: float, outside_air: np.ndarray):
+        _cKDTree, ndimage = _require_scipy()
+
+        inside = ~outside_air
+        band = ndimage.maximum_filter(inside, size=5) & ~ndimage.minimum_filter(inside, size=5)
+        return cls(origin=origin, voxel_size=float(voxel_size), inside=inside, band=band)
+
+    def resample(
+        self,
+        origin: np.ndarray,
+        dims: tuple[int, int, int],
+        voxel_size: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Nearest coarse node for each fine node, separably per axis.
+        axes = []
+        for axis in range(3):
+            coords = origin[axis] + np.arange(dims[axis], dtype=np.float64) * voxel_size
+            idx = np.rint((coords - self.origin[axis]) / self.voxel_size).astype(np.int64)
+            axes.append(idx.clip(0, self.inside.shape[axis] - 1))
+        grid = np.ix_(*axes)
+        return self.inside[grid], self.band[grid]
+
+
+class SurfaceReconstructionContext:
+    """Per-job state shared by the reconstruction stages.
+
+    The KD-tree over the job's points is built on first use and then reused by
+    every stage, including later consumers that keep the context around. It
+    counts its queries so `measure` can report them per stage.
+
+    `field` may hold a `(field, origin, dims)` grid built earlier for the same
+    points and field options; the untiled pipeline then skips the field build.
+    With `retain_field` set, a freshly built field is kept there for the caller.
+    With `retain_outside_air` set, the final pass keeps its outside-air mask in
+    `outside_air` (see `_OutsideAirGrid`).
+    """
+
+    __slots__ = (
+        "_tree",
+        "cancel_token",
+        "field",
+        "outside_air",
+        "points",
+        "retain_field",
+        "retain_outside_air",
+        "stats",
+        "status_cb",
+    )
+
+    def __init__(
+        self,
+        points: np.ndarray,
+        *,
+        status_cb=None,
+        stats: SurfaceReconstructionStats | None = None,
+        field: tuple[np.ndarray, np.ndarray, tuple[int, int, int]] | None = None,
+        retain_field: bool = False,
+        cancel_token: CancellationToken | None = None,
+    ) -> None:
+        self.points = np.asarray(points, dtype=np.float32)
+        self.status_cb = status_cb
+        self.stats = stats
+        self.field = field
+        self.retain_field = retain_field
+        self.retain_outside_air = False
+        self.outside_air: _OutsideAirGrid | None = None
+        self.cancel_token = cancel_token
+        self._tree = None
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            cKDTree, _ndimage = _require_scipy()
+            self._tree = _QueryCountingTree(cKDTree(self.points))
+        return self._tree
+
+    @property
+    def has_tree(self) -> bool:
+        return self._tree is not None
+
+    def replace_points(self, points: np.ndarray) -> None:
+        """Switch to a preprocessed cloud, dropping any tree built for the old one."""
+        self.points = np.asarray(points, dtype=np.float32)
+        self._tree = None
+
+    def checkpoint(self, stage: str, done: int = 0, total: int = 1) -> None:
+        if self.cancel_token is not None:
+            self.cancel_token.checkpoint(stage, done, total)
+
+    def report(self, stage: str, message: str | None = None) -> None:
+        if not self.status_cb:
+            return
+        if message is None:
+            self.status_cb(stage)
+        else:
+            self.status_cb(stage, message)
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Time the block and append its `SurfaceStageMetrics` to the stats.
+
+        The block may fill in `grid_dims` and `active_voxels` on the yielded
+        metrics. Report the stage's `_done` event after the block so status
+        callbacks can pick the metrics up with `stage_metrics_for`.
+        """
+        metrics = SurfaceStageMetrics(stage=stage)
+        tree = self._tree
+        queries = tree.queries if tree is not None else 0
+        rss = _max_rss_bytes()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        yield metrics
+        metrics.wall_seconds = time.perf_counter() - wall
+        metrics.cpu_seconds = time.process_time() - cpu
+        if self._tree is not None:
+            metrics.kd_queries = self._tree.queries - (queries if self._tree is tree else 0)
+        if rss is not None:
+            metrics.peak_rss_delta_bytes = _max_rss_bytes() - rss
+        if self.stats is not None:
+            self.stats.stages.append(metrics)
+
+
+def _note_working_set(
+    stats: SurfaceReconstructionStats | None,
+    *arrays: np.ndarray | None,
+    extra_bytes: int = 0,
+) -> None:
+    if stats is None:
+        return
+    held = extra_bytes + sum(int(array.nbytes) for array in arrays if array is not None)
+    stats.peak_working_set_bytes = max(stats.peak_working_set_bytes, held)
+
+
+def _grid_for_points(
+    pts: np.ndarray,
     voxel_size: float,
-    sigma: float,
     padding: float,
-    *,
-    status_cb=None,
-):
-    cKDTree, _binary_closing = _require_scipy()
-
-    pts = np.asarray(points, dtype=np.float32)
+) -> tuple[np.ndarray, tuple[int, int, int]]:
     pmin = pts.min(axis=0) - np.array([padding, padding, padding], dtype=np.float32)
     pmax = pts.max(axis=0) + np.array([padding, padding, padding], dtype=np.float32)
 
@@ -45,31 +346,262 @@ def build_field_from_points(
     nx, ny, nz = int(dims[0]), int(dims[1]), int(dims[2])
     if nx <= 2 or ny <= 2 or nz <= 2:
         raise ValueError(f"Grid too small: dims={dims}. Increase padding or decrease voxel_size.")
+    return pmin, (nx, ny, nz)
+
+
+def _validate_field_options(
+    sigma: float, engine: str, band_sigmas: float | None, iso_level: float | None = None
+) -> None:
     if sigma <= 0:
         raise ValueError("sigma must be > 0")
+    if band_sigmas is not None and band_sigmas <= 0:
+        raise ValueError("band_sigmas must be > 0")
+    if band_sigmas is not None and iso_level is not None and iso_level < 1.0:
+        # The band zeroes the field past band_sigmas * sigma, where it has fallen
+        # to exp(-band_sigmas**2); the isosurface must lie inside that radius.
+        min_band = math.sqrt(-math.log(iso_level)) if iso_level > 0 else math.inf
+        if band_sigmas <= min_band:
+            raise ValueError(
+                f"band_sigmas={band_sigmas} cuts the field off before iso_level={iso_level}; "
+                f"use band_sigmas > {min_band:.3g}."
+            )
+    if engine not in ("kdtree", "edt"):
+        raise ValueError(f"Unknown field engine={engine!r}. Use 'kdtree' or 'edt'.")
 
-    tree = cKDTree(pts)
-    xs = pmin[0] + np.arange(nx, dtype=np.float32) * voxel_size
-    ys = pmin[1] + np.arange(ny, dtype=np.float32) * voxel_size
-    zs = pmin[2] + np.arange(nz, dtype=np.float32) * voxel_size
 
-    field = np.empty((nx, ny, nz), dtype=np.float32)
+def _splat_points_to_grid(
+    points: np.ndarray,
+    origin: np.ndarray,
+    dims: tuple[int, int, int],
+    voxel_size: float,
+    x0: int = 0,
+    x1: int | None = None,
+) -> np.ndarray:
+    nx, ny, nz = dims
+    x1 = nx if x1 is None else x1
+    shape = np.asarray(dims, dtype=np.int64)
+    idx = np.rint((np.asarray(points, dtype=np.float32) - origin[None, :]) / voxel_size)
+    idx = idx.astype(np.int64).clip(0, shape - 1)
+    if x0 > 0 or x1 < nx:
+        idx = idx[(idx[:, 0] >= x0) & (idx[:, 0] < x1)]
+        idx[:, 0] -= x0
+    occupied = np.zeros((x1 - x0, ny, nz), dtype=np.uint8)
+    occupied[idx[:, 0], idx[:, 1], idx[:, 2]] = 1
+    return occupied
+
+
+def _narrow_band_slab(
+    points: np.ndarray,
+    origin: np.ndarray,
+    dims: tuple[int, int, int],
+    voxel_size: float,
+    band_radius: float,
+    x0: int,
+    x1: int,
+) -> np.ndarray:
+    _cKDTree, ndimage = _require_scipy()
+
+    # A point lies at most half a voxel diagonal away from the node it was splatted to.
+    reach = int(np.ceil(float(band_radius) / float(voxel_size) + np.sqrt(3.0) / 2.0))
+    lo, hi = max(0, x0 - reach), min(dims[0], x1 + reach)
+    occupied = _splat_points_to_grid(points, origin, dims, voxel_size, lo, hi)
+    band = ndimage.maximum_filter(occupied, size=2 * reach + 1, mode="constant", cval=0)
+    return band[x0 - lo : x1 - lo].astype(bool)
+
+
+def narrow_band_mask(
+    points: np.ndarray,
+    origin: np.ndarray,
+    dims: tuple[int, int, int],
+    voxel_size: float,
+    band_radius: float,
+) -> np.ndarray:
+    """Conservative mask of grid nodes within `band_radius` of any point.
+
+    Points are splatted onto their nearest grid node and the occupancy is
+    dilated with a separable cube filter, so every node that can be within
+    `band_radius` of a point is included.
+    """
+    return _narrow_band_slab(points, origin, dims, voxel_size, band_radius, 0, dims[0])
+
+
+def _kdtree_field_slab(
+    tree,
+    origin: np.ndarray,
+    dims: tuple[int, int, int],
+    voxel_size: float,
+    sigma: float,
+    x0: int,
+    x1: int,
+    band: np.ndarray | None,
+    band_radius: float,
+    status_cb=None,
+    query_workers: int = -1,
+    cancel_token: CancellationToken | None = None,
+) -> np.ndarray:
+    nx, ny, nz = dims
+    xs = origin[0] + np.arange(nx, dtype=np.float32) * voxel_size
+    ys = origin[1] + np.arange(ny, dtype=np.float32) * voxel_size
+    zs = origin[2] + np.arange(nz, dtype=np.float32) * voxel_size
+
+    field = np.empty((x1 - x0, ny, nz), dtype=np.float32)
     y_grid, z_grid = np.meshgrid(ys, zs, indexing="ij")
     yz = np.stack([y_grid.reshape(-1), z_grid.reshape(-1)], axis=1)
     progress_step = max(1, nx // 20)
 
-    for ix in range(nx):
-        x_col = np.full((yz.shape[0], 1), xs[ix], dtype=np.float32)
-        slab = np.concatenate([x_col, yz], axis=1)
-        dists, _ = tree.query(slab, k=1, workers=-1)
-        field[ix, :, :] = np.exp(-((dists / sigma) ** 2)).astype(np.float32).reshape(ny, nz)
+    for ix in range(x0, x1):
+        if cancel_token is not None:
+            cancel_token.checkpoint("build_field", ix - x0, x1 - x0)
+        if band is None:
+            x_col = np.full((yz.shape[0], 1), xs[ix], dtype=np.float32)
+            slab = np.concatenate([x_col, yz], axis=1)
+            dists, _ = tree.query(
+                slab, k=1, distance_upper_bound=band_radius, workers=query_workers
+            )
+            field[ix - x0, :, :] = (
+                np.exp(-((dists / sigma) ** 2)).astype(np.float32).reshape(ny, nz)
+            )
+        else:
+            # Voxels outside the band are air; inside it, the bounded query returns
+            # inf past band_radius, which maps to a field value of exactly zero.
+            active = band[ix - x0].reshape(-1)
+            plane = np.zeros(ny * nz, dtype=np.float32)
+            if active.any():
+                active_yz = yz[active]
+                x_col = np.full((active_yz.shape[0], 1), xs[ix], dtype=np.float32)
+                slab = np.concatenate([x_col, active_yz], axis=1)
+                dists, _ = tree.query(
+                    slab, k=1, distance_upper_bound=band_radius, workers=query_workers
+                )
+                plane[active] = np.exp(-((dists / sigma) ** 2))
+            field[ix - x0, :, :] = plane.reshape(ny, nz)
         if status_cb and ((ix + 1) % progress_step == 0 or (ix + 1) == nx):
             status_cb("field_progress", f"{ix + 1}/{nx}")
 
-    return field, pmin, (nx, ny, nz)
+    return field
+
+
+def _distance_transform_field_slab(
+    pts: np.ndarray,
+    origin: np.ndarray,
+    dims: tuple[int, int, int],
+    voxel_size: float,
+    sigma: float,
+    x0: int,
+    x1: int,
+    band_radius: float,
+) -> np.ndarray:
+    _cKDTree, ndimage = _require_scipy()
+
+    nx = dims[0]
+    cutoff = band_radius
+    lo, hi = 0, nx
+    if x0 > 0 or x1 < nx:
+        if not np.isfinite(cutoff):
+            cutoff = _TILE_FIELD_CUTOFF_SIGMAS * float(sigma)
+        reach = int(np.ceil(cutoff / float(voxel_size))) + 1
+        lo, hi = max(0, x0 - reach), min(nx, x1 + reach)
+
+    # Distances are measured between grid nodes, so they are quantized to the
+    # node a point was splatted to (at most half a voxel diagonal off).
+    occupied = _splat_points_to_grid(pts, origin, dims, voxel_size, lo, hi)
+    dists = ndimage.distance_transform_edt(occupied == 0, sampling=float(voxel_size))
+    del occupied
+    dists = dists[x0 - lo : x1 - lo]
+    dists /= float(sigma)
+    np.square(dists, out=dists)
+    np.negative(dists, out=dists)
+    field = np.exp(dists, dtype=np.float32)
+    del dists
+    if np.isfinite(cutoff):
+        field[field < np.float32(np.exp(-((cutoff / sigma) ** 2)))] = 0.0
+    return field
+
+
+def build_field_from_points(
+    points: np.ndarray,
+    voxel_size: float,
+    sigma: float,
+    padding: float,
+    *,
+    engine: str = "kdtree",
+    band_sigmas: float | None = None,
+    status_cb=None,
+    tree=None,
+    cancel_token: CancellationToken | None = None,
+):
+    cKDTree, _ndimage = _require_scipy()
+
+    pts = np.asarray(points, dtype=np.float32)
+    pmin, dims = _grid_for_points(pts, voxel_size, padding)
+    _validate_field_options(sigma, engine, band_sigmas)
+    nx, ny, nz = dims
+
+    band_radius = np.inf if band_sigmas is None else float(band_sigmas) * float(sigma)
+    if cancel_token is not None:
+        cancel_token.checkpoint("build_field")
+    if engine == "edt":
+        field = _distance_transform_field_slab(
+            pts, pmin, dims, voxel_size, sigma, 0, nx, band_radius
+        )
+        if status_cb:
+            status_cb("field_progress", f"{nx}/{nx}")
+        return field, pmin, dims
+
+    band = None
+    if band_sigmas is not None:
+        band = narrow_band_mask(pts, pmin, dims, voxel_size, band_radius)
+        if status_cb:
+            status_cb("field_band", f"active={int(np.count_nonzero(band))}/{nx * ny * nz}")
+
+    if tree is None:
+        tree = cKDTree(pts)
+    field = _kdtree_field_slab(
+        tree,
+        pmin,
+        dims,
+        voxel_size,
+        sigma,
+        0,
+        nx,
+        band,
+        band_radius,
+        status_cb,
+        cancel_token=cancel_token,
+    )
+    return field, pmin, dims
 
 
 def flood_fill_outside_air(air: np.ndarray) -> np.ndarray:
+    """Mark air voxels 6-connected to the grid boundary.
+
+    Labels the air components once and keeps every component that touches one
+    of the six boundary faces, instead of walking the grid voxel by voxel.
+    """
+    _cKDTree, ndimage = _require_scipy()
+
+    air = np.asarray(air, dtype=bool)
+    # The default structuring element of ndimage.label is face connectivity.
+    labels, component_count = ndimage.label(air)
+    if component_count == 0:
+        return np.zeros_like(air, dtype=bool)
+
+    touches_boundary = np.zeros(component_count + 1, dtype=bool)
+    for face in (
+        labels[0, :, :],
+        labels[-1, :, :],
+        labels[:, 0, :],
+        labels[:, -1, :],
+        labels[:, :, 0],
+        labels[:, :, -1],
+    ):
+        touches_boundary[face] = True
+    touches_boundary[0] = False
+    return touches_boundary[labels]
+
+
+# Reference breadth-first implementation, kept for regression tests and benchmarks.
+def _flood_fill_outside_air_bfs(air: np.ndarray) -> np.ndarray:
     nx, ny, nz = air.shape
     outside = np.zeros_like(air, dtype=bool)
     queue: deque[tuple[int, int, int]] = deque()
@@ -105,6 +637,26 @@ def flood_fill_outside_air(air: np.ndarray) -> np.ndarray:
 
 
 def voxel_shell_of_solid_adjacent_to(solid: np.ndarray, adjacent_to: np.ndarray) -> np.ndarray:
+    solid = np.asarray(solid, dtype=bool)
+    adjacent_to = np.asarray(adjacent_to, dtype=bool)
+
+    # Dilate `adjacent_to` by one voxel along each axis with shifted views; voxels
+    # beyond the grid border never count as neighbours.
+    near = np.zeros_like(adjacent_to, dtype=bool)
+    near[1:, :, :] |= adjacent_to[:-1, :, :]
+    near[:-1, :, :] |= adjacent_to[1:, :, :]
+    near[:, 1:, :] |= adjacent_to[:, :-1, :]
+    near[:, :-1, :] |= adjacent_to[:, 1:, :]
+    near[:, :, 1:] |= adjacent_to[:, :, :-1]
+    near[:, :, :-1] |= adjacent_to[:, :, 1:]
+    near &= solid
+    return near
+
+
+# Reference per-voxel implementation, kept for regression tests and benchmarks.
+def _voxel_shell_of_solid_adjacent_to_loop(
+    solid: np.ndarray, adjacent_to: np.ndarray
+) -> np.ndarray:
     shell = np.zeros_like(solid, dtype=bool)
     nx, ny, nz = solid.shape
 
@@ -124,30 +676,54 @@ def voxel_centers_from_mask(mask: np.ndarray, origin: np.ndarray, voxel_size: fl
     return origin[None, :] + (idx.astype(np.float32) + 0.5) * float(voxel_size)
 
 
-def map_shell_voxels_to_original_points(
+def _unique_rows(rows: np.ndarray) -> np.ndarray:
+    """`np.unique(rows, axis=0)` for float (N,3) rows, via a column lexsort."""
+    rows = np.asarray(rows, dtype=np.float32)
+    rows = rows[np.lexsort((rows[:, 2], rows[:, 1], rows[:, 0]))]
+    distinct = np.ones(rows.shape[0], dtype=bool)
+    distinct[1:] = np.any(rows[1:] != rows[:-1], axis=1)
+    return rows[distinct]
+
+
+def _map_centers_to_original_points(
+    centers: np.ndarray,
+    pts: np.ndarray,
     *,
-    shell_mask: np.ndarray,
-    origin: np.ndarray,
     voxel_size: float,
-    original_points: np.ndarray,
-    mode: str = "nn",
-    radius: float | None = None,
+    mode: str,
+    radius: float | None,
     status_cb=None,
+    tree=None,
+    cancel_token: CancellationToken | None = None,
 ) -> np.ndarray:
-    cKDTree, _binary_closing = _require_scipy()
+    cKDTree, _ndimage = _require_scipy()
 
-    centers = voxel_centers_from_mask(shell_mask, origin, voxel_size)
     if centers.shape[0] == 0:
         return np.empty((0, 3), dtype=np.float32)
 
-    pts = np.asarray(original_points, dtype=np.float32)
-    tree = cKDTree(pts)
+    if tree is None:
+        tree = cKDTree(pts)
+
+    # Queries run in batches so a cancel is noticed between them.
+    batches = [
+        centers[start : start + _MAP_QUERY_BATCH]
+        for start in range(0, centers.shape[0], _MAP_QUERY_BATCH)
+    ]
+
+    def checkpoint(done: int) -> None:
+        if cancel_token is not None:
+            cancel_token.checkpoint("map_to_original", done, len(batches))
+
+    # Points are deduplicated by index: every hit sets its point's flag.
+    hit = np.zeros(pts.shape[0], dtype=bool)
 
     if mode == "nn":
         if status_cb:
             status_cb("map_nn_start", f"shell_voxels={centers.shape[0]}")
-        _, idx = tree.query(centers, k=1, workers=-1)
-        mapped = np.unique(pts[idx], axis=0).astype(np.float32)
+        for done, batch in enumerate(batches):
+            checkpoint(done)
+            hit[tree.query(batch, k=1, workers=-1)[1]] = True
+        mapped = _unique_rows(pts[hit])
         if status_cb:
             status_cb("map_nn_done", f"unique={mapped.shape[0]}")
         return mapped
@@ -156,11 +732,16 @@ def map_shell_voxels_to_original_points(
         actual_radius = float(radius if radius is not None else (1.25 * voxel_size))
         if status_cb:
             status_cb("map_radius_start", f"shell_voxels={centers.shape[0]} r={actual_radius:.6f}")
-        idx_lists = tree.query_ball_point(centers, r=actual_radius, workers=-1)
-        all_idx = np.fromiter((i for idx_list in idx_lists for i in idx_list), dtype=np.int64)
-        if all_idx.size == 0:
+        for done, batch in enumerate(batches):
+            checkpoint(done)
+            # One flat (point, center, distance) record per neighbour pair.
+            pairs = tree.sparse_distance_matrix(
+                cKDTree(batch), actual_radius, output_type="ndarray"
+            )
+            hit[pairs["i"]] = True
+        if not hit.any():
             return np.empty((0, 3), dtype=np.float32)
-        mapped = pts[np.unique(all_idx)].astype(np.float32)
+        mapped = np.asarray(pts[hit], dtype=np.float32)
         if status_cb:
             status_cb("map_radius_done", f"unique={mapped.shape[0]}")
         return mapped
@@ -168,6 +749,1022 @@ def map_shell_voxels_to_original_points(
     raise ValueError(f"Unknown mode={mode!r}. Use 'nn' or 'radius'.")
 
 
+def map_shell_voxels_to_original_points(
+    *,
+    shell_mask: np.ndarray,
+    origin: np.ndarray,
+    voxel_size: float,
+    original_points: np.ndarray,
+    mode: str = "nn",
+    radius: float | None = None,
+    status_cb=None,
+    tree=None,
+) -> np.ndarray:
+    return _map_centers_to_original_points(
+        voxel_centers_from_mask(shell_mask, origin, voxel_size),
+        np.asarray(original_points, dtype=np.float32),
+        voxel_size=voxel_size,
+        mode=mode,
+        radius=radius,
+        status_cb=status_cb,
+        tree=tree,
+    )
+
+
+class _PackedPlanes:
+    """Boolean voxel grid stored as one bit-packed row per x plane."""
+
+    __slots__ = ("bits", "plane_shape")
+
+    def __init__(self, dims: tuple[int, int, int], buffer=None) -> None:
+        nx, ny, nz = dims
+        self.plane_shape = (ny, nz)
+        shape = (nx, _packed_plane_bytes(dims))
+        if buffer is None:
+            self.bits = np.zeros(shape, dtype=np.uint8)
+        else:
+            self.bits = np.ndarray(shape, dtype=np.uint8, buffer=buffer)
+
+    def write(self, x0: int, block: np.ndarray) -> None:
+        self.bits[x0 : x0 + block.shape[0]] = np.packbits(block.reshape(block.shape[0], -1), axis=1)
+
+    def read(self, x0: int, x1: int) -> np.ndarray:
+        ny, nz = self.plane_shape
+        planes = np.unpackbits(self.bits[x0:x1], axis=1, count=ny * nz)
+        return planes.reshape(x1 - x0, ny, nz).view(bool)
+
+
+def _packed_plane_bytes(dims: tuple[int, int, int]) -> int:
+    return (dims[1] * dims[2] + 7) // 8
+
+
+@dataclass(slots=True)
+class _OutsideAirGrid:
+    """Bit-packed outside-air mask of a finished pass, looked up by position."""
+
+    origin: np.ndarray
+    voxel_size: float
+    planes: _PackedPlanes
+
+    def contains(self, positions: np.ndarray) -> np.ndarray:
+        """Whether each position lies in outside air; the world beyond the grid does."""
+        ny, nz = self.planes.plane_shape
+        dims = np.array([self.planes.bits.shape[0], ny, nz])
+        idx = np.floor((positions - self.origin) / self.voxel_size).astype(np.int64)
+        inside = np.all((idx >= 0) & (idx < dims), axis=1)
+        flat = idx[inside, 1] * nz + idx[inside, 2]
+        packed = self.planes.bits[idx[inside, 0], flat >> 3]
+        # np.packbits stores the first voxel of each byte in its high bit.
+        shift = (7 - (flat & 7)).astype(np.uint8)
+        result = np.ones(positions.shape[0], dtype=bool)
+        result[inside] = ((packed >> shift) & 1).astype(bool)
+        return result
+
+
+def _orient_normals_outward(
+    points: np.ndarray, normals: np.ndarray, outside_air: _OutsideAirGrid
+) -> None:
+    """Flip normals in place that point into the solid rather than out of it.
+
+    Each normal is probed a few voxels out along both directions; it is
+    flipped when its back side reaches outside air more often than its front.
+    """
+    score = np.zeros(points.shape[0], dtype=np.int8)
+    for distance in _NORMAL_PROBE_VOXELS:
+        offset = normals * np.float32(distance * outside_air.voxel_size)
+        score += outside_air.contains(points + offset)
+        score -= outside_air.contains(points - offset)
+    normals[score < 0] *= -1.0
+
+
+def _plan_tiles(
+    dims: tuple[int, int, int],
+    *,
+    field_engine: str,
+    sigma: float,
+    voxel_size: float,
+    band_radius: float,
+    closing_radius: int,
+    memory_budget_bytes: int | None,
+    workers: int = 1,
+    shared_bytes: int = 0,
+) -> tuple[int, int]:
+    """Return (planes per tile, halo planes) for the given memory budget.
+
+    Without a budget, parallel runs get a few tiles per worker so that uneven
+    tiles still balance.
+    """
+    nx, ny, nz = dims
+    plane_voxels = ny * nz
+    halo = 2 * closing_radius
+    if memory_budget_bytes is None:
+        return max(1, -(-nx // (4 * workers))), halo
+
+    # Packed solid and outside masks span the whole grid for the entire job, and
+    # every worker holds one tile block at a time.
+    available = int(memory_budget_bytes) - shared_bytes - 2 * nx * _packed_plane_bytes(dims)
+    available //= max(1, workers)
+    extra_planes = 2 * halo
+    if field_engine == "edt":
+        cutoff = band_radius if np.isfinite(band_radius) else _TILE_FIELD_CUTOFF_SIGMAS * sigma
+        extra_planes += 2 * (int(np.ceil(cutoff / voxel_size)) + 1)
+
+    planes = available // (plane_voxels * _TILE_BYTES_PER_VOXEL[field_engine]) - extra_planes
+    if planes < 1:
+        raise ValueError(
+            f"memory budget of {memory_budget_bytes} bytes is too small for grid dims={dims}."
+        )
+    return min(int(planes), nx), halo
+
+
+@dataclass(slots=True)
+class _TileParams:
+    origin: np.ndarray
+    dims: tuple[int, int, int]
+    voxel_size: float
+    sigma: float
+    iso_level: float
+    closing_radius: int
+    field_engine: str
+    band_radius: float
+    halo: int
+    # Worker processes build KD-trees over the points near each tile only, which
+    # treats field values beyond this radius as air like the tiled distance transform.
+    local_tree_radius: float | None = None
+    query_workers: int = -1
+
+
+class _TileState:
+    __slots__ = ("context", "outside", "params", "pts", "solid")
+
+    def __init__(
+        self,
+        params: _TileParams,
+        pts: np.ndarray,
+        solid: _PackedPlanes,
+        outside: _PackedPlanes,
+        context: SurfaceReconstructionContext | None = None,
+    ) -> None:
+        self.params = params
+        self.pts = pts
+        self.solid = solid
+        self.outside = outside
+        self.context = context
+
+    def field_tree(self, lo: int, hi: int):
+        cKDTree, _ndimage = _require_scipy()
+
+        radius = self.params.local_tree_radius
+        if radius is None:
+            if self.context is None:
+                self.context = SurfaceReconstructionContext(self.pts)
+            return self.context.tree, self.params.band_radius
+
+        x_min = self.params.origin[0] + lo * self.params.voxel_size - radius
+        x_max = self.params.origin[0] + (hi - 1) * self.params.voxel_size + radius
+        near = (self.pts[:, 0] >= x_min) & (self.pts[:, 0] <= x_max)
+        return cKDTree(self.pts[near]), min(self.params.band_radius, radius)
+
+
+def _tile_solid(state: _TileState, x0: int, x1: int) -> int:
+    _cKDTree, ndimage = _require_scipy()
+
+    params = state.params
+    lo, hi = max(0, x0 - params.halo), min(params.dims[0], x1 + params.halo)
+    band = None
+    if params.field_engine == "edt":
+        field = _distance_transform_field_slab(
+            state.pts,
+            params.origin,
+            params.dims,
+            params.voxel_size,
+            params.sigma,
+            lo,
+            hi,
+            params.band_radius,
+        )
+    else:
+        if np.isfinite(params.band_radius):
+            band = _narrow_band_slab(
+                state.pts, params.origin, params.dims, params.voxel_size, params.band_radius, lo, hi
+            )
+        tree, query_radius = state.field_tree(lo, hi)
+        if tree.n == 0:
+            field = np.zeros((hi - lo,) + state.solid.plane_shape, dtype=np.float32)
+        else:
+            field = _kdtree_field_slab(
+                tree,
+                params.origin,
+                params.dims,
+                params.voxel_size,
+                params.sigma,
+                lo,
+                hi,
+                band,
+                query_radius,
+                query_workers=params.query_workers,
+                cancel_token=state.context.cancel_token if state.context is not None else None,
+            )
+
+    block = field >= float(params.iso_level)
+    held = sum(array.nbytes for array in (field, band, block) if array is not None)
+    if params.field_engine == "edt":
+        held += field.size * _EDT_TRANSIENT_BYTES_PER_VOXEL
+    del field, band
+    if params.closing_radius > 0:
+        cr = params.closing_radius
+        structure = np.ones((2 * cr + 1, 2 * cr + 1, 2 * cr + 1), dtype=bool)
+        block = ndimage.binary_closing(block, structure=structure)
+    state.solid.write(x0, block[x0 - lo : x1 - lo])
+    return held
+
+
+def _tile_air_labels(state: _TileState, x0: int, x1: int):
+    """Label the air of one tile; returns what the cross-tile merge needs."""
+    _cKDTree, ndimage = _require_scipy()
+
+    air = ~state.solid.read(x0, x1)
+    labels, count = ndimage.label(air)
+    held = air.nbytes + labels.nbytes
+    faces = [labels[:, 0, :], labels[:, -1, :], labels[:, :, 0], labels[:, :, -1]]
+    if x0 == 0:
+        faces.append(labels[0])
+    if x1 == state.params.dims[0]:
+        faces.append(labels[-1])
+    touching = np.unique(np.concatenate([face.reshape(-1) for face in faces]))
+    return count, labels[0].copy(), labels[-1].copy(), touching[touching > 0], held
+
+
+def _tile_outside(state: _TileState, x0: int, x1: int, lookup: np.ndarray) -> int:
+    _cKDTree, ndimage = _require_scipy()
+
+    labels, _count = ndimage.label(~state.solid.read(x0, x1))
+    state.outside.write(x0, lookup[labels])
+    return labels.nbytes
+
+
+def _tile_shell(state: _TileState, x0: int, x1: int):
+    lo, hi = max(0, x0 - 1), min(state.params.dims[0], x1 + 1)
+    solid_block = state.solid.read(lo, hi)
+    outside_block = state.outside.read(lo, hi)
+    shell = voxel_shell_of_solid_adjacent_to(solid_block, outside_block)
+    idx = np.argwhere(shell[x0 - lo : x1 - lo])
+    idx[:, 0] += x0
+    return idx, solid_block.nbytes + outside_block.nbytes + shell.nbytes
+
+
+def _outside_lookups_from_tile_labels(tile_labels: list) -> list[np.ndarray]:
+    """Join per-tile air labels across tile faces and mark boundary components.
+
+    Returns one lookup per tile that maps a local air label to "outside".
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    offsets = np.cumsum([0] + [result[0] for result in tile_labels])
+    label_count = int(offsets[-1])
+    edges = []
+    for index in range(1, len(tile_labels)):
+        previous_last = tile_labels[index - 1][2].reshape(-1)
+        current_first = tile_labels[index][1].reshape(-1)
+        joined = (previous_last > 0) & (current_first > 0)
+        pairs = np.stack(
+            [
+                previous_last[joined].astype(np.int64) + (offsets[index - 1] - 1),
+                current_first[joined].astype(np.int64) + (offsets[index] - 1),
+            ],
+            axis=1,
+        )
+        edges.append(np.unique(pairs, axis=0))
+
+    outside_by_label = np.zeros(label_count, dtype=bool)
+    if label_count:
+        pairs = np.concatenate(edges) if edges else np.empty((0, 2), dtype=np.int64)
+        graph = coo_matrix(
+            (np.ones(pairs.shape[0], dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+            shape=(label_count, label_count),
+        )
+        _component_count, component = connected_components(graph, directed=False)
+        boundary = np.concatenate(
+            [
+                result[3].astype(np.int64) + (offset - 1)
+                for result, offset in zip(tile_labels, offsets)
+            ]
+        )
+        outside_component = np.zeros(int(component.max()) + 1, dtype=bool)
+        outside_component[component[boundary]] = True
+        outside_by_label = outside_component[component]
+
+    lookups = []
+    for result, offset in zip(tile_labels, offsets):
+        lookup = np.zeros(result[0] + 1, dtype=bool)
+        lookup[1:] = outside_by_label[offset : offset + result[0]]
+        lookups.append(lookup)
+    return lookups
+
+
+class _LocalTileRunner:
+    concurrency = 1
+
+    def __init__(self, params: _TileParams, context: SurfaceReconstructionContext) -> None:
+        self.state = _TileState(
+            params,
+            context.points,
+            _PackedPlanes(params.dims),
+            _PackedPlanes(params.dims),
+            context,
+        )
+        self.shared_bytes = self.state.solid.bits.nbytes + self.state.outside.bits.nbytes
+
+    def outside_planes(self) -> _PackedPlanes:
+        return self.state.outside
+
+    def map(self, fn, tiles, extra_args=None, on_tile_done=None) -> list:
+        results = []
+        for index, (x0, x1) in enumerate(tiles):
+            args = () if extra_args is None else (extra_args[index],)
+            results.append(fn(self.state, x0, x1, *args))
+            if on_tile_done:
+                on_tile_done(x0, x1)
+        return results
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass(slots=True)
+class _SharedTileSpec:
+    params: _TileParams
+    point_count: int
+    points_name: str
+    solid_name: str
+    outside_name: str
+
+
+def _run_shared_tile_task(spec: _SharedTileSpec, fn, x0: int, x1: int, *args):
+    from multiprocessing.shared_memory import SharedMemory
+
+    # Pool workers outlive the job, so the blocks are attached per task and
+    # closed again; a worker never keeps a finished job's memory mapped.
+    # Spawned workers share the parent's resource tracker, so attaching here
+    # does not hand ownership of the blocks to the worker.
+    blocks = [
+        SharedMemory(name=name) for name in (spec.points_name, spec.solid_name, spec.outside_name)
+    ]
+    try:
+        state = _TileState(
+            spec.params,
+            np.ndarray((spec.point_count, 3), dtype=np.float32, buffer=blocks[0].buf),
+            _PackedPlanes(spec.params.dims, blocks[1].buf),
+            _PackedPlanes(spec.params.dims, blocks[2].buf),
+        )
+        result = fn(state, x0, x1, *args)
+        del state
+        return result
+    finally:
+        for block in blocks:
+            block.close()
+
+
+_TILE_POOL_WORKERS = os.cpu_count() or 1
+_tile_pool = None
+_tile_pool_lock = threading.Lock()
+
+
+def _shared_tile_pool():
+    """The process's tile worker pool, started on first use and kept for later jobs."""
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    global _tile_pool
+
+    with _tile_pool_lock:
+        if _tile_pool is None:
+            # Spawned workers do not inherit the event loop or OPC UA client threads.
+            _tile_pool = ProcessPoolExecutor(
+                max_workers=_TILE_POOL_WORKERS, mp_context=get_context("spawn")
+            )
+        return _tile_pool
+
+
+def shutdown_tile_pool() -> None:
+    """Stop the tile worker pool; a later parallel job starts a new one."""
+    global _tile_pool
+
+    with _tile_pool_lock:
+        pool, _tile_pool = _tile_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _SharedTileRunner:
+    """Runs tile passes in a process pool over shared-memory points and masks."""
+
+    def __init__(self, params: _TileParams, pts: np.ndarray, workers: int) -> None:
+        from multiprocessing.shared_memory import SharedMemory
+
+        self._executor = _shared_tile_pool()
+        # Jobs share the pool; each keeps at most `concurrency` tiles in flight.
+        self.concurrency = min(workers, _TILE_POOL_WORKERS)
+        mask_bytes = params.dims[0] * _packed_plane_bytes(params.dims)
+        self._blocks = []
+        try:
+            points_block = SharedMemory(create=True, size=max(1, pts.nbytes))
+            self._blocks.append(points_block)
+            np.ndarray(pts.shape, dtype=np.float32, buffer=points_block.buf)[:] = pts
+            for _name in ("solid", "outside"):
+                self._blocks.append(SharedMemory(create=True, size=max(1, mask_bytes)))
+        except BaseException:
+            self.close()
+            raise
+        self.shared_bytes = pts.nbytes + 2 * mask_bytes
+        self._spec = _SharedTileSpec(
+            params=params,
+            point_count=int(pts.shape[0]),
+            points_name=self._blocks[0].name,
+            solid_name=self._blocks[1].name,
+            outside_name=self._blocks[2].name,
+        )
+
+    def map(self, fn, tiles, extra_args=None, on_tile_done=None) -> list:
+        from concurrent.futures import FIRST_COMPLETED, wait
+        from concurrent.futures.process import BrokenProcessPool
+
+        results = [None] * len(tiles)
+        queued = iter(range(len(tiles)))
+        pending = {}
+        try:
+            while True:
+                for index in islice(queued, self.concurrency - len(pending)):
+                    x0, x1 = tiles[index]
+                    args = () if extra_args is None else (extra_args[index],)
+                    future = self._executor.submit(
+                        _run_shared_tile_task, self._spec, fn, x0, x1, *args
+                    )
+                    pending[future] = index
+                if not pending:
+                    return results
+                done, _running = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    results[index] = future.result()
+                    if on_tile_done:
+                        on_tile_done(*tiles[index])
+        except BrokenProcessPool:
+            shutdown_tile_pool()
+            raise
+        finally:
+            # On cancellation, let running tiles finish before `close` frees
+            # the shared blocks they are writing to.
+            for future in pending:
+                future.cancel()
+            wait(pending)
+
+    def outside_planes(self) -> _PackedPlanes:
+        # Copied out of shared memory, which `close` releases.
+        planes = _PackedPlanes(self._spec.params.dims)
+        planes.bits[...] = _PackedPlanes(self._spec.params.dims, self._blocks[2].buf).bits
+        return planes
+
+    def close(self) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def _compute_outer_shell_centers_tiled(
+    ctx: SurfaceReconstructionContext,
+    origin: np.ndarray,
+    dims: tuple[int, int, int],
+    *,
+    voxel_size: float,
+    sigma: float,
+    iso_level: float,
+    closing_radius: int,
+    field_engine: str,
+    band_radius: float,
+    tile_planes: int,
+    halo: int,
+    workers: int = 1,
+) -> np.ndarray:
+    """Tiled field, closing, flood fill and shell extraction along the x axis.
+
+    Tiles overlap by `halo` planes so the closing matches the full-grid result.
+    The flood fill labels air per tile, joins labels across tile faces with a
+    connected-components pass and then marks the components that touch the
+    grid boundary. With `workers > 1` every per-tile pass runs in a process
+    pool; only the label merge runs in the calling process.
+    """
+    nx = dims[0]
+    tiles = [(x0, min(x0 + tile_planes, nx)) for x0 in range(0, nx, tile_planes)]
+    if ctx.stats is not None:
+        ctx.stats.tile_count = len(tiles)
+    ctx.report(
+        "tiling",
+        f"tiles={len(tiles)} planes={tile_planes} halo={halo} workers={workers}",
+    )
+
+    params = _TileParams(
+        origin=np.asarray(origin, dtype=np.float32),
+        dims=dims,
+        voxel_size=float(voxel_size),
+        sigma=float(sigma),
+        iso_level=float(iso_level),
+        closing_radius=int(closing_radius),
+        field_engine=field_engine,
+        band_radius=float(band_radius),
+        halo=int(halo),
+    )
+    if workers > 1:
+        params.local_tree_radius = min(band_radius, _TILE_FIELD_CUTOFF_SIGMAS * float(sigma))
+        params.query_workers = 1
+        runner = _SharedTileRunner(params, ctx.points, workers)
+    else:
+        runner = _LocalTileRunner(params, ctx)
+
+    def note(held: list[int]) -> None:
+        # Concurrent workers each hold one tile at a time.
+        busiest = sorted(held, reverse=True)[: runner.concurrency]
+        _note_working_set(ctx.stats, extra_bytes=runner.shared_bytes + sum(busiest))
+
+    def field_progress(_x0: int, x1: int) -> None:
+        nonlocal planes_done
+        planes_done += x1 - _x0
+        ctx.report("field_progress", f"{planes_done}/{nx}")
+        ctx.checkpoint("build_field", planes_done, nx)
+
+    def tile_checkpoint(stage: str):
+        tiles_done = 0
+
+        def on_tile_done(_x0: int, _x1: int) -> None:
+            nonlocal tiles_done
+            tiles_done += 1
+            ctx.checkpoint(stage, tiles_done, len(tiles))
+
+        return on_tile_done
+
+    planes_done = 0
+    try:
+        ctx.checkpoint("build_field")
+        ctx.report("build_field_start")
+        with ctx.measure("build_field") as metrics:
+            note(runner.map(_tile_solid, tiles, on_tile_done=field_progress))
+            metrics.grid_dims = tuple(dims)
+        ctx.report("build_field_done")
+
+        ctx.report("flood_fill_start")
+        with ctx.measure("flood_fill") as metrics:
+            tile_labels = runner.map(
+                _tile_air_labels, tiles, on_tile_done=tile_checkpoint("flood_fill")
+            )
+            note([result[4] for result in tile_labels])
+            lookups = _outside_lookups_from_tile_labels(tile_labels)
+            del tile_labels
+            note(runner.map(_tile_outside, tiles, extra_args=lookups))
+            metrics.grid_dims = tuple(dims)
+        ctx.report("flood_fill_done")
+
+        ctx.checkpoint("shell")
+        ctx.report("shell_start")
+        with ctx.measure("shell") as metrics:
+            shells = runner.map(_tile_shell, tiles, on_tile_done=tile_checkpoint("shell"))
+            note([held for _idx, held in shells])
+            metrics.grid_dims = tuple(dims)
+            metrics.active_voxels = sum(int(idx.shape[0]) for idx, _held in shells)
+        ctx.report("shell_done")
+        if ctx.retain_outside_air:
+            ctx.outside_air = _OutsideAirGrid(
+                params.origin, params.voxel_size, runner.outside_planes()
+            )
+    finally:
+        runner.close()
+
+    idx = np.concatenate([idx for idx, _held in shells])
+    if idx.size == 0:
+        return np.empty((0, 3), dtype=np.float32)
+    return origin[None, :] + (idx.astype(np.float32) + 0.5) * float(voxel_size)
+
+
+def _guided_field(
+    ctx: SurfaceReconstructionContext,
+    guide: _ShellGuide,
+    *,
+    voxel_size: float,
+    sigma: float,
+    iso_level: float,
+    padding: float,
+    field_band_sigmas: float | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    origin, dims = _grid_for_points(ctx.points, voxel_size, padding)
+    _validate_field_options(sigma, "kdtree", field_band_sigmas, iso_level)
+    inside, band = guide.resample(origin, dims, voxel_size)
+    band_radius = np.inf
+    if field_band_sigmas is not None:
+        band_radius = float(field_band_sigmas) * float(sigma)
+        band &= narrow_band_mask(ctx.points, origin, dims, voxel_size, band_radius)
+    ctx.report("field_band", f"active={int(np.count_nonzero(band))}/{band.size}")
+    field = _kdtree_field_slab(
+        ctx.tree,
+        origin,
+        dims,
+        voxel_size,
+        sigma,
+        0,
+        dims[0],
+        band,
+        band_radius,
+        ctx.status_cb,
+        cancel_token=ctx.cancel_token,
+    )
+    # Away from the coarse boundary the coarse classification stands.
+    solid = np.where(band, field >= float(iso_level), inside)
+    return solid, field, origin
+
+
+def _compute_outer_shell_centers(
+    ctx: SurfaceReconstructionContext,
+    *,
+    voxel_size: float,
+    sigma: float,
+    iso_level: float,
+    padding: float,
+    closing_radius: int,
+    field_engine: str,
+    field_band_sigmas: float | None,
+    guide: _ShellGuide | None = None,
+    preview: bool = False,
+    mesh_step: int | None = None,
+) -> tuple[np.ndarray | SurfaceMesh, _ShellGuide | None]:
+    """Untiled pipeline; returns the shell centers and, for previews, a guide.
+
+    Preview passes neither use nor keep the context field. A `guide` restricts
+    the kdtree field build to the band around the guide's boundary. With
+    `mesh_step` the field is kept past the flood fill and the outer isosurface
+    mesh is returned in place of the shell centers.
+    """
+    _cKDTree, ndimage = _require_scipy()
+
+    # A cached field may have been banded for another iso level, so this job's
+    # iso level is checked against the band before any field is thresholded.
+    _validate_field_options(sigma, field_engine, field_band_sigmas, iso_level)
+    edt_bytes = 0
+    if ctx.field is not None and not preview:
+        field, origin, dims = ctx.field
+        if tuple(field.shape) != _grid_for_points(ctx.points, voxel_size, padding)[1]:
+            raise ValueError("context field does not match the point cloud grid.")
+        ctx.report("build_field_cached", f"dims={tuple(dims)}")
+        solid = field >= float(iso_level)
+    elif guide is not None and field_engine == "kdtree":
+        ctx.report("build_field_start")
+        with ctx.measure("build_field") as metrics:
+            solid, field, origin = _guided_field(
+                ctx,
+                guide,
+                voxel_size=voxel_size,
+                sigma=sigma,
+                iso_level=iso_level,
+                padding=padding,
+                field_band_sigmas=field_band_sigmas,
+            )
+            metrics.grid_dims = tuple(solid.shape)
+            metrics.active_voxels = int(np.count_nonzero(solid))
+        ctx.report("build_field_done")
+    else:
+        ctx.report("build_field_start")
+        with ctx.measure("build_field") as metrics:
+            field, origin, dims = build_field_from_points(
+                ctx.points,
+                voxel_size,
+                sigma,
+                padding,
+                engine=field_engine,
+                band_sigmas=field_band_sigmas,
+                status_cb=ctx.status_cb,
+                tree=ctx.tree if field_engine == "kdtree" else None,
+                cancel_token=ctx.cancel_token,
+            )
+            solid = field >= float(iso_level)
+            metrics.grid_dims = tuple(dims)
+            metrics.active_voxels = int(np.count_nonzero(solid))
+        ctx.report("build_field_done")
+        if field_engine == "edt":
+            edt_bytes = field.size * _EDT_TRANSIENT_BYTES_PER_VOXEL
+        if ctx.retain_field and not preview:
+            ctx.field = (field, origin, dims)
+
+    _note_working_set(ctx.stats, field, solid, extra_bytes=edt_bytes)
+    if mesh_step is None:
+        del field
+    if closing_radius > 0:
+        ctx.checkpoint("closing")
+        cr = closing_radius
+        ctx.report("closing_start", f"r={cr}")
+        with ctx.measure("closing") as metrics:
+            structure = np.ones((2 * cr + 1, 2 * cr + 1, 2 * cr + 1), dtype=bool)
+            solid = ndimage.binary_closing(solid.astype(bool, copy=False), structure=structure)
+            metrics.grid_dims = tuple(solid.shape)
+            metrics.active_voxels = int(np.count_nonzero(solid))
+        ctx.report("closing_done")
+    air = ~solid
+
+    ctx.checkpoint("flood_fill")
+    ctx.report("flood_fill_start")
+    with ctx.measure("flood_fill") as metrics:
+        outside_air = flood_fill_outside_air(air)
+        metrics.grid_dims = tuple(air.shape)
+        metrics.active_voxels = int(np.count_nonzero(outside_air))
+    # ndimage.label holds an int32 label grid while the fill runs.
+    _note_working_set(ctx.stats, solid, air, outside_air, extra_bytes=air.size * 4)
+    del air
+    ctx.report("flood_fill_done")
+
+    if mesh_step is not None:
+        ctx.checkpoint("mesh")
+        ctx.report("mesh_start", f"step={mesh_step}")
+        with ctx.measure("mesh") as metrics:
+            mesh = extract_outer_surface_mesh(
+                field, origin, voxel_size, iso_level, outside_air, step_size=mesh_step
+            )
+            metrics.grid_dims = tuple(outside_air.shape)
+        # Marching cubes works on a copy of the field with the inside lifted.
+        _note_working_set(
+            ctx.stats,
+            field,
+            solid,
+            outside_air,
+            mesh.vertices,
+            mesh.triangles,
+            extra_bytes=field.nbytes,
+        )
+        ctx.report("mesh_done", f"vertices={mesh.vertex_count} triangles={mesh.triangle_count}")
+        return mesh, None
+
+    ctx.checkpoint("shell")
+    ctx.report("shell_start")
+    with ctx.measure("shell") as metrics:
+        outer_shell = voxel_shell_of_solid_adjacent_to(solid, outside_air)
+        metrics.grid_dims = tuple(solid.shape)
+        metrics.active_voxels = int(np.count_nonzero(outer_shell))
+    _note_working_set(ctx.stats, solid, outside_air, outer_shell)
+    ctx.report("shell_done")
+
+    next_guide = None
+    if preview:
+        next_guide = _ShellGuide.from_outside_air(origin, voxel_size, outside_air)
+    elif ctx.retain_outside_air:
+        planes = _PackedPlanes(outside_air.shape)
+        planes.write(0, outside_air)
+        ctx.outside_air = _OutsideAirGrid(origin, float(voxel_size), planes)
+    return voxel_centers_from_mask(outer_shell, origin, voxel_size), next_guide
+
+
+def _preprocess_points(
+    ctx: SurfaceReconstructionContext,
+    *,
+    downsample_voxel_size: float | None,
+    downsample_mode: str,
+    outlier_neighbors: int | None,
+    outlier_std_ratio: float,
+) -> None:
+    pts = ctx.points
+    input_count = int(pts.shape[0])
+    if downsample_voxel_size:
+        ctx.checkpoint("preprocess")
+        ctx.report("downsample_start", f"voxel={downsample_voxel_size:g} mode={downsample_mode}")
+        with ctx.measure("downsample"):
+            pts = voxel_downsample(pts, float(downsample_voxel_size), mode=downsample_mode)
+        # Later stages, including the outlier filter, build their tree on the thinned cloud.
+        ctx.replace_points(pts)
+        ctx.report(
+            "downsample_done",
+            f"count={input_count}->{pts.shape[0]} ratio={pts.shape[0] / input_count:.3f}",
+        )
+    if outlier_neighbors:
+        before = int(pts.shape[0])
+        ctx.report(
+            "outlier_filter_start", f"neighbors={outlier_neighbors} std_ratio={outlier_std_ratio:g}"
+        )
+        with ctx.measure("outlier_filter"):
+            keep = statistical_outlier_mask(
+                pts,
+                neighbors=int(outlier_neighbors),
+                std_ratio=float(outlier_std_ratio),
+                tree=ctx.tree,
+                checkpoint=lambda done, total: ctx.checkpoint("preprocess", done, total),
+            )
+        if not keep.all():
+            pts = pts[keep]
+            ctx.replace_points(pts)
+        ctx.report("outlier_filter_done", f"count={before}->{pts.shape[0]}")
+
+    ratio = pts.shape[0] / input_count
+    if ctx.stats is not None:
+        ctx.stats.input_point_count = input_count
+        ctx.stats.reduction_ratio = ratio
+    ctx.report("preprocess_done", f"count={input_count}->{pts.shape[0]} ratio={ratio:.3f}")
+
+
+def _prepare_context(
+    points_xyz: np.ndarray,
+    *,
+    min_points: int,
+    context: SurfaceReconstructionContext | None,
+    status_cb,
+    stats: SurfaceReconstructionStats | None,
+    cancel_token: CancellationToken | None,
+    downsample_voxel_size: float | None,
+    downsample_mode: str,
+    outlier_neighbors: int | None,
+    outlier_std_ratio: float,
+) -> SurfaceReconstructionContext:
+    pts = np.asarray(points_xyz, dtype=np.float32)
+    if pts.ndim != 2 or pts.shape[1] != 3:
+        raise ValueError(f"points_xyz must be (N,3), got {pts.shape}")
+    if pts.shape[0] < min_points:
+        raise ValueError(f"Too few points ({pts.shape[0]}). Need at least {min_points}.")
+
+    ctx = context if context is not None else SurfaceReconstructionContext(pts)
+    if ctx.points.shape != pts.shape:
+        raise ValueError("context was created for a different point cloud.")
+    if status_cb is not None:
+        ctx.status_cb = status_cb
+    if stats is not None:
+        ctx.stats = stats
+    if cancel_token is not None:
+        ctx.cancel_token = cancel_token
+
+    if downsample_voxel_size or outlier_neighbors:
+        _preprocess_points(
+            ctx,
+            downsample_voxel_size=downsample_voxel_size,
+            downsample_mode=downsample_mode,
+            outlier_neighbors=outlier_neighbors,
+            outlier_std_ratio=outlier_std_ratio,
+        )
+        if ctx.points.shape[0] < min_points:
+            raise ValueError(
+                f"Too few points after preprocessing ({ctx.points.shape[0]}). "
+                f"Need at least {min_points}."
+            )
+    return ctx
+
+
+def _run_preview_passes(
+    ctx: SurfaceReconstructionContext,
+    *,
+    voxel_size: float,
+    sigma: float,
+    iso_level: float,
+    padding: float,
+    closing_radius: int,
+    field_engine: str,
+    field_band_sigmas: float | None,
+    preview_voxel_factors: tuple[float, ...],
+    preview_cb,
+) -> _ShellGuide | None:
+    guide = None
+    factors = sorted({float(f) for f in preview_voxel_factors if f > 1.0}, reverse=True)
+    for pass_index, factor in enumerate(factors):
+        preview_voxel_size = float(voxel_size) * factor
+        try:
+            _grid_for_points(ctx.points, preview_voxel_size, padding)
+        except ValueError:
+            # Too coarse for this cloud; finer passes still run.
+            continue
+        ctx.report(
+            "preview_start",
+            f"pass={pass_index + 1}/{len(factors)} voxel={preview_voxel_size:g}",
+        )
+        preview_centers, guide = _compute_outer_shell_centers(
+            ctx,
+            voxel_size=preview_voxel_size,
+            sigma=sigma,
+            iso_level=iso_level,
+            padding=padding,
+            closing_radius=round(closing_radius / factor),
+            field_engine=field_engine,
+            field_band_sigmas=field_band_sigmas,
+            guide=guide,
+            preview=True,
+        )
+        preview_points = _map_centers_to_original_points(
+            preview_centers,
+            ctx.points,
+            voxel_size=preview_voxel_size,
+            mode="nn",
+            radius=None,
+            tree=ctx.tree,
+            cancel_token=ctx.cancel_token,
+        )
+        ctx.report(
+            "preview_ready",
+            f"pass={pass_index + 1}/{len(factors)} count={preview_points.shape[0]}",
+        )
+        if preview_cb is not None:
+            preview_cb(pass_index, preview_voxel_size, preview_points)
+    return guide
+
+
+def compute_surface_mesh_from_xyz(
+    points_xyz: np.ndarray,
+    *,
+    voxel_size: float = 0.01,
+    sigma: float = 0.02,
+    iso_level: float = 0.30,
+    padding: float = 0.05,
+    closing_radius: int = 0,
+    min_points: int = 200,
+    field_engine: str = "kdtree",
+    field_band_sigmas: float | None = None,
+    memory_budget_bytes: int | None = None,
+    parallel_workers: int | None = None,
+    status_cb=None,
+    stats: SurfaceReconstructionStats | None = None,
+    context: SurfaceReconstructionContext | None = None,
+    preview_voxel_factors: tuple[float, ...] = (),
+    preview_cb=None,
+    cancel_token: CancellationToken | None = None,
+    downsample_voxel_size: float | None = None,
+    downsample_mode: str = "representative",
+    outlier_neighbors: int | None = None,
+    outlier_std_ratio: float = 2.0,
+    mesh_step: int = 1,
+) -> SurfaceMesh:
+    """Compute the outer surface of a point cloud as a triangle mesh.
+
+    Runs the same field, closing and flood fill as
+    `compute_surface_points_from_xyz` and then extracts the `iso_level`
+    isosurface between outside air and everything else (see
+    `extract_outer_surface_mesh`); `mesh_step` > 1 samples every n-th node for
+    a coarser mesh. Previews still stream surface points. The whole field has
+    to fit in memory, so tiling is not available.
+    """
+    if mesh_step < 1:
+        raise ValueError("mesh_step must be >= 1.")
+    if parallel_workers is not None and parallel_workers > 1:
+        raise ValueError(
+            "Mesh output needs the whole field in one process; unset parallel_workers."
+        )
+    ctx = _prepare_context(
+        points_xyz,
+        min_points=min_points,
+        context=context,
+        status_cb=status_cb,
+        stats=stats,
+        cancel_token=cancel_token,
+        downsample_voxel_size=downsample_voxel_size,
+        downsample_mode=downsample_mode,
+        outlier_neighbors=outlier_neighbors,
+        outlier_std_ratio=outlier_std_ratio,
+    )
+    cr = int(closing_radius) if closing_radius else 0
+    if memory_budget_bytes is not None:
+        _origin, dims = _grid_for_points(ctx.points, voxel_size, padding)
+        _validate_field_options(sigma, field_engine, field_band_sigmas, iso_level)
+        tile_planes, _halo = _plan_tiles(
+            dims,
+            field_engine=field_engine,
+            sigma=sigma,
+            voxel_size=voxel_size,
+            band_radius=np.inf if field_band_sigmas is None else float(field_band_sigmas) * sigma,
+            closing_radius=cr,
+            memory_budget_bytes=memory_budget_bytes,
+            workers=1,
+            shared_bytes=0,
+        )
+        if tile_planes < dims[0]:
+            raise ValueError(
+                "Mesh output needs the whole field in memory; raise or unset the memory budget."
+            )
+    guide = _run_preview_passes(
+        ctx,
+        voxel_size=voxel_size,
+        sigma=sigma,
+        iso_level=iso_level,
+        padding=padding,
+        closing_radius=cr,
+        field_engine=field_engine,
+        field_band_sigmas=field_band_sigmas,
+        preview_voxel_factors=preview_voxel_factors,
+        preview_cb=preview_cb,
+    )
+    mesh, _guide = _compute_outer_shell_centers(
+        ctx,
+        voxel_size=voxel_size,
+        sigma=sigma,
+        iso_level=iso_level,
+        padding=padding,
+        closing_radius=cr,
+        field_engine=field_engine,
+        field_band_sigmas=field_band_sigmas,
+        guide=guide,
+        mesh_step=int(mesh_step),
+    )
+    ctx.report("surface_mesh_done", f"vertices={mesh.vertex_count} triangles={mesh.triangle_count}")
+    return mesh
+
+
 def compute_surface_points_from_xyz(
     points_xyz: np.ndarray,
     *,
@@ -177,64 +1774,152 @@ def compute_surface_points_from_xyz(
     padding: float = 0.05,
     closing_radius: int = 0,
     min_points: int = 200,
+    field_engine: str = "kdtree",
+    field_band_sigmas: float | None = None,
+    memory_budget_bytes: int | None = None,
+    parallel_workers: int | None = None,
     status_cb=None,
     map_mode: str = "nn",
     map_radius: float | None = None,
+    stats: SurfaceReconstructionStats | None = None,
+    context: SurfaceReconstructionContext | None = None,
+    preview_voxel_factors: tuple[float, ...] = (),
+    preview_cb=None,
+    cancel_token: CancellationToken | None = None,
+    downsample_voxel_size: float | None = None,
+    downsample_mode: str = "representative",
+    outlier_neighbors: int | None = None,
+    outlier_std_ratio: float = 2.0,
+    normal_neighbors: int | None = None,
 ) -> np.ndarray:
-    _cKDTree, binary_closing = _require_scipy()
+    """Compute the outer surface of a point cloud as a subset of its points.
 
-    pts = np.asarray(points_xyz, dtype=np.float32)
-    if pts.ndim != 2 or pts.shape[1] != 3:
-        raise ValueError(f"points_xyz must be (N,3), got {pts.shape}")
-    if pts.shape[0] < min_points:
-        raise ValueError(f"Too few points ({pts.shape[0]}). Need at least {min_points}.")
+    Pass a `context` to keep the job's KD-tree for later queries or to reuse a
+    field across calls; it must have been created for `points_xyz`.
 
-    if status_cb:
-        status_cb("build_field_start")
-    field, origin, _dims = build_field_from_points(
-        pts,
-        voxel_size,
-        sigma,
-        padding,
-        status_cb=status_cb,
-    )
-    if status_cb:
-        status_cb("build_field_done")
+    Each of `preview_voxel_factors` runs a coarse preview pass at that multiple
+    of `voxel_size`, coarsest first, and hands its surface points to
+    `preview_cb(pass_index, voxel_size, points)`. Every later pass, including
+    the final untiled one, only evaluates the field near the previous shell.
 
-    solid = field >= float(iso_level)
-    if closing_radius and int(closing_radius) > 0:
-        cr = int(closing_radius)
-        if status_cb:
-            status_cb("closing_start", f"r={cr}")
-        structure = np.ones((2 * cr + 1, 2 * cr + 1, 2 * cr + 1), dtype=bool)
-        solid = binary_closing(solid.astype(bool, copy=False), structure=structure)
-        if status_cb:
-            status_cb("closing_done")
-    air = ~solid
+    A `cancel_token` is checked between field slabs, tiles and stages; once it
+    is cancelled the call raises `SurfaceReconstructionCancelled`.
 
-    if status_cb:
-        status_cb("flood_fill_start")
-    outside_air = flood_fill_outside_air(air)
-    if status_cb:
-        status_cb("flood_fill_done")
-
-    if status_cb:
-        status_cb("shell_start")
-    outer_shell = voxel_shell_of_solid_adjacent_to(solid, outside_air)
-    if status_cb:
-        status_cb("shell_done")
-
-    if status_cb:
-        status_cb("map_to_original_start", f"mode={map_mode}")
-    surface_points = map_shell_voxels_to_original_points(
-        shell_mask=outer_shell,
-        origin=origin,
-        voxel_size=voxel_size,
-        original_points=pts,
-        mode=map_mode,
-        radius=map_radius,
+    With `downsample_voxel_size` the cloud is first thinned to one point per
+    cell (see `voxel_downsample`), and with `outlier_neighbors` isolated points
+    are dropped (see `statistical_outlier_mask`); the surface is then built
+    from, and a subset of, what remains. A context's cached field must have
+    been built from the preprocessed cloud.
+
+    With `normal_neighbors` every result row is followed by its unit normal,
+    (N, 6) in all: a PCA over that many nearest cloud points, flipped to face
+    the outside air of the final pass.
+    """
+    if normal_neighbors is not None and normal_neighbors < 3:
+        raise ValueError("normal_neighbors must be >= 3.")
+    ctx = _prepare_context(
+        points_xyz,
+        min_points=min_points,
+        context=context,
         status_cb=status_cb,
+        stats=stats,
+        cancel_token=cancel_token,
+        downsample_voxel_size=downsample_voxel_size,
+        downsample_mode=downsample_mode,
+        outlier_neighbors=outlier_neighbors,
+        outlier_std_ratio=outlier_std_ratio,
+    )
+    pts = ctx.points
+    cr = int(closing_radius) if closing_radius else 0
+    workers = max(1, int(parallel_workers or 1))
+    ctx.retain_outside_air = normal_neighbors is not None
+    guide = _run_preview_passes(
+        ctx,
+        voxel_size=voxel_size,
+        sigma=sigma,
+        iso_level=iso_level,
+        padding=padding,
+        closing_radius=cr,
+        field_engine=field_engine,
+        field_band_sigmas=field_band_sigmas,
+        preview_voxel_factors=preview_voxel_factors,
+        preview_cb=preview_cb,
     )
-    if status_cb:
-        status_cb("surface_points_done", f"count={surface_points.shape[0]}")
-    return surface_points
+
+    centers = None
+    if memory_budget_bytes is not None or workers > 1:
+        origin, dims = _grid_for_points(pts, voxel_size, padding)
+        _validate_field_options(sigma, field_engine, field_band_sigmas, iso_level)
+        band_radius = np.inf if field_band_sigmas is None else float(field_band_sigmas) * sigma
+        tile_planes, halo = _plan_tiles(
+            dims,
+            field_engine=field_engine,
+            sigma=sigma,
+            voxel_size=voxel_size,
+            band_radius=band_radius,
+            closing_radius=cr,
+            memory_budget_bytes=memory_budget_bytes,
+            workers=workers,
+            shared_bytes=pts.nbytes if workers > 1 else 0,
+        )
+        # A single-process budget that fits the whole grid runs the untiled pipeline below.
+        if tile_planes < dims[0] or workers > 1:
+            centers = _compute_outer_shell_centers_tiled(
+                ctx,
+                origin,
+                dims,
+                voxel_size=voxel_size,
+                sigma=sigma,
+                iso_level=iso_level,
+                closing_radius=cr,
+                field_engine=field_engine,
+                band_radius=band_radius,
+                tile_planes=tile_planes,
+                halo=halo,
+                workers=workers,
+            )
+
+    if centers is None:
+        centers, _guide = _compute_outer_shell_centers(
+            ctx,
+            voxel_size=voxel_size,
+            sigma=sigma,
+            iso_level=iso_level,
+            padding=padding,
+            closing_radius=cr,
+            field_engine=field_engine,
+            field_band_sigmas=field_band_sigmas,
+            guide=guide,
+        )
+
+    ctx.report("map_to_original_start", f"mode={map_mode}")
+    with ctx.measure("surface_points") as metrics:
+        surface_points = _map_centers_to_original_points(
+            centers,
+            ctx.points,
+            voxel_size=voxel_size,
+            mode=map_mode,
+            radius=map_radius,
+            status_cb=ctx.status_cb,
+            tree=ctx.tree,
+            cancel_token=ctx.cancel_token,
+        )
+        metrics.active_voxels = int(centers.shape[0])
+    ctx.report("surface_points_done", f"count={surface_points.shape[0]}")
+    if normal_neighbors is None:
+        return surface_points
+
+    ctx.checkpoint("normals")
+    ctx.report("normals_start", f"neighbors={normal_neighbors}")
+    with ctx.measure("normals"):
+        normals = estimate_normals(
+            surface_points,
+            ctx.points,
+            neighbors=int(normal_neighbors),
+            tree=ctx.tree,
+            checkpoint=lambda done, total: ctx.checkpoint("normals", done, total),
+        )
+        _orient_normals_outward(surface_points, normals, ctx.outside_air)
+    ctx.outside_air = None
+    ctx.report("normals_done", f"count={normals.shape[0]}")
+    return np.concatenate([surface_points, normals], axis=1)
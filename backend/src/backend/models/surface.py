@@ -7,6 +7,15 @@ from pydantic import Field, TypeAdapter
 from .base import ContractModel
 
 
+PcdFormat = Literal["pcd2", "pcd3"]
+PcdCodec = Literal["zlib", "lzma"]
+NormalFormat = Literal["oct16"]
+SurfaceOutput = Literal["points", "mesh"]
+
+# Upper bound a client may request; the server also clamps to its CPU count.
+MAX_PARALLEL_WORKERS = 32
+
+
 class SurfaceProcessingConfig(ContractModel):
     voxel_size: float = 0.01
     sigma: float = 0.02
@@ -14,14 +23,43 @@ class SurfaceProcessingConfig(ContractModel):
     padding: float = 0.05
     closing_radius: int = 0
     min_points: int = 200
+    field_engine: Literal["kdtree", "edt"] = "kdtree"
+    field_band_sigmas: float | None = None
+    memory_budget_mb: float | None = Field(default=None, ge=16)
+    parallel_workers: int | None = Field(default=None, ge=1, le=MAX_PARALLEL_WORKERS)
     map_mode: Literal["nn", "radius"] = "nn"
     map_radius: float | None = None
+    # Coarse preview passes, as multiples of voxel_size; each pass rebuilds the field.
+    preview_voxel_factors: list[Annotated[float, Field(gt=1)]] = Field(
+        default_factory=list, max_length=4
+    )
+    downsample_voxel_size: float | None = None
+    downsample_mode: Literal["representative", "centroid"] = "representative"
+    outlier_neighbors: int | None = Field(default=None, ge=1, le=128)
+    outlier_std_ratio: float = 2.0
+    # Neighbours per PCA normal; when set, point results stream NRM1 normal frames.
+    normal_neighbors: int | None = Field(default=None, ge=3, le=128)
+    # Largest per-axis error, in metres, allowed when packing PCD3 results.
+    result_precision: float | None = None
+    # Upper bound on points per result frame; the server may pick fewer.
+    result_chunk_points: int | None = Field(default=None, ge=1, le=1_000_000)
+    # Most processing progress events per second; the server default applies when unset.
+    progress_max_rate: float | None = Field(default=None, gt=0, le=100)
+    # "mesh" streams the outer surface as MSH1 indexed triangles instead of points.
+    output: SurfaceOutput = "points"
+    # Marching-cubes step in voxels for mesh output; larger steps give coarser meshes.
+    mesh_step: int = Field(default=1, ge=1, le=16)
 
 
 class BeginSurfaceUploadCommand(ContractModel):
     type: Literal["beginSurfaceUpload"]
     request_id: str
     config: SurfaceProcessingConfig = Field(default_factory=SurfaceProcessingConfig)
+    # Result formats the client can decode, most preferred first. The server
+    # takes the first one it supports, so entries it does not know are allowed.
+    result_formats: list[str] = Field(default_factory=lambda: ["pcd2"])
+    # PCD3 codecs the client can inflate, negotiated the same way.
+    result_codecs: list[str] = Field(default_factory=lambda: ["zlib"])
 
 
 class FinishSurfaceUploadCommand(ContractModel):
@@ -36,8 +74,19 @@ class AbortSurfaceJobCommand(ContractModel):
     job_id: str
 
 
+class ResumeSurfaceUploadCommand(ContractModel):
+    type: Literal["resumeSurfaceUpload"]
+    request_id: str
+    job_id: str
+    # The token from surfaceUploadStarted; job ids alone are guessable.
+    resume_token: str
+
+
 SurfaceClientMessage = Annotated[
-    BeginSurfaceUploadCommand | FinishSurfaceUploadCommand | AbortSurfaceJobCommand,
+    BeginSurfaceUploadCommand
+    | FinishSurfaceUploadCommand
+    | AbortSurfaceJobCommand
+    | ResumeSurfaceUploadCommand,
     Field(discriminator="type"),
 ]
 
@@ -47,6 +96,12 @@ class SurfaceUploadStartedEvent(ContractModel):
     request_id: str | None = None
     job_id: str
     config: SurfaceProcessingConfig
+    result_format: PcdFormat = "pcd2"
+    # Codec of PCD3 result chunks; each chunk header names it as well.
+    result_codec: PcdCodec = "zlib"
+    upload_formats: list[PcdFormat] = Field(default_factory=lambda: ["pcd2", "pcd3"])
+    # Present it in resumeSurfaceUpload to continue this upload after a reconnect.
+    resume_token: str
 
 
 class SurfaceUploadProgressEvent(ContractModel):
@@ -57,6 +112,17 @@ class SurfaceUploadProgressEvent(ContractModel):
     point_count: int
 
 
+class SurfaceUploadResumedEvent(ContractModel):
+    type: Literal["surfaceUploadResumed"]
+    request_id: str | None = None
+    job_id: str
+    # None until the first chunk arrives; the client then resends everything.
+    chunk_count: int | None = None
+    chunks_received: int
+    missing_chunk_indices: list[int] = Field(default_factory=list)
+    upload_complete: bool = False
+
+
 class SurfaceUploadCompletedEvent(ContractModel):
     type: Literal["surfaceUploadCompleted"]
     job_id: str
@@ -64,11 +130,25 @@ class SurfaceUploadCompletedEvent(ContractModel):
     chunk_count: int
 
 
+class SurfaceStageReport(ContractModel):
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float
+    grid_dims: tuple[int, int, int] | None = None
+    active_voxels: int | None = None
+    kd_queries: int = 0
+    peak_rss_delta_bytes: int | None = None
+
+
 class SurfaceProcessingProgressEvent(ContractModel):
     type: Literal["surfaceProcessingProgress"]
     job_id: str
     stage: str
     message: str | None = None
+    queue_position: int | None = None
+    # Queue wait for "queued" events, remaining field build time for "field_progress".
+    eta_seconds: float | None = None
+    metrics: SurfaceStageReport | None = None
 
 
 class SurfaceJobReadyEvent(ContractModel):
@@ -77,7 +157,27 @@ class SurfaceJobReadyEvent(ContractModel):
     job_id: str
     original_point_count: int
     result_point_count: int
-    result_format: Literal["pcd2"] = "pcd2"
+    result_format: PcdFormat = "pcd2"
+    stream_seq_id: int
+    chunk_count: int | None = None
+    peak_working_set_bytes: int | None = None
+    reduction_ratio: float | None = None
+    stage_metrics: list[SurfaceStageReport] = Field(default_factory=list)
+    output: SurfaceOutput = "points"
+    # Mesh output only; result_point_count is then the vertex count.
+    triangle_count: int | None = None
+    # Set when every result chunk is followed by its NRM1 normals frame.
+    normal_format: NormalFormat | None = None
+
+
+class SurfacePreviewReadyEvent(ContractModel):
+    type: Literal["surfacePreviewReady"]
+    job_id: str
+    pass_index: int
+    pass_count: int
+    voxel_size: float
+    point_count: int
+    result_format: PcdFormat = "pcd2"
     stream_seq_id: int
 
 
@@ -93,6 +193,10 @@ class SurfaceJobAbortedEvent(ContractModel):
     type: Literal["surfaceJobAborted"]
     request_id: str | None = None
     job_id: str
+    cancelled_stage: str | None = None
+    fraction_done: float | None = None
+    elapsed_seconds: float | None = None
+    estimated_saved_seconds: float | None = None
 
 
 class SurfaceJobErrorEvent(ContractModel):
@@ -106,9 +210,11 @@ class SurfaceJobErrorEvent(ContractModel):
 SurfaceServerMessage = Annotated[
     SurfaceUploadStartedEvent
     | SurfaceUploadProgressEvent
+    | SurfaceUploadResumedEvent
     | SurfaceUploadCompletedEvent
     | SurfaceProcessingProgressEvent
     | SurfaceJobReadyEvent
+    | SurfacePreviewReadyEvent
     | SurfaceResultStreamCompletedEvent
     | SurfaceJobAbortedEvent
     | SurfaceJobErrorEvent,
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from backend.geometry.surface_mesh import SurfaceMesh
+from backend.geometry.surface_reconstruction import (
+    SurfaceReconstructionContext,
+    SurfaceReconstructionStats,
+    compute_surface_points_from_xyz,
+)
+from backend.models.surface import SurfaceProcessingConfig
+
+# Config fields that change how a job runs but not the surface it produces.
+_EXECUTION_ONLY_FIELDS = frozenset(
+    {
+        "memory_budget_mb",
+        "parallel_workers",
+        "preview_voxel_factors",
+        "result_precision",
+        "result_chunk_points",
+        "progress_max_rate",
+    }
+)
+# Config fields that determine the scalar field grid, including the
+# preprocessing that picks the points it is built from.
+_FIELD_KEY_FIELDS = frozenset(
+    {
+        "voxel_size",
+        "sigma",
+        "padding",
+        "field_engine",
+        "field_band_sigmas",
+        "downsample_voxel_size",
+        "downsample_mode",
+        "outlier_neighbors",
+        "outlier_std_ratio",
+    }
+)
+
+CachedArrays = dict[str, np.ndarray]
+
+
+def _cache_key(kind: str, points_digest: str, values: dict[str, object]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(points_digest.encode("ascii"))
+    digest.update(json.dumps(values, sort_keys=True).encode("utf-8"))
+    return f"{kind}-{digest.hexdigest()}"
+
+
+def surface_result_cache_key(points_digest: str, config: SurfaceProcessingConfig) -> str:
+    exclude = set(_EXECUTION_ONLY_FIELDS)
+    # Mesh jobs do not map back to the points, and point jobs do not mesh.
+    if config.output == "mesh":
+        exclude |= {"map_mode", "map_radius", "normal_neighbors"}
+    else:
+        exclude.add("mesh_step")
+    return _cache_key("result", points_digest, config.model_dump(exclude=exclude))
+
+
+def surface_field_cache_key(points_digest: str, config: SurfaceProcessingConfig) -> str:
+    return _cache_key("field", points_digest, config.model_dump(include=_FIELD_KEY_FIELDS))
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    view = np.asarray(array).view()
+    view.flags.writeable = False
+    return view
+
+
+class SurfaceCache:
+    """LRU cache of reconstruction arrays under a byte budget.
+
+    Entries are dicts of numpy arrays and are handed out read-only. With a
+    `spill_dir`, entries evicted from memory (or too large for it) are written
+    there as .npz files and loaded back on a later hit; the directory is trimmed
+    least-recently-used first to `spill_max_bytes`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        spill_dir: str | os.PathLike[str] | None = None,
+        spill_max_bytes: int | None = None,
+    ) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0.")
+        self.max_bytes = int(max_bytes)
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self.spill_max_bytes = spill_max_bytes
+        self.nbytes = 0
+        self._entries: OrderedDict[str, tuple[CachedArrays, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> CachedArrays | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return dict(entry[0])
+            arrays = self._load_spilled(key)
+            if arrays is None:
+                return None
+            self._insert(key, arrays)
+            return dict(arrays)
+
+    def put(self, key: str, arrays: CachedArrays) -> None:
+        frozen = {name: _frozen(array) for name, array in arrays.items()}
+        with self._lock:
+            self._insert(key, frozen)
+
+    def _insert(self, key: str, arrays: CachedArrays) -> None:
+        size = sum(int(array.nbytes) for array in arrays.values())
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.nbytes -= previous[1]
+        if size > self.max_bytes:
+            self._spill(key, arrays, size)
+            return
+        self._entries[key] = (arrays, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            evicted_key, (evicted, evicted_size) = self._entries.popitem(last=False)
+            self.nbytes -= evicted_size
+            self._spill(evicted_key, evicted, evicted_size)
+
+    def _spill_path(self, key: str) -> Path:
+        return self.spill_dir / f"{key}.npz"
+
+    def _spill(self, key: str, arrays: CachedArrays, size: int) -> None:
+        if self.spill_dir is None:
+            return
+        if self.spill_max_bytes is not None and size > self.spill_max_bytes:
+            return
+        path = self._spill_path(key)
+        if path.exists():
+            os.utime(path)
+        else:
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as handle:
+                np.savez(handle, **arrays)
+            os.replace(tmp_path, path)
+        self._trim_spill_dir()
+
+    def _load_spilled(self, key: str) -> CachedArrays | None:
+        if self.spill_dir is None:
+            return None
+        path = self._spill_path(key)
+        try:
+            with np.load(path) as data:
+                arrays = {name: _frozen(data[name]) for name in data.files}
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        os.utime(path)
+        return arrays
+
+    def _trim_spill_dir(self) -> None:
+        if self.spill_max_bytes is None:
+            return
+        files = []
+        for path in self.spill_dir.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _mtime, size, _path in files)
+        for _mtime, size, path in sorted(files):
+            if total <= self.spill_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def _cached_result(cached: CachedArrays) -> np.ndarray | SurfaceMesh:
+    if "triangles" in cached:
+        return SurfaceMesh(vertices=cached["vertices"], triangles=cached["triangles"])
+    return cached["points"]
+
+
+def compute_surface_points_cached(
+    points_xyz: np.ndarray,
+    *,
+    cache: SurfaceCache | None,
+    result_key: str | None = None,
+    field_key: str | None = None,
+    status_cb=None,
+    stats: SurfaceReconstructionStats | None = None,
+    compute=compute_surface_points_from_xyz,
+    **options,
+) -> np.ndarray | SurfaceMesh:
+    """Run `compute` (`compute_surface_points_from_xyz`) through `cache`.
+
+    A result hit returns the stored surface points, or the stored mesh when
+    `compute` is `compute_surface_mesh_from_xyz`; otherwise a field hit lets
+    the reconstruction skip its field build, and a freshly built field is stored
+    under `field_key` for later jobs with different iso_level/closing_radius.
+    """
+    if cache is None:
+        return compute(points_xyz, status_cb=status_cb, stats=stats, **options)
+
+    if result_key is not None:
+        cached = cache.get(result_key)
+        if cached is not None:
+            result = _cached_result(cached)
+            if status_cb:
+                count = result.vertex_count if isinstance(result, SurfaceMesh) else len(result)
+                status_cb("result_cached", f"count={count}")
+            return result
+
+    ctx = SurfaceReconstructionContext(points_xyz, status_cb=status_cb, stats=stats)
+    if field_key is not None:
+        cached = cache.get(field_key)
+        if cached is not None:
+            ctx.field = (cached["field"], cached["origin"], tuple(int(d) for d in cached["dims"]))
+        else:
+            ctx.retain_field = True
+
+    result = compute(points_xyz, context=ctx, **options)
+
+    if ctx.retain_field and ctx.field is not None:
+        field, origin, dims = ctx.field
+        ctx.field = None
+        cache.put(field_key, {"field": field, "origin": origin, "dims": np.asarray(dims)})
+    if result_key is not None:
+        if isinstance(result, SurfaceMesh):
+            cache.put(result_key, {"vertices": result.vertices, "triangles": result.triangles})
+        else:
+            cache.put(result_key, {"points": result})
+    return result
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import secrets
+from dataclasses import dataclass, field
 from typing import Literal
 
 from backend.geometry.pointcloud_transport import PcdAssembly
-from backend.models.surface import SurfaceProcessingConfig
+from backend.geometry.surface_reconstruction import CancellationToken
+from backend.models.surface import PcdCodec, PcdFormat, SurfaceProcessingConfig
+from backend.runtime.surface_result_stream import ChunkSendTiming
 
 
 SurfaceJobStatus = Literal[
     "uploading",
     "uploaded",
+    "queued",
     "processing",
     "completed",
     "aborted",
@@ -24,12 +28,23 @@ class SurfaceJob:
     stream_seq_id: int
     owner_id: str | None
     config: SurfaceProcessingConfig
+    # Handed to the client that began the upload; a resume must present it.
+    resume_token: str = field(default_factory=lambda: secrets.token_urlsafe(16))
+    # Monotonic time the owning connection closed mid-upload; None while attached.
+    detached_at: float | None = None
+    result_format: PcdFormat = "pcd2"
+    result_codec: PcdCodec = "zlib"
     status: SurfaceJobStatus = "uploading"
     assembly: PcdAssembly | None = None
     raw_points: object | None = None
+    points_digest: str | None = None
     surface_points: object | None = None
     original_point_count: int = 0
     result_point_count: int = 0
+    peak_working_set_bytes: int | None = None
     abort_requested: bool = False
     abort_notified: bool = False
+    abort_request_id: str | None = None
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
     processing_task: asyncio.Task[None] | None = None
+    result_send_timings: list[ChunkSendTiming] = field(default_factory=list)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+_FIELD_PROGRESS_STAGE = "field_progress"
+
+
+class SurfaceProgressChannel:
+    """Coalesces reconstruction status updates on their way to the event loop.
+
+    `post` may be called from any thread. It only stores the update as the
+    latest one for its stage and, if no flush is pending yet, wakes the loop
+    once; ticks arriving before the next flush overwrite each other. Flushes run
+    at most `max_rate` times per second and send the retained updates in the
+    order they were posted. `field_progress` updates ("done/total" planes) get
+    an ETA for the current field build from the plane rate observed so far.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[..., Awaitable[None]],
+        *,
+        loop: asyncio.AbstractEventLoop,
+        max_rate: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_rate <= 0.0:
+            raise ValueError("max_rate must be > 0.")
+        self.min_interval = 1.0 / float(max_rate)
+        self._emit = emit
+        self._loop = loop
+        self._clock = clock
+        self._lock = threading.Lock()
+        # stage -> (post order, message, metrics, posted at)
+        self._pending: dict[str, tuple[int, str | None, Any, float]] = {}
+        self._posted = 0
+        self._wake_scheduled = False
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._last_flush = float("-inf")
+        self._field_origin: tuple[float, int, int] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = self._loop.create_task(self._run())
+
+    def post(self, stage: str, message: str | None = None, metrics: Any = None) -> None:
+        posted_at = self._clock()
+        with self._lock:
+            self._posted += 1
+            self._pending[stage] = (self._posted, message, metrics, posted_at)
+            if self._wake_scheduled:
+                return
+            self._wake_scheduled = True
+        self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def aclose(self) -> None:
+        """Send whatever is still pending, then stop the flush loop."""
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+        else:
+            await self._flush()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            wait = self._last_flush + self.min_interval - self._clock()
+            if wait > 0.0 and not self._closing:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=wait)
+                except TimeoutError:
+                    pass
+            await self._flush()
+            if self._closing:
+                return
+
+    async def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._wake_scheduled = False
+        self._last_flush = self._clock()
+        for stage, (_order, message, metrics, posted_at) in sorted(
+            pending.items(), key=lambda item: item[1][0]
+        ):
+            await self._emit(
+                stage,
+                message,
+                eta_seconds=self._field_eta(stage, message, posted_at),
+                metrics=metrics,
+            )
+
+    def _field_eta(self, stage: str, message: str | None, posted_at: float) -> float | None:
+        if stage == "build_field_start":
+            self._field_origin = None
+        if stage != _FIELD_PROGRESS_STAGE or not message:
+            return None
+        try:
+            done, total = (int(part) for part in message.split("/", 1))
+        except ValueError:
+            return None
+        origin = self._field_origin
+        if origin is None or origin[2] != total or done < origin[1]:
+            self._field_origin = (posted_at, done, total)
+            return None
+        elapsed = posted_at - origin[0]
+        if elapsed <= 0.0 or done <= origin[1]:
+            return None
+        return (total - done) * elapsed / (done - origin[1])
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ChunkSendTiming:
+    stream_seq_id: int
+    chunk_index: int
+    point_count: int
+    byte_count: int
+    encode_seconds: float
+    send_seconds: float
+
+
+class ResultChunkSizer:
+    """Sizes result chunks so one frame takes about `target_frame_seconds` to send.
+
+    The rate is a running estimate of points per second delivered to one
+    connection, updated from every recorded chunk send. Smaller frames keep
+    progress events from queueing behind a large binary frame on the socket.
+    """
+
+    def __init__(
+        self,
+        *,
+        target_frame_seconds: float = 0.05,
+        points_per_second: float = 500_000.0,
+        min_points: int = 2048,
+        max_points: int = 200_000,
+    ) -> None:
+        if target_frame_seconds <= 0.0:
+            raise ValueError("target_frame_seconds must be > 0.")
+        if not 1 <= min_points <= max_points:
+            raise ValueError("Expected 1 <= min_points <= max_points.")
+        self.target_frame_seconds = float(target_frame_seconds)
+        self.points_per_second = float(points_per_second)
+        self.min_points = int(min_points)
+        self.max_points = int(max_points)
+
+    def chunk_points(self, total_points: int, cap: int | None = None) -> int:
+        size = int(self.points_per_second * self.target_frame_seconds)
+        size = max(self.min_points, min(self.max_points, size))
+        if cap is not None:
+            size = min(size, max(1, int(cap)))
+        return max(1, min(size, int(total_points)))
+
+    def record(self, timing: ChunkSendTiming) -> None:
+        # Sends that return immediately only went into a buffer; floor them so
+        # a burst of them does not claim an unbounded rate.
+        observed = timing.point_count / max(timing.send_seconds, 1e-4)
+        self.points_per_second = 0.7 * self.points_per_second + 0.3 * observed
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.models.surface import SurfaceProcessingConfig
+
+QueueCallback = Callable[[int, float], None]
+
+
+def estimate_surface_grid_voxels(points: np.ndarray, config: SurfaceProcessingConfig) -> int:
+    """Voxel count of the reconstruction grid the job will build."""
+    pts = np.asarray(points, dtype=np.float32)
+    if pts.ndim != 2 or pts.shape[0] == 0:
+        return 0
+    extent = pts.max(axis=0) - pts.min(axis=0) + 2.0 * float(config.padding)
+    dims = np.ceil(extent / float(config.voxel_size)).astype(np.int64) + 1
+    return int(np.prod(dims))
+
+
+@dataclass(slots=True)
+class _QueuedJob:
+    job_id: str
+    owner_id: str | None
+    estimated_voxels: int
+    sequence: int
+    admitted: asyncio.Future[None]
+    on_update: QueueCallback | None = None
+    last_position: int | None = None
+
+
+@dataclass(slots=True)
+class _RunningJob:
+    owner_id: str | None
+    estimated_voxels: int
+    started_at: float
+
+
+class SurfaceJobScheduler:
+    """Admits surface jobs into a fixed number of reconstruction slots.
+
+    Waiting jobs are served round-robin across owners: the next slot goes to
+    the owner with the fewest running jobs, then to the one served longest
+    ago. Within an owner, the job with the smallest estimated grid goes first.
+    Queued jobs hear their position and an ETA whenever the queue moves; ETAs
+    come from a running estimate of seconds per grid voxel.
+    """
+
+    def __init__(self, slots: int = 1, *, seconds_per_voxel: float = 2e-6) -> None:
+        if slots < 1:
+            raise ValueError("slots must be >= 1.")
+        self.slots = int(slots)
+        self.seconds_per_voxel = float(seconds_per_voxel)
+        self._waiting: list[_QueuedJob] = []
+        self._running: dict[str, _RunningJob] = {}
+        self._last_admitted: dict[str | None, int] = {}
+        self._admissions = 0
+        self._sequence = 0
+
+    @property
+    def queued_job_ids(self) -> list[str]:
+        return [entry.job_id for entry in self._admission_order()]
+
+    @property
+    def running_job_ids(self) -> list[str]:
+        return list(self._running)
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        job_id: str,
+        *,
+        owner_id: str | None,
+        estimated_voxels: int,
+        on_update: QueueCallback | None = None,
+    ) -> AsyncIterator[None]:
+        """Hold one reconstruction slot for the body; waits in the queue if all are busy."""
+        self._sequence += 1
+        entry = _QueuedJob(
+            job_id=job_id,
+            owner_id=owner_id,
+            estimated_voxels=max(0, int(estimated_voxels)),
+            sequence=self._sequence,
+            admitted=asyncio.get_running_loop().create_future(),
+            on_update=on_update,
+        )
+        self._waiting.append(entry)
+        self._admit_waiting()
+        self._publish()
+        try:
+            await entry.admitted
+        except BaseException:
+            if entry in self._waiting:
+                self._waiting.remove(entry)
+            elif self._running.pop(job_id, None) is not None:
+                self._admit_waiting()
+            self._publish()
+            raise
+
+        running = self._running[job_id]
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            # Only finished jobs say anything about the reconstruction rate.
+            if completed and running.estimated_voxels > 0:
+                observed = (time.monotonic() - running.started_at) / running.estimated_voxels
+                self.seconds_per_voxel = 0.7 * self.seconds_per_voxel + 0.3 * observed
+            self._running.pop(job_id, None)
+            self._admit_waiting()
+            self._publish()
+
+    def withdraw(self, job_id: str, exc: BaseException) -> bool:
+        """Fail a still-queued job's wait with `exc`; returns False once it has a slot."""
+        for entry in self._waiting:
+            if entry.job_id == job_id and not entry.admitted.done():
+                entry.admitted.set_exception(exc)
+                return True
+        return False
+
+    def _estimated_seconds(self, estimated_voxels: int) -> float:
+        return estimated_voxels * self.seconds_per_voxel
+
+    def _admission_order(self) -> list[_QueuedJob]:
+        # Replays the admission rule as if no running job finished meanwhile.
+        counts = Counter(running.owner_id for running in self._running.values())
+        last_admitted = dict(self._last_admitted)
+        tick = self._admissions
+        pending = [entry for entry in self._waiting if not entry.admitted.done()]
+        order = []
+        while pending:
+            entry = min(
+                pending,
+                key=lambda e: (
+                    counts[e.owner_id],
+                    last_admitted.get(e.owner_id, -1),
+                    e.estimated_voxels,
+                    e.sequence,
+                ),
+            )
+            pending.remove(entry)
+            order.append(entry)
+            counts[entry.owner_id] += 1
+            tick += 1
+            last_admitted[entry.owner_id] = tick
+        return order
+
+    def _admit_waiting(self) -> None:
+        while len(self._running) < self.slots:
+            order = self._admission_order()
+            if not order:
+                return
+            entry = order[0]
+            self._waiting.remove(entry)
+            self._admissions += 1
+            self._last_admitted[entry.owner_id] = self._admissions
+            self._running[entry.job_id] = _RunningJob(
+                owner_id=entry.owner_id,
+                estimated_voxels=entry.estimated_voxels,
+                started_at=time.monotonic(),
+            )
+            entry.admitted.set_result(None)
+
+    def _publish(self) -> None:
+        now = time.monotonic()
+        free_at = [
+            max(0.0, self._estimated_seconds(job.estimated_voxels) - (now - job.started_at))
+            for job in self._running.values()
+        ]
+        free_at.extend([0.0] * (self.slots - len(free_at)))
+        heapq.heapify(free_at)
+        for position, entry in enumerate(self._admission_order(), start=1):
+            start = heapq.heappop(free_at)
+            heapq.heappush(free_at, start + self._estimated_seconds(entry.estimated_voxels))
+            if entry.on_update is not None and entry.last_position != position:
+                entry.last_position = position
+                entry.on_update(position, start)
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+from uuid import uuid4
+
+import numpy as np
+
+from backend.geometry.surface_mesh import SurfaceMesh
+from backend.geometry.surface_reconstruction import (
+    CancellationToken,
+    SurfaceReconstructionStats,
+    compute_surface_mesh_from_xyz,
+    compute_surface_points_from_xyz,
+)
+from backend.models.surface import SurfaceOutput
+from backend.runtime.surface_cache import SurfaceCache, compute_surface_points_cached
+
+StatusCallback = Callable[[str, str | None], None]
+PreviewCallback = Callable[[int, float, np.ndarray], None]
+
+_CANCEL_POLL_SECONDS = 0.1
+_OUTPUT_COMPUTE = {
+    "points": compute_surface_points_from_xyz,
+    "mesh": compute_surface_mesh_from_xyz,
+}
+
+_worker_progress_queue = None
+_worker_cache: SurfaceCache | None = None
+
+
+def _init_surface_worker(progress_queue, cache_options: dict[str, Any] | None) -> None:
+    global _worker_progress_queue, _worker_cache
+    _worker_progress_queue = progress_queue
+    _worker_cache = SurfaceCache(**cache_options) if cache_options is not None else None
+
+
+def _reconstruct_surface_in_worker(
+    token: str,
+    points_name: str,
+    point_count: int,
+    cancel_name: str,
+    cache_keys: tuple[str | None, str | None],
+    output: SurfaceOutput,
+    options: dict[str, Any],
+) -> tuple[tuple[SharedArray, ...], SurfaceReconstructionStats]:
+    def status_cb(stage: str, message: str | None = None) -> None:
+        metrics = stats.stage_metrics_for(stage)
+        _worker_progress_queue.put((token, "status", (stage, message, metrics)))
+
+    def preview_cb(pass_index: int, voxel_size: float, points: np.ndarray) -> None:
+        # Preview passes are coarse, so their points are small enough to pickle.
+        _worker_progress_queue.put((token, "preview", (pass_index, voxel_size, points)))
+
+    stats = SurfaceReconstructionStats()
+    points_block = SharedMemory(name=points_name)
+    cancel_block = SharedMemory(name=cancel_name)
+    try:
+        points = np.ndarray((point_count, 3), dtype=np.float32, buffer=points_block.buf)
+        result_key, field_key = cache_keys
+        result = compute_surface_points_cached(
+            points,
+            cache=_worker_cache,
+            result_key=result_key,
+            field_key=field_key,
+            status_cb=status_cb,
+            preview_cb=preview_cb,
+            stats=stats,
+            cancel_token=CancellationToken(cancel_block.buf),
+            compute=_OUTPUT_COMPUTE[output],
+            **options,
+        )
+        del points
+    finally:
+        points_block.close()
+        cancel_block.close()
+        # Marks the end of this job's progress stream for the parent.
+        _worker_progress_queue.put((token, "finished", None))
+
+    if isinstance(result, SurfaceMesh):
+        arrays = (result.vertices, result.triangles)
+    else:
+        arrays = (np.asarray(result, dtype=np.float32),)
+    return tuple(_share_array(array) for array in arrays), stats
+
+
+SharedArray = tuple[str | None, tuple[int, ...], str]
+
+
+def _share_array(array: np.ndarray) -> SharedArray:
+    array = np.ascontiguousarray(array)
+    if array.size == 0:
+        return None, array.shape, array.dtype.str
+    block = SharedMemory(create=True, size=array.nbytes)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    block.close()
+    return block.name, array.shape, array.dtype.str
+
+
+def _take_shared_array(shared: SharedArray) -> np.ndarray:
+    name, shape, dtype = shared
+    if name is None:
+        return np.empty(shape, dtype=dtype)
+    block = SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+
+class SurfaceReconstructionWorker:
+    """Runs surface reconstruction in dedicated worker processes.
+
+    Points and results move through shared memory; progress and preview passes
+    come back over a queue and are forwarded to the caller's callbacks in
+    order, before `run` returns. A cancelled `cancel_token` is mirrored into a
+    shared flag that the worker checks between slabs and stages. Stage metrics
+    are appended to the caller's `stats` as their `_done` events arrive, so a
+    status callback can read them with `stage_metrics_for`. The pool is
+    spawned lazily on the first job. With `cache_options`, each worker process
+    keeps a `SurfaceCache` built from them. `output="mesh"` returns a
+    `SurfaceMesh` instead of points.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        *,
+        cache_options: dict[str, Any] | None = None,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.cache_options = cache_options
+        self._executor: ProcessPoolExecutor | None = None
+        self._progress_queue = None
+        self._listener: threading.Thread | None = None
+        self._callbacks: dict[
+            str,
+            tuple[
+                StatusCallback | None,
+                PreviewCallback | None,
+                SurfaceReconstructionStats | None,
+            ],
+        ] = {}
+        self._finished: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = get_context("spawn")
+                if self._progress_queue is None:
+                    self._progress_queue = context.Queue()
+                    self._listener = threading.Thread(
+                        target=self._dispatch_progress,
+                        args=(self._progress_queue,),
+                        name="surface-worker-progress",
+                        daemon=True,
+                    )
+                    self._listener.start()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_surface_worker,
+                    initargs=(self._progress_queue, self.cache_options),
+                )
+            return self._executor
+
+    def _dispatch_progress(self, progress_queue) -> None:
+        while True:
+            item = progress_queue.get()
+            if item is None:
+                return
+            token, kind, payload = item
+            if kind == "finished":
+                finished = self._finished.get(token)
+                if finished is not None:
+                    finished.set()
+                continue
+            status_cb, preview_cb, stats = self._callbacks.get(token, (None, None, None))
+            if kind == "status":
+                stage, message, metrics = payload
+                # Mirror the worker's stage metrics before the callback looks them up.
+                if metrics is not None and stats is not None:
+                    stats.stages.append(metrics)
+                if status_cb is not None:
+                    status_cb(stage, message)
+            elif kind == "preview" and preview_cb is not None:
+                preview_cb(*payload)
+
+    async def run(
+        self,
+        points: np.ndarray,
+        *,
+        status_cb: StatusCallback | None = None,
+        preview_cb: PreviewCallback | None = None,
+        cancel_token: CancellationToken | None = None,
+        stats: SurfaceReconstructionStats | None = None,
+        result_key: str | None = None,
+        field_key: str | None = None,
+        output: SurfaceOutput = "points",
+        **options: Any,
+    ) -> tuple[np.ndarray | SurfaceMesh, SurfaceReconstructionStats]:
+        executor = self._ensure_started()
+        pts = np.ascontiguousarray(points, dtype=np.float32)
+        token = uuid4().hex
+        finished = threading.Event()
+        self._finished[token] = finished
+        self._callbacks[token] = (status_cb, preview_cb, stats)
+
+        points_block = SharedMemory(create=True, size=max(1, pts.nbytes))
+        cancel_block = SharedMemory(create=True, size=1)
+        try:
+            np.ndarray(pts.shape, dtype=np.float32, buffer=points_block.buf)[:] = pts
+            cancel_block.buf[0] = 0
+            future = asyncio.wrap_future(
+                executor.submit(
+                    _reconstruct_surface_in_worker,
+                    token,
+                    points_block.name,
+                    int(pts.shape[0]),
+                    cancel_block.name,
+                    (result_key, field_key),
+                    output,
+                    options,
+                )
+            )
+            while cancel_token is not None and not future.done():
+                await asyncio.wait({future}, timeout=_CANCEL_POLL_SECONDS)
+                if cancel_token.cancelled:
+                    cancel_block.buf[0] = 1
+                    break
+            try:
+                shared, stats = await future
+            except BrokenProcessPool as exc:
+                self._discard_executor(executor)
+                raise RuntimeError("Surface worker process exited unexpectedly.") from exc
+            # Let the last progress updates reach the callback before the result.
+            await asyncio.to_thread(finished.wait, 5.0)
+        finally:
+            self._callbacks.pop(token, None)
+            self._finished.pop(token, None)
+            points_block.close()
+            points_block.unlink()
+            cancel_block.close()
+            cancel_block.unlink()
+
+        arrays = [_take_shared_array(item) for item in shared]
+        if output == "mesh":
+            return SurfaceMesh(*arrays), stats
+        return arrays[0], stats
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            progress_queue, self._progress_queue = self._progress_queue, None
+            listener, self._listener = self._listener, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if progress_queue is not None:
+            progress_queue.put(None)
+            if listener is not None:
+                listener.join(timeout=5.0)
+            progress_queue.close()
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import time
+
 from backend.opcua.discovery import ServerDiscoveryResult
 from backend.runtime.robot_session import RobotSession
 from backend.runtime.server_session import ServerSession
@@ -16,6 +18,7 @@ class RuntimeRegistry:
         self._discovery_cache_by_url: dict[str, ServerDiscoveryResult] = {}
         self._surface_jobs_by_id: dict[str, SurfaceJob] = {}
         self._next_surface_job_id = 1
+        self._next_stream_seq_id = 1
 
     def add_server(self, server: ServerSession) -> None:
         self._servers_by_url[server.server_url] = server
@@ -82,19 +85,38 @@ class RuntimeRegistry:
         self._next_surface_job_id += 1
         job = SurfaceJob(
             job_id=f"surface-job-{job_index}",
-            stream_seq_id=job_index,
+            stream_seq_id=self.allocate_stream_seq_id(),
             owner_id=owner_id,
             config=config,
         )
         self._surface_jobs_by_id[job.job_id] = job
         return job
 
+    def allocate_stream_seq_id(self) -> int:
+        stream_seq_id = self._next_stream_seq_id
+        self._next_stream_seq_id += 1
+        return stream_seq_id
+
     def get_surface_job(self, job_id: str) -> SurfaceJob | None:
         return self._surface_jobs_by_id.get(job_id)
 
     def remove_surface_job(self, job_id: str) -> SurfaceJob | None:
         return self._surface_jobs_by_id.pop(job_id, None)
 
+    def expire_detached_surface_jobs(
+        self, max_detached_seconds: float, now: float | None = None
+    ) -> list[SurfaceJob]:
+        """Drop uploads nobody resumed within `max_detached_seconds` of a disconnect."""
+        now = time.monotonic() if now is None else now
+        expired = [
+            job
+            for job in self._surface_jobs_by_id.values()
+            if job.detached_at is not None and now - job.detached_at >= max_detached_seconds
+        ]
+        for job in expired:
+            del self._surface_jobs_by_id[job.job_id]
+        return expired
+
     def clear(self) -> None:
         self._servers_by_url.clear()
         self._robots_by_id.clear()
@@ -1,36 +1,76 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
+import secrets
+import time
 from uuid import uuid4
 
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import ValidationError
 
+from backend.geometry.mesh_transport import (
+    MESH_KIND_TRIANGLES,
+    iter_encoded_mesh_chunks,
+    mesh_chunk_count,
+)
 from backend.geometry.pointcloud_transport import (
     PcdAssembly,
-    decode_pcd2_chunk,
-    iter_encoded_pcd2_chunks,
+    decode_pcd2_header,
+    iter_encoded_pcd_chunks,
+    pcd2_chunk_count,
+)
+from backend.geometry.surface_mesh import SurfaceMesh, ensure_mesh_support
+from backend.geometry.surface_reconstruction import (
+    SurfaceReconstructionCancelled,
+    SurfaceReconstructionStats,
+    SurfaceStageMetrics,
+    compute_surface_mesh_from_xyz,
+    compute_surface_points_from_xyz,
 )
-from backend.geometry.surface_reconstruction import compute_surface_points_from_xyz
 from backend.models.surface import (
     AbortSurfaceJobCommand,
     BeginSurfaceUploadCommand,
     FinishSurfaceUploadCommand,
+    ResumeSurfaceUploadCommand,
     SurfaceClientMessage,
     SurfaceJobAbortedEvent,
     SurfaceJobErrorEvent,
     SurfaceJobReadyEvent,
+    SurfacePreviewReadyEvent,
     SurfaceProcessingProgressEvent,
     SurfaceResultStreamCompletedEvent,
+    SurfaceStageReport,
     SurfaceUploadCompletedEvent,
     SurfaceUploadProgressEvent,
+    SurfaceUploadResumedEvent,
     SurfaceUploadStartedEvent,
     parse_surface_client_message_json,
 )
+from backend.runtime.surface_cache import (
+    SurfaceCache,
+    compute_surface_points_cached,
+    surface_field_cache_key,
+    surface_result_cache_key,
+)
 from backend.runtime.surface_job import SurfaceJob
+from backend.runtime.surface_progress import SurfaceProgressChannel
+from backend.runtime.surface_result_stream import ChunkSendTiming, ResultChunkSizer
+from backend.runtime.surface_scheduler import SurfaceJobScheduler, estimate_surface_grid_voxels
+from backend.runtime.surface_worker import SurfaceReconstructionWorker
 from backend.services.runtime_registry import RuntimeRegistry
 
 
+logger = logging.getLogger(__name__)
+
+# Default cap on processing progress events per second and job.
+_PROGRESS_MAX_RATE = 10.0
+# What this server can encode results as, for negotiation with the client.
+_RESULT_FORMATS = ("pcd2", "pcd3")
+_RESULT_CODECS = ("zlib", "lzma")
+
+
 def get_registry(websocket: WebSocket) -> RuntimeRegistry:
     registry = getattr(websocket.app.state, "registry", None)
     if not isinstance(registry, RuntimeRegistry):
@@ -39,9 +79,38 @@ def get_registry(websocket: WebSocket) -> RuntimeRegistry:
     return registry
 
 
+def get_surface_scheduler(websocket: WebSocket) -> SurfaceJobScheduler:
+    scheduler = getattr(websocket.app.state, "surface_scheduler", None)
+    if not isinstance(scheduler, SurfaceJobScheduler):
+        scheduler = SurfaceJobScheduler()
+        websocket.app.state.surface_scheduler = scheduler
+    return scheduler
+
+
+def get_result_chunk_sizer(websocket: WebSocket) -> ResultChunkSizer:
+    sizer = getattr(websocket.state, "surface_chunk_sizer", None)
+    if not isinstance(sizer, ResultChunkSizer):
+        sizer = ResultChunkSizer()
+        websocket.state.surface_chunk_sizer = sizer
+    return sizer
+
+
+def _result_chunk_points(websocket: WebSocket, job: SurfaceJob, point_count: int) -> int:
+    return get_result_chunk_sizer(websocket).chunk_points(
+        point_count, job.config.result_chunk_points
+    )
+
+
+def _next_timed(chunks):
+    start = time.perf_counter()
+    item = next(chunks, None)
+    return item, time.perf_counter() - start
+
+
 async def send_event(websocket: WebSocket, event) -> None:
     await websocket.send_text(event.model_dump_json(by_alias=True))
 
+
 async def _emit_surface_error(
     websocket: WebSocket,
     *,
@@ -62,21 +131,251 @@ async def _emit_surface_error(
     )
 
 
-async def _emit_aborted_if_needed(websocket: WebSocket, job: SurfaceJob, request_id: str | None = None) -> None:
+async def _emit_aborted_if_needed(
+    websocket: WebSocket,
+    job: SurfaceJob,
+    request_id: str | None = None,
+    *,
+    cancelled: SurfaceReconstructionCancelled | None = None,
+    elapsed_seconds: float | None = None,
+) -> None:
     if job.abort_notified:
         return
     job.abort_notified = True
     job.status = "aborted"
+    fraction_done = None
+    saved_seconds = None
+    if cancelled is not None:
+        fraction_done = cancelled.fraction_done
+        if elapsed_seconds is not None and fraction_done > 0:
+            # Assumes the rest of the job would have run at the rate seen so far.
+            saved_seconds = elapsed_seconds * (1.0 - fraction_done) / fraction_done
+    elif elapsed_seconds is not None:
+        saved_seconds = 0.0
     await send_event(
         websocket,
         SurfaceJobAbortedEvent(
             type="surfaceJobAborted",
             request_id=request_id,
             job_id=job.job_id,
+            cancelled_stage=cancelled.stage if cancelled is not None else None,
+            fraction_done=fraction_done,
+            elapsed_seconds=elapsed_seconds,
+            estimated_saved_seconds=saved_seconds,
         ),
     )
 
 
+async def _stream_result_points(
+    websocket: WebSocket,
+    job: SurfaceJob,
+    points,
+    *,
+    seq_id: int,
+    chunk_points: int,
+    send_lock: asyncio.Lock,
+    normals=None,
+) -> int:
+    """Encode and send one chunk at a time, releasing `send_lock` in between.
+
+    Every send is timed into `job.result_send_timings` and the connection's
+    chunk sizer. With `normals`, each chunk's NRM1 frame goes out right after
+    it. Stops early once the job is aborted; returns the number of chunks sent.
+    """
+    chunks = iter_encoded_pcd_chunks(
+        points,
+        result_format=job.result_format,
+        chunk_points=chunk_points,
+        seq_id=seq_id,
+        codec=job.result_codec,
+        max_error=job.config.result_precision,
+        normals=normals,
+    )
+    return await _send_result_chunks(websocket, job, chunks, seq_id=seq_id, send_lock=send_lock)
+
+
+def _mesh_chunk_sizes(
+    websocket: WebSocket, job: SurfaceJob, mesh: SurfaceMesh
+) -> tuple[int, int]:
+    # A triangle (3 x uint32) is twice the size of a quantized vertex (3 x uint16).
+    vertex_chunk = _result_chunk_points(websocket, job, mesh.vertex_count)
+    triangle_chunk = max(1, _result_chunk_points(websocket, job, 2 * mesh.triangle_count) // 2)
+    return vertex_chunk, triangle_chunk
+
+
+async def _stream_result_mesh(
+    websocket: WebSocket,
+    job: SurfaceJob,
+    mesh: SurfaceMesh,
+    *,
+    seq_id: int,
+    chunk_sizes: tuple[int, int],
+    send_lock: asyncio.Lock,
+) -> int:
+    """Send `mesh` as MSH1 chunks, vertices first; timed like point chunks."""
+    vertex_chunk, triangle_chunk = chunk_sizes
+
+    def chunks():
+        for payload, chunk in iter_encoded_mesh_chunks(
+            mesh, vertex_chunk=vertex_chunk, triangle_chunk=triangle_chunk, seq_id=seq_id
+        ):
+            # The sizer's rate is in points; a triangle is as many bytes as two.
+            weight = 2 if chunk["kind"] == MESH_KIND_TRIANGLES else 1
+            yield payload, {**chunk, "point_count": chunk["item_count"] * weight}
+
+    return await _send_result_chunks(websocket, job, chunks(), seq_id=seq_id, send_lock=send_lock)
+
+
+async def _send_result_chunks(
+    websocket: WebSocket,
+    job: SurfaceJob,
+    chunks,
+    *,
+    seq_id: int,
+    send_lock: asyncio.Lock,
+) -> int:
+    sizer = get_result_chunk_sizer(websocket)
+    sent = 0
+    while not job.abort_requested:
+        item, encode_seconds = await asyncio.to_thread(_next_timed, chunks)
+        if item is None:
+            break
+        payload, chunk = item
+        frames = [payload, *chunk.get("attribute_frames", ())]
+        async with send_lock:
+            start = time.perf_counter()
+            # Waits for the socket to drain, so a slow client throttles encoding.
+            for frame in frames:
+                await websocket.send_bytes(frame)
+            send_seconds = time.perf_counter() - start
+        timing = ChunkSendTiming(
+            stream_seq_id=seq_id,
+            chunk_index=int(chunk["chunk_index"]),
+            point_count=int(chunk["point_count"]),
+            byte_count=sum(len(frame) for frame in frames),
+            encode_seconds=encode_seconds,
+            send_seconds=send_seconds,
+        )
+        job.result_send_timings.append(timing)
+        sizer.record(timing)
+        sent += 1
+    return sent
+
+
+def _stage_report(metrics: SurfaceStageMetrics) -> SurfaceStageReport:
+    return SurfaceStageReport(
+        stage=metrics.stage,
+        wall_seconds=metrics.wall_seconds,
+        cpu_seconds=metrics.cpu_seconds,
+        grid_dims=metrics.grid_dims,
+        active_voxels=metrics.active_voxels,
+        kd_queries=metrics.kd_queries,
+        peak_rss_delta_bytes=metrics.peak_rss_delta_bytes,
+    )
+
+
+def _log_surface_job_summary(
+    job: SurfaceJob, stats: SurfaceReconstructionStats, elapsed_seconds: float
+) -> None:
+    stages = [_stage_report(metrics).model_dump() for metrics in stats.stages]
+    logger.info(
+        "surface job %s: %d -> %d points in %.2fs; %s",
+        job.job_id,
+        job.original_point_count,
+        job.result_point_count,
+        elapsed_seconds,
+        ", ".join(
+            f"{stage['stage']}={stage['wall_seconds']:.3f}s/cpu={stage['cpu_seconds']:.3f}s"
+            for stage in stages
+        ),
+        extra={
+            "surface_job": {
+                "job_id": job.job_id,
+                "original_point_count": job.original_point_count,
+                "result_point_count": job.result_point_count,
+                "elapsed_seconds": elapsed_seconds,
+                "peak_working_set_bytes": stats.peak_working_set_bytes,
+                "stages": stages,
+            }
+        },
+    )
+
+
+def _parallel_workers(config_workers: int | None) -> int | None:
+    # Tile workers are processes; more than the host has CPUs only adds overhead.
+    if config_workers is None:
+        return None
+    return min(config_workers, os.cpu_count() or 1)
+
+
+async def _run_surface_reconstruction(
+    websocket: WebSocket,
+    job: SurfaceJob,
+    status_cb,
+    preview_cb=None,
+    stats: SurfaceReconstructionStats | None = None,
+):
+    if stats is None:
+        stats = SurfaceReconstructionStats()
+    memory_budget_bytes = None
+    if job.config.memory_budget_mb is not None:
+        memory_budget_bytes = int(job.config.memory_budget_mb * 1024 * 1024)
+    options = {
+        "voxel_size": job.config.voxel_size,
+        "sigma": job.config.sigma,
+        "iso_level": job.config.iso_level,
+        "padding": job.config.padding,
+        "closing_radius": job.config.closing_radius,
+        "min_points": job.config.min_points,
+        "field_engine": job.config.field_engine,
+        "field_band_sigmas": job.config.field_band_sigmas,
+        "memory_budget_bytes": memory_budget_bytes,
+        "parallel_workers": _parallel_workers(job.config.parallel_workers),
+        "map_mode": job.config.map_mode,
+        "map_radius": job.config.map_radius,
+        "preview_voxel_factors": tuple(job.config.preview_voxel_factors),
+        "downsample_voxel_size": job.config.downsample_voxel_size,
+        "downsample_mode": job.config.downsample_mode,
+        "outlier_neighbors": job.config.outlier_neighbors,
+        "outlier_std_ratio": job.config.outlier_std_ratio,
+        "normal_neighbors": job.config.normal_neighbors,
+    }
+    compute = compute_surface_points_from_xyz
+    if job.config.output == "mesh":
+        compute = compute_surface_mesh_from_xyz
+        del options["map_mode"], options["map_radius"], options["normal_neighbors"]
+        options["mesh_step"] = job.config.mesh_step
+    if job.points_digest is not None:
+        options["result_key"] = surface_result_cache_key(job.points_digest, job.config)
+        options["field_key"] = surface_field_cache_key(job.points_digest, job.config)
+
+    worker = getattr(websocket.app.state, "surface_worker", None)
+    if isinstance(worker, SurfaceReconstructionWorker):
+        return await worker.run(
+            job.raw_points,
+            status_cb=status_cb,
+            preview_cb=preview_cb,
+            cancel_token=job.cancel_token,
+            stats=stats,
+            output=job.config.output,
+            **options,
+        )
+
+    cache = getattr(websocket.app.state, "surface_cache", None)
+    result = await asyncio.to_thread(
+        compute_surface_points_cached,
+        job.raw_points,
+        cache=cache if isinstance(cache, SurfaceCache) else None,
+        status_cb=status_cb,
+        preview_cb=preview_cb,
+        cancel_token=job.cancel_token,
+        stats=stats,
+        compute=compute,
+        **options,
+    )
+    return result, stats
+
+
 async def _process_surface_job(
     websocket: WebSocket,
     registry: RuntimeRegistry,
@@ -85,7 +384,14 @@ async def _process_surface_job(
     send_lock: asyncio.Lock,
 ) -> None:
     try:
-        async def emit_progress(stage: str, message: str | None = None) -> None:
+        async def emit_progress(
+            stage: str,
+            message: str | None = None,
+            *,
+            queue_position: int | None = None,
+            eta_seconds: float | None = None,
+            metrics: SurfaceStageMetrics | None = None,
+        ) -> None:
             async with send_lock:
                 await send_event(
                     websocket,
@@ -94,46 +400,163 @@ async def _process_surface_job(
                         job_id=job.job_id,
                         stage=stage,
                         message=message,
+                        queue_position=queue_position,
+                        eta_seconds=eta_seconds,
+                        metrics=_stage_report(metrics) if metrics is not None else None,
                     ),
                 )
 
+        async def emit_preview(pass_index: int, voxel_size: float, points) -> None:
+            if job.abort_requested:
+                return
+            stream_seq_id = registry.allocate_stream_seq_id()
+            point_count = int(points.shape[0])
+            chunk_points = _result_chunk_points(websocket, job, point_count)
+            async with send_lock:
+                await send_event(
+                    websocket,
+                    SurfacePreviewReadyEvent(
+                        type="surfacePreviewReady",
+                        job_id=job.job_id,
+                        pass_index=pass_index,
+                        pass_count=pass_count,
+                        voxel_size=voxel_size,
+                        point_count=point_count,
+                        result_format=job.result_format,
+                        stream_seq_id=stream_seq_id,
+                    ),
+                )
+            chunk_count = await _stream_result_points(
+                websocket,
+                job,
+                points,
+                seq_id=stream_seq_id,
+                chunk_points=chunk_points,
+                send_lock=send_lock,
+            )
+            if job.abort_requested:
+                return
+            async with send_lock:
+                await send_event(
+                    websocket,
+                    SurfaceResultStreamCompletedEvent(
+                        type="surfaceResultStreamCompleted",
+                        job_id=job.job_id,
+                        point_count=point_count,
+                        chunk_count=chunk_count,
+                        stream_seq_id=stream_seq_id,
+                    ),
+                )
+
+        stats = SurfaceReconstructionStats()
+
         def status_cb(stage: str, message: str | None = None) -> None:
-            asyncio.run_coroutine_threadsafe(emit_progress(stage, message), loop)
+            progress.post(stage, message, stats.stage_metrics_for(stage))
 
-        loop = asyncio.get_running_loop()
-        await emit_progress("processing_start")
+        previews = []
+        pass_count = len({f for f in job.config.preview_voxel_factors if f > 1.0})
 
-        result = await asyncio.to_thread(
-            compute_surface_points_from_xyz,
-            job.raw_points,
-            voxel_size=job.config.voxel_size,
-            sigma=job.config.sigma,
-            iso_level=job.config.iso_level,
-            padding=job.config.padding,
-            closing_radius=job.config.closing_radius,
-            min_points=job.config.min_points,
-            map_mode=job.config.map_mode,
-            map_radius=job.config.map_radius,
-            status_cb=status_cb,
+        def preview_cb(pass_index: int, voxel_size: float, points) -> None:
+            previews.append(
+                asyncio.run_coroutine_threadsafe(
+                    emit_preview(pass_index, voxel_size, points), loop
+                )
+            )
+
+        queue_updates: asyncio.Queue[tuple[int, float] | None] = asyncio.Queue()
+
+        async def send_queue_updates() -> None:
+            # One sender keeps queue positions in order and ahead of processing_start.
+            while (update := await queue_updates.get()) is not None:
+                position, eta_seconds = update
+                await emit_progress(
+                    "queued",
+                    f"position={position}",
+                    queue_position=position,
+                    eta_seconds=eta_seconds,
+                )
+
+        def queue_cb(position: int, eta_seconds: float) -> None:
+            queue_updates.put_nowait((position, eta_seconds))
+
+        loop = asyncio.get_running_loop()
+        progress = SurfaceProgressChannel(
+            emit_progress,
+            loop=loop,
+            max_rate=job.config.progress_max_rate or _PROGRESS_MAX_RATE,
         )
+        scheduler = get_surface_scheduler(websocket)
+        queue_sender = asyncio.create_task(send_queue_updates())
+        started = None
+        try:
+            async with scheduler.slot(
+                job.job_id,
+                owner_id=job.owner_id,
+                estimated_voxels=estimate_surface_grid_voxels(job.raw_points, job.config),
+                on_update=queue_cb,
+            ):
+                queue_updates.put_nowait(None)
+                await queue_sender
+                job.status = "processing"
+                await emit_progress("processing_start")
+                started = time.perf_counter()
+                progress.start()
+                try:
+                    result, stats = await _run_surface_reconstruction(
+                        websocket, job, status_cb, preview_cb, stats
+                    )
+                finally:
+                    await progress.aclose()
+        except SurfaceReconstructionCancelled as exc:
+            async with send_lock:
+                await _emit_aborted_if_needed(
+                    websocket,
+                    job,
+                    job.abort_request_id,
+                    cancelled=exc,
+                    elapsed_seconds=time.perf_counter() - started if started else 0.0,
+                )
+            registry.remove_surface_job(job.job_id)
+            return
+        finally:
+            queue_sender.cancel()
+        # Previews go out before the final result so clients can replace them in order.
+        await asyncio.gather(*(asyncio.wrap_future(preview) for preview in previews))
 
         if job.abort_requested:
             async with send_lock:
-                await _emit_aborted_if_needed(websocket, job)
+                await _emit_aborted_if_needed(
+                    websocket,
+                    job,
+                    job.abort_request_id,
+                    elapsed_seconds=time.perf_counter() - started,
+                )
             registry.remove_surface_job(job.job_id)
             return
 
         job.surface_points = result
         job.status = "completed"
-        job.result_point_count = int(result.shape[0])
-
-        chunks = list(
-            iter_encoded_pcd2_chunks(
-                result,
-                chunk_points=200000,
-                seq_id=job.stream_seq_id,
+        job.peak_working_set_bytes = stats.peak_working_set_bytes
+        triangle_count = None
+        normals = None
+        if not isinstance(result, SurfaceMesh) and result.shape[1] == 6:
+            # Normal estimation appends each point's normal to its row.
+            result, normals = result[:, :3], result[:, 3:]
+        if isinstance(result, SurfaceMesh):
+            job.result_point_count = result.vertex_count
+            triangle_count = result.triangle_count
+            mesh_chunk_sizes = _mesh_chunk_sizes(websocket, job, result)
+            result_chunk_count = mesh_chunk_count(
+                result.vertex_count,
+                result.triangle_count,
+                vertex_chunk=mesh_chunk_sizes[0],
+                triangle_chunk=mesh_chunk_sizes[1],
             )
-        )
+        else:
+            job.result_point_count = int(result.shape[0])
+            chunk_points = _result_chunk_points(websocket, job, job.result_point_count)
+            result_chunk_count = pcd2_chunk_count(job.result_point_count, chunk_points)
+        _log_surface_job_summary(job, stats, time.perf_counter() - started)
 
         async with send_lock:
             await send_event(
@@ -144,21 +567,48 @@ async def _process_surface_job(
                     job_id=job.job_id,
                     original_point_count=job.original_point_count,
                     result_point_count=job.result_point_count,
+                    result_format=job.result_format,
                     stream_seq_id=job.stream_seq_id,
+                    chunk_count=result_chunk_count,
+                    peak_working_set_bytes=job.peak_working_set_bytes,
+                    reduction_ratio=stats.reduction_ratio,
+                    stage_metrics=[_stage_report(metrics) for metrics in stats.stages],
+                    output=job.config.output,
+                    triangle_count=triangle_count,
+                    normal_format="oct16" if normals is not None else None,
                 ),
             )
-            for encoded_chunk, _chunk in chunks:
-                await websocket.send_bytes(encoded_chunk)
-            await send_event(
+        if isinstance(result, SurfaceMesh):
+            chunk_count = await _stream_result_mesh(
                 websocket,
-                SurfaceResultStreamCompletedEvent(
-                    type="surfaceResultStreamCompleted",
-                    job_id=job.job_id,
-                    point_count=job.result_point_count,
-                    chunk_count=len(chunks),
-                    stream_seq_id=job.stream_seq_id,
-                ),
+                job,
+                result,
+                seq_id=job.stream_seq_id,
+                chunk_sizes=mesh_chunk_sizes,
+                send_lock=send_lock,
+            )
+        else:
+            chunk_count = await _stream_result_points(
+                websocket,
+                job,
+                result,
+                seq_id=job.stream_seq_id,
+                chunk_points=chunk_points,
+                send_lock=send_lock,
+                normals=normals,
             )
+        if not job.abort_requested:
+            async with send_lock:
+                await send_event(
+                    websocket,
+                    SurfaceResultStreamCompletedEvent(
+                        type="surfaceResultStreamCompleted",
+                        job_id=job.job_id,
+                        point_count=job.result_point_count,
+                        chunk_count=chunk_count,
+                        stream_seq_id=job.stream_seq_id,
+                    ),
+                )
         registry.remove_surface_job(job.job_id)
     except Exception as exc:
         job.status = "error"
@@ -175,12 +625,47 @@ async def _process_surface_job(
         job.processing_task = None
 
 
+def _owns_surface_job(websocket: WebSocket, job: SurfaceJob) -> bool:
+    return job.owner_id == getattr(websocket.state, "surface_owner_id", None)
+
+
+def _active_surface_job_id(websocket: WebSocket, registry: RuntimeRegistry) -> str | None:
+    """The connection's upload, dropped once another connection resumed it."""
+    active_job_id = getattr(websocket.state, "active_surface_job_id", None)
+    if active_job_id is None:
+        return None
+    job = registry.get_surface_job(active_job_id)
+    if job is not None and not _owns_surface_job(websocket, job):
+        websocket.state.active_surface_job_id = None
+        return None
+    return active_job_id
+
+
+async def _emit_not_owned(
+    websocket: WebSocket, *, request_id: str | None = None, job_id: str
+) -> None:
+    await _emit_surface_error(
+        websocket,
+        request_id=request_id,
+        job_id=job_id,
+        message="Surface job belongs to another connection.",
+        code="surfaceJobNotOwned",
+    )
+
+
+def _negotiate(offered: list[str], supported: tuple[str, ...]) -> str | None:
+    # An empty offer leaves the choice to the server: its first option.
+    if not offered:
+        return supported[0]
+    return next((option for option in offered if option in supported), None)
+
+
 async def _handle_begin_upload(
     websocket: WebSocket,
     registry: RuntimeRegistry,
     message: BeginSurfaceUploadCommand,
 ) -> None:
-    active_job_id = getattr(websocket.state, "active_surface_job_id", None)
+    active_job_id = _active_surface_job_id(websocket, registry)
     if active_job_id:
         await _emit_surface_error(
             websocket,
@@ -190,11 +675,40 @@ async def _handle_begin_upload(
             code="surfaceUploadAlreadyActive",
         )
         return
+    if message.config.output == "mesh":
+        # Refuse before the upload rather than after it, in the worker.
+        try:
+            ensure_mesh_support()
+        except RuntimeError as exc:
+            await _emit_surface_error(
+                websocket,
+                request_id=message.request_id,
+                message=str(exc),
+                code="surfaceMeshUnavailable",
+            )
+            return
+
+    result_format = _negotiate(message.result_formats, _RESULT_FORMATS)
+    result_codec = _negotiate(message.result_codecs, _RESULT_CODECS)
+    for choice, offered, supported in (
+        (result_format, message.result_formats, _RESULT_FORMATS),
+        (result_codec, message.result_codecs, _RESULT_CODECS),
+    ):
+        if choice is None:
+            await _emit_surface_error(
+                websocket,
+                request_id=message.request_id,
+                message=f"None of {offered} is supported; this server offers {list(supported)}.",
+                code="surfaceResultFormatUnsupported",
+            )
+            return
 
     job = registry.create_surface_job(
         owner_id=getattr(websocket.state, "surface_owner_id", None),
         config=message.config,
     )
+    job.result_format = result_format
+    job.result_codec = result_codec
     websocket.state.active_surface_job_id = job.job_id
     await send_event(
         websocket,
@@ -203,6 +717,9 @@ async def _handle_begin_upload(
             request_id=message.request_id,
             job_id=job.job_id,
             config=job.config,
+            result_format=job.result_format,
+            result_codec=job.result_codec,
+            resume_token=job.resume_token,
         ),
     )
 
@@ -223,6 +740,9 @@ async def _handle_finish_upload(
             code="surfaceJobNotFound",
         )
         return
+    if not _owns_surface_job(websocket, job):
+        await _emit_not_owned(websocket, request_id=message.request_id, job_id=message.job_id)
+        return
     if job.raw_points is None:
         await _emit_surface_error(
             websocket,
@@ -242,13 +762,78 @@ async def _handle_finish_upload(
         )
         return
 
-    job.status = "processing"
+    job.status = "queued"
     websocket.state.active_surface_job_id = None
     job.processing_task = asyncio.create_task(
         _process_surface_job(websocket, registry, job, message.request_id, send_lock)
     )
 
 
+async def _handle_resume_upload(
+    websocket: WebSocket,
+    registry: RuntimeRegistry,
+    message: ResumeSurfaceUploadCommand,
+) -> None:
+    job = registry.get_surface_job(message.job_id)
+    if job is None:
+        await _emit_surface_error(
+            websocket,
+            request_id=message.request_id,
+            job_id=message.job_id,
+            message=f'Unknown surface job "{message.job_id}".',
+            code="surfaceJobNotFound",
+        )
+        return
+    if not secrets.compare_digest(message.resume_token, job.resume_token):
+        await _emit_surface_error(
+            websocket,
+            request_id=message.request_id,
+            job_id=message.job_id,
+            message="Resume token does not match the surface job.",
+            code="surfaceResumeDenied",
+        )
+        return
+    if job.status not in ("uploading", "uploaded"):
+        await _emit_surface_error(
+            websocket,
+            request_id=message.request_id,
+            job_id=message.job_id,
+            message=f"Surface job is {job.status}; its upload cannot be resumed.",
+            code="surfaceUploadNotResumable",
+        )
+        return
+    active_job_id = _active_surface_job_id(websocket, registry)
+    if active_job_id and active_job_id != job.job_id:
+        await _emit_surface_error(
+            websocket,
+            request_id=message.request_id,
+            job_id=active_job_id,
+            message="Finish or abort the current surface upload before resuming another one.",
+            code="surfaceUploadAlreadyActive",
+        )
+        return
+
+    # The job now belongs to this connection, e.g. after a reconnect; the
+    # previous connection loses it the next time it touches the job.
+    job.owner_id = getattr(websocket.state, "surface_owner_id", None)
+    job.detached_at = None
+    assembly = job.assembly
+    if job.status == "uploading":
+        websocket.state.active_surface_job_id = job.job_id
+    await send_event(
+        websocket,
+        SurfaceUploadResumedEvent(
+            type="surfaceUploadResumed",
+            request_id=message.request_id,
+            job_id=job.job_id,
+            chunk_count=assembly.chunk_count if assembly is not None else None,
+            chunks_received=assembly.received_chunks if assembly is not None else 0,
+            missing_chunk_indices=assembly.missing_chunks() if assembly is not None else [],
+            upload_complete=job.status == "uploaded",
+        ),
+    )
+
+
 async def _handle_abort_surface_job(
     websocket: WebSocket,
     registry: RuntimeRegistry,
@@ -264,9 +849,21 @@ async def _handle_abort_surface_job(
             code="surfaceJobNotFound",
         )
         return
+    if not _owns_surface_job(websocket, job):
+        await _emit_not_owned(websocket, request_id=message.request_id, job_id=message.job_id)
+        return
 
     job.abort_requested = True
+    job.abort_request_id = message.request_id
     websocket.state.active_surface_job_id = None
+    job.cancel_token.cancel()
+    if job.status in ("queued", "processing") and job.processing_task is not None:
+        # The processing task reports the abort, with the compute it saved, once
+        # the reconstruction has stopped at its next checkpoint.
+        get_surface_scheduler(websocket).withdraw(
+            job.job_id, SurfaceReconstructionCancelled("queued", 0.0)
+        )
+        return
     await _emit_aborted_if_needed(websocket, job, message.request_id)
     if job.processing_task is None:
         registry.remove_surface_job(job.job_id)
@@ -287,12 +884,24 @@ async def _handle_surface_command(
     if isinstance(message, AbortSurfaceJobCommand):
         await _handle_abort_surface_job(websocket, registry, message)
         return
+    if isinstance(message, ResumeSurfaceUploadCommand):
+        await _handle_resume_upload(websocket, registry, message)
+        return
     await _emit_surface_error(
         websocket,
         message=f"Unsupported surface command {message.type!r}.",
         code="surfaceCommandUnsupported",
     )
 
+
+def _detach_surface_uploads(websocket: WebSocket, registry: RuntimeRegistry) -> None:
+    # Unfinished uploads stay resumable until the registry sweep expires them.
+    now = time.monotonic()
+    for job in registry.surface_jobs.values():
+        if _owns_surface_job(websocket, job) and job.status in ("uploading", "uploaded"):
+            job.detached_at = now
+
+
 async def websocket_surface_endpoint(websocket: WebSocket) -> None:
     await websocket.accept()
     registry = get_registry(websocket)
@@ -345,17 +954,18 @@ async def websocket_surface_endpoint(websocket: WebSocket) -> None:
                         )
                     websocket.state.active_surface_job_id = None
                     continue
+                if not _owns_surface_job(websocket, job):
+                    # Another connection resumed this upload; stop feeding it.
+                    websocket.state.active_surface_job_id = None
+                    async with send_lock:
+                        await _emit_not_owned(websocket, job_id=active_job_id)
+                    continue
 
                 try:
-                    chunk = decode_pcd2_chunk(payload)
+                    chunk = decode_pcd2_header(payload)
                     if job.assembly is None:
-                        job.assembly = PcdAssembly(
-                            total_points=chunk.total_points,
-                            chunk_count=chunk.chunk_count,
-                            minv=chunk.minv,
-                            scale=chunk.scale,
-                        )
-                    points = job.assembly.add_chunk(chunk)
+                        job.assembly = PcdAssembly.from_header(chunk)
+                    points = job.assembly.add_payload(payload, chunk)
                 except Exception as exc:
                     async with send_lock:
                         await _emit_surface_error(
@@ -366,6 +976,12 @@ async def websocket_surface_endpoint(websocket: WebSocket) -> None:
                         )
                     continue
 
+                points_digest = None
+                if points is not None:
+                    # Hash off the event loop and outside send_lock, so result
+                    # streams of other jobs keep flowing meanwhile.
+                    points_digest = await asyncio.to_thread(job.assembly.content_digest)
+
                 if job.assembly is None:
                     chunks_received = 0
                     chunk_count = chunk.chunk_count
@@ -386,6 +1002,7 @@ async def websocket_surface_endpoint(websocket: WebSocket) -> None:
                     )
 
                     if points is not None:
+                        job.points_digest = points_digest
                         job.raw_points = points
                         job.original_point_count = int(points.shape[0])
                         job.assembly = None
@@ -402,3 +1019,5 @@ async def websocket_surface_endpoint(websocket: WebSocket) -> None:
                 continue
     except WebSocketDisconnect:
         return
+    finally:
+        _detach_surface_uploads(websocket, registry)
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from backend.geometry.mesh_transport import (
+    MESH_HEADER_SIZE,
+    MESH_KIND_TRIANGLES,
+    MESH_KIND_VERTICES,
+    decode_mesh_header,
+    iter_encoded_mesh_chunks,
+    mesh_chunk_count,
+)
+from backend.geometry.surface_mesh import SurfaceMesh
+
+
+def make_mesh(vertex_count: int = 50, triangle_count: int = 70) -> SurfaceMesh:
+    rng = np.random.default_rng(9)
+    return SurfaceMesh(
+        vertices=rng.uniform(-1.0, 1.0, size=(vertex_count, 3)).astype(np.float32),
+        triangles=rng.integers(0, vertex_count, size=(triangle_count, 3)).astype(np.uint32),
+    )
+
+
+def test_mesh_chunks_round_trip_vertices_first() -> None:
+    mesh = make_mesh()
+    encoded = list(iter_encoded_mesh_chunks(mesh, vertex_chunk=16, triangle_chunk=32, seq_id=4))
+    headers = [decode_mesh_header(payload) for payload, _chunk in encoded]
+
+    assert len(encoded) == mesh_chunk_count(50, 70, vertex_chunk=16, triangle_chunk=32) == 7
+    assert [header.kind for header in headers] == [MESH_KIND_VERTICES] * 4 + [
+        MESH_KIND_TRIANGLES
+    ] * 3
+    assert [header.item_count for header in headers] == [16, 16, 16, 2, 32, 32, 6]
+    assert [header.start_index for header in headers] == [0, 16, 32, 48, 0, 32, 64]
+    assert {(header.total_vertices, header.total_triangles) for header in headers} == {(50, 70)}
+
+    quantized = np.concatenate(
+        [
+            np.frombuffer(payload, dtype=np.uint16, offset=MESH_HEADER_SIZE).reshape(-1, 3)
+            for payload, _chunk in encoded[:4]
+        ]
+    )
+    triangles = np.concatenate(
+        [
+            np.frombuffer(payload, dtype=np.uint32, offset=MESH_HEADER_SIZE).reshape(-1, 3)
+            for payload, _chunk in encoded[4:]
+        ]
+    )
+    vertices = quantized.astype(np.float32) * headers[0].scale + headers[0].minv
+    np.testing.assert_array_equal(triangles, mesh.triangles)
+    # 16-bit quantization over a 2 m extent.
+    np.testing.assert_allclose(vertices, mesh.vertices, atol=2.0 / 65535.0)
+
+
+def test_mesh_header_rejects_bad_payloads() -> None:
+    mesh = make_mesh(vertex_count=4, triangle_count=2)
+    payloads = [
+        payload
+        for payload, _chunk in iter_encoded_mesh_chunks(
+            mesh, vertex_chunk=4, triangle_chunk=2, seq_id=1
+        )
+    ]
+    unknown_kind = bytearray(payloads[1])
+    unknown_kind[MESH_HEADER_SIZE - 4] = 7
+
+    with pytest.raises(ValueError, match="wrong data length"):
+        decode_mesh_header(payloads[1][:-2])
+    with pytest.raises(ValueError, match="unknown chunk kind"):
+        decode_mesh_header(bytes(unknown_kind))
+    with pytest.raises(ValueError, match="invalid magic"):
+        decode_mesh_header(b"PCD2" + payloads[0][4:])
@@ -93,6 +93,35 @@ def test_surface_client_message_accepts_camel_case_json() -> None:
     assert msg.config.voxel_size == 0.02
 
 
+@pytest.mark.parametrize(
+    "config",
+    [
+        '{"parallelWorkers":0}',
+        '{"parallelWorkers":1000}',
+        '{"memoryBudgetMb":0.5}',
+        '{"normalNeighbors":2}',
+        '{"normalNeighbors":50000}',
+        '{"outlierNeighbors":0}',
+        '{"outlierNeighbors":50000}',
+        '{"resultChunkPoints":0}',
+        '{"resultChunkPoints":100000000}',
+        '{"progressMaxRate":0}',
+        '{"progressMaxRate":-1}',
+        '{"progressMaxRate":1000}',
+        '{"meshStep":0}',
+        '{"meshStep":1000}',
+        '{"previewVoxelFactors":[1.0]}',
+        '{"previewVoxelFactors":[0.5]}',
+        '{"previewVoxelFactors":[2,3,4,5,6]}',
+    ],
+)
+def test_surface_begin_rejects_out_of_range_config(config: str) -> None:
+    with pytest.raises(ValidationError):
+        parse_surface_client_message_json(
+            f'{{"type":"beginSurfaceUpload","requestId":"req-1","config":{config}}}',
+        )
+
+
 def test_surface_server_message_round_trips() -> None:
     event = SurfaceJobReadyEvent(
         type="surfaceJobReady",
@@ -0,0 +1,62 @@
+import numpy as np
+
+from backend.geometry.pointcloud_filters import (
+    estimate_normals,
+    statistical_outlier_mask,
+    voxel_downsample,
+)
+
+
+def make_clustered_points() -> np.ndarray:
+    rng = np.random.default_rng(7)
+    # Three points in each of 50 cells of a 0.1 m grid.
+    cells = rng.choice(1000, size=50, replace=False)
+    corners = np.stack(np.unravel_index(cells, (10, 10, 10)), axis=1) * 0.1
+    offsets = rng.uniform(0.01, 0.09, size=(50, 3, 3))
+    return (corners[:, None, :] + offsets).reshape(-1, 3).astype(np.float32)
+
+
+def test_voxel_downsample_keeps_the_point_nearest_each_cell_centroid() -> None:
+    points = make_clustered_points()
+
+    kept = voxel_downsample(points, 0.1)
+
+    assert kept.shape == (50, 3)
+    groups = points.reshape(50, 3, 3)
+    centroids = groups.mean(axis=1)
+    nearest = groups[np.arange(50), np.linalg.norm(groups - centroids[:, None], axis=2).argmin(1)]
+    assert {tuple(p) for p in kept} == {tuple(p) for p in nearest}
+
+
+def test_voxel_downsample_centroid_mode_averages_each_cell() -> None:
+    points = make_clustered_points()
+
+    centroids = voxel_downsample(points, 0.1, mode="centroid")
+
+    expected = points.reshape(50, 3, 3).mean(axis=1)
+    order = np.lexsort(centroids.T)
+    assert np.allclose(centroids[order], expected[np.lexsort(expected.T)], atol=1e-6)
+
+
+def test_outlier_mask_drops_isolated_points() -> None:
+    rng = np.random.default_rng(1)
+    dense = rng.uniform(0.0, 0.2, size=(2000, 3))
+    strays = np.array([[2.0, 2.0, 2.0], [-1.5, 0.0, 0.5]])
+    points = np.vstack([dense, strays]).astype(np.float32)
+
+    keep = statistical_outlier_mask(points, neighbors=6, std_ratio=3.0)
+
+    assert not keep[-2:].any()
+    assert keep[:-2].mean() > 0.99
+
+
+def test_estimate_normals_fits_the_local_plane() -> None:
+    rng = np.random.default_rng(2)
+    xy = rng.uniform(-1.0, 1.0, size=(2000, 2))
+    # A tilted plane through the origin with normal (1, 0, 1) / sqrt(2).
+    points = np.column_stack([xy, -xy[:, 0]]).astype(np.float32)
+
+    normals = estimate_normals(points[:100], points, neighbors=12)
+
+    expected = np.array([1.0, 0.0, 1.0]) / np.sqrt(2.0)
+    np.testing.assert_allclose(np.abs(normals @ expected), 1.0, atol=1e-4)
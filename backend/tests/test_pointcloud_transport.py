@@ -0,0 +1,231 @@
+import numpy as np
+import pytest
+from scipy.spatial import cKDTree
+
+from backend.geometry.pointcloud_transport import (
+    PCD3_HEADER_SIZE,
+    PcdAssembly,
+    decode_normal_chunk,
+    decode_pcd2_chunk,
+    decode_pcd2_header,
+    encode_pcd3_chunk,
+    iter_encoded_pcd2_chunks,
+    iter_encoded_pcd3_chunks,
+    iter_encoded_pcd_chunks,
+    morton_order,
+    octahedral_decode,
+    octahedral_encode,
+    quantize_points_to_pcd2_chunks,
+)
+
+
+def make_points(count: int = 1000) -> np.ndarray:
+    rng = np.random.default_rng(5)
+    return rng.uniform(-1.0, 1.0, size=(count, 3)).astype(np.float32)
+
+
+def test_payload_assembly_matches_decoded_chunk_assembly() -> None:
+    chunks = iter_encoded_pcd2_chunks(make_points(), chunk_points=300, seq_id=4)
+    payloads = [payload for payload, _ in chunks]
+
+    decoded = PcdAssembly.from_header(decode_pcd2_chunk(payloads[0]))
+    direct = PcdAssembly.from_header(decode_pcd2_header(payloads[0]))
+    expected = actual = None
+    for payload in reversed(payloads):
+        expected = decoded.add_chunk(decode_pcd2_chunk(payload))
+        actual = direct.add_payload(payload)
+
+    assert actual is not None
+    assert actual.dtype == np.float32
+    assert np.array_equal(actual, expected)
+    assert direct.content_digest() == decoded.content_digest()
+
+
+def test_payload_assembly_rejects_chunks_from_another_upload() -> None:
+    (first, _), = iter_encoded_pcd2_chunks(make_points(10), chunk_points=10, seq_id=1)
+    (other, _), = iter_encoded_pcd2_chunks(make_points(12), chunk_points=12, seq_id=1)
+    assembly = PcdAssembly.from_header(decode_pcd2_header(first))
+
+    with pytest.raises(ValueError, match="does not belong"):
+        assembly.add_payload(other)
+    with pytest.raises(ValueError, match="wrong data length"):
+        assembly.add_payload(first[:-2])
+    assert assembly.received_chunks == 0
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+@pytest.mark.parametrize("max_error", [None, 2e-3, 2e-2])
+def test_pcd3_chunks_round_trip_the_quantized_points(codec: str, max_error: float | None) -> None:
+    chunks = list(
+        quantize_points_to_pcd2_chunks(
+            make_points(),
+            chunk_points=300,
+            seq_id=2,
+            spatial_order=True,
+            chunk_bounds=max_error is not None,
+            max_error=max_error,
+        )
+    )
+
+    for chunk in chunks:
+        decoded = decode_pcd2_chunk(encode_pcd3_chunk(chunk, codec=codec))
+        assert decoded.start_index == chunk["start_index"]
+        assert np.array_equal(decoded.quantized_points, chunk["quantized_points"])
+    assert max(chunk["bits"] for chunk in chunks) == {None: 16, 2e-3: 10, 2e-2: 8}[max_error]
+
+
+def test_pcd3_chunk_bounds_pack_smaller_words_within_the_error_target() -> None:
+    directions = np.random.default_rng(1).normal(size=(20000, 3))
+    points = (directions / np.linalg.norm(directions, axis=1, keepdims=True)).astype(np.float32)
+    max_error = 1e-3
+
+    plain = [
+        payload for payload, _ in iter_encoded_pcd2_chunks(points, chunk_points=5000, seq_id=1)
+    ]
+    packed = [
+        payload
+        for payload, _ in iter_encoded_pcd3_chunks(
+            points, chunk_points=5000, seq_id=1, max_error=max_error
+        )
+    ]
+    assembly = PcdAssembly.from_header(decode_pcd2_header(packed[0]))
+    for payload in packed:
+        result = assembly.add_payload(payload)
+
+    assert {decode_pcd2_header(payload).bits for payload in packed} == {10}
+    assert sum(map(len, packed)) < 0.6 * sum(map(len, plain))
+    # Results come back Morton-sorted, so compare against the nearest input point.
+    distances, _ = cKDTree(points).query(result)
+    assert result.shape == points.shape
+    assert distances.max() <= np.sqrt(3) * max_error * 1.001
+
+
+def test_chunk_bounds_never_lose_precision_by_default() -> None:
+    points = make_points(4000)
+    (global_chunk,) = quantize_points_to_pcd2_chunks(points, chunk_points=4000, seq_id=1)
+    local_chunks = list(
+        quantize_points_to_pcd2_chunks(
+            points, chunk_points=500, seq_id=1, spatial_order=True, chunk_bounds=True
+        )
+    )
+
+    assert all(chunk["bits"] == 16 for chunk in local_chunks)
+    assert all(
+        np.all(chunk["scale"] <= global_chunk["scale"] * 1.0001) for chunk in local_chunks
+    )
+
+
+def test_morton_order_interleaves_axis_bits() -> None:
+    quantized = np.array([[1, 1, 1], [0, 0, 0], [0, 1, 0], [1, 0, 0], [0, 0, 1]], dtype=np.uint16)
+
+    assert morton_order(quantized).tolist() == [1, 3, 2, 4, 0]
+
+
+def test_pcd3_header_rejects_word_sizes_the_packer_does_not_produce() -> None:
+    (chunk,) = quantize_points_to_pcd2_chunks(make_points(10), chunk_points=10, seq_id=1)
+    payload = bytearray(encode_pcd3_chunk(chunk))
+    # The bits byte follows the codec byte, ahead of two bytes of padding.
+    payload[PCD3_HEADER_SIZE - 3] = 12
+
+    with pytest.raises(ValueError, match="unsupported word size 12"):
+        decode_pcd2_header(bytes(payload))
+
+
+def test_pcd3_rejects_payloads_that_inflate_past_their_point_count() -> None:
+    (chunk,) = quantize_points_to_pcd2_chunks(make_points(10), chunk_points=10, seq_id=1)
+    payload = encode_pcd3_chunk(chunk)
+    header = decode_pcd2_header(payload)
+    # Same compressed body, but the header claims only half the points.
+    lying = encode_pcd3_chunk(dict(chunk, point_count=5))[:PCD3_HEADER_SIZE]
+    assembly = PcdAssembly.from_header(header)
+
+    with pytest.raises(ValueError, match="PCD3 payload has wrong data length"):
+        assembly.add_payload(lying + payload[PCD3_HEADER_SIZE:])
+    with pytest.raises(ValueError, match="PCD3 payload could not be decompressed"):
+        assembly.add_payload(payload[:PCD3_HEADER_SIZE] + b"not zlib")
+    assert assembly.received_chunks == 0
+
+
+def test_assembly_tracks_chunks_out_of_order_and_rejects_duplicates() -> None:
+    chunks = iter_encoded_pcd2_chunks(make_points(), chunk_points=300, seq_id=1)
+    payloads = [payload for payload, _ in chunks]
+    assembly = PcdAssembly.from_header(decode_pcd2_header(payloads[2]))
+
+    assert assembly.add_payload(payloads[2]) is None
+    assert assembly.add_payload(payloads[0]) is None
+    with pytest.raises(ValueError, match="already received"):
+        assembly.add_payload(payloads[2])
+    assert assembly.missing_chunks() == [1, 3]
+    assert assembly.received_chunks == 2
+
+    assert assembly.add_payload(payloads[3]) is None
+    assert assembly.add_payload(payloads[1]) is not None
+    assert assembly.missing_chunks() == []
+
+
+def test_assembly_rejects_chunks_that_leave_gaps() -> None:
+    (chunk,) = quantize_points_to_pcd2_chunks(make_points(10), chunk_points=10, seq_id=1)
+    half = chunk["quantized_points"][:5]
+    first = dict(chunk, chunk_count=2, point_count=5, quantized_points=half)
+    # Claims to be the second half but overlaps the first one.
+    second = dict(first, chunk_index=1, start_index=0)
+    assembly = PcdAssembly.from_header(decode_pcd2_header(encode_pcd3_chunk(first)))
+
+    assembly.add_payload(encode_pcd3_chunk(first))
+    with pytest.raises(ValueError, match="without gaps"):
+        assembly.add_payload(encode_pcd3_chunk(second))
+
+
+def test_assembly_rejected_last_chunk_can_be_resent() -> None:
+    (chunk,) = quantize_points_to_pcd2_chunks(make_points(10), chunk_points=10, seq_id=1)
+    first = dict(
+        chunk, chunk_count=2, point_count=5, quantized_points=chunk["quantized_points"][:5]
+    )
+    second = dict(
+        first, chunk_index=1, start_index=5, quantized_points=chunk["quantized_points"][5:]
+    )
+    overlapping = dict(second, start_index=4)
+    assembly = PcdAssembly.from_header(decode_pcd2_header(encode_pcd3_chunk(first)))
+
+    assembly.add_payload(encode_pcd3_chunk(first))
+    with pytest.raises(ValueError, match="without gaps"):
+        assembly.add_payload(encode_pcd3_chunk(overlapping))
+    assert assembly.missing_chunks() == [1]
+    assert assembly.received_chunks == 1
+
+    points = assembly.add_payload(encode_pcd3_chunk(second))
+    assert points is not None
+    np.testing.assert_array_equal(
+        assembly.qbuf, np.asarray(chunk["quantized_points"], dtype=np.uint16)
+    )
+
+
+def test_octahedral_normals_round_trip_within_a_small_angle() -> None:
+    rng = np.random.default_rng(11)
+    normals = rng.normal(size=(5000, 3))
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    axes = np.vstack([np.eye(3), -np.eye(3)])
+
+    decoded = octahedral_decode(octahedral_encode(np.vstack([normals, axes])))
+
+    cosines = np.einsum("ij,ij->i", decoded, np.vstack([normals, axes]))
+    assert cosines.min() > np.cos(np.radians(0.05))
+
+
+@pytest.mark.parametrize("result_format", ["pcd2", "pcd3"])
+def test_normal_frames_follow_the_order_of_their_point_chunk(result_format: str) -> None:
+    points = make_points(500)
+    normals = points / np.linalg.norm(points, axis=1, keepdims=True)
+
+    for payload, chunk in iter_encoded_pcd_chunks(
+        points, result_format=result_format, chunk_points=128, seq_id=3, normals=normals
+    ):
+        header = decode_pcd2_header(payload)
+        (frame,) = chunk["attribute_frames"]
+        decoded = decode_normal_chunk(frame)
+        assert (decoded.seq_id, decoded.chunk_index) == (3, header.chunk_index)
+        assert decoded.point_count == header.point_count
+        quantized = decode_pcd2_chunk(payload).quantized_points
+        chunk_points = quantized.astype(np.float32) * header.scale + header.minv
+        expected = chunk_points / np.linalg.norm(chunk_points, axis=1, keepdims=True)
+        np.testing.assert_allclose(decoded.normals, expected, atol=1e-3)
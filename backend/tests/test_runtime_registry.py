@@ -62,3 +62,17 @@ def test_registry_tracks_surface_jobs() -> None:
 
     assert removed is first
     assert registry.get_surface_job(first.job_id) is None
+
+
+def test_registry_expires_surface_jobs_left_detached() -> None:
+    registry = RuntimeRegistry()
+    attached = registry.create_surface_job(owner_id="socket-1", config=SurfaceProcessingConfig())
+    recent = registry.create_surface_job(owner_id="socket-2", config=SurfaceProcessingConfig())
+    stale = registry.create_surface_job(owner_id="socket-3", config=SurfaceProcessingConfig())
+    recent.detached_at = 950.0
+    stale.detached_at = 100.0
+
+    expired = registry.expire_detached_surface_jobs(600.0, now=1000.0)
+
+    assert expired == [stale]
+    assert set(registry.surface_jobs) == {attached.job_id, recent.job_id}
@@ -0,0 +1,189 @@
+import numpy as np
+import pytest
+
+from backend.geometry.pointcloud_transport import (
+    PcdAssembly,
+    decode_pcd2_chunk,
+    encode_pcd2_chunk,
+    quantize_points_to_pcd2_chunks,
+)
+from backend.geometry.surface_reconstruction import (
+    compute_surface_mesh_from_xyz,
+    compute_surface_points_from_xyz,
+)
+from backend.models.surface import SurfaceProcessingConfig
+from backend.runtime.surface_cache import (
+    SurfaceCache,
+    compute_surface_points_cached,
+    surface_field_cache_key,
+    surface_result_cache_key,
+)
+
+
+def make_sphere_points(count: int = 3000, radius: float = 0.2) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    directions = rng.normal(size=(count, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    return (directions * radius).astype(np.float32)
+
+
+def assemble(points: np.ndarray, chunk_points: int) -> PcdAssembly:
+    assembly = None
+    for chunk in quantize_points_to_pcd2_chunks(points, chunk_points=chunk_points, seq_id=1):
+        decoded = decode_pcd2_chunk(encode_pcd2_chunk(chunk))
+        if assembly is None:
+            assembly = PcdAssembly(
+                total_points=decoded.total_points,
+                chunk_count=decoded.chunk_count,
+                minv=decoded.minv,
+                scale=decoded.scale,
+            )
+        assembly.add_chunk(decoded)
+    return assembly
+
+
+def test_points_digest_ignores_chunking() -> None:
+    points = make_sphere_points()
+
+    digest = assemble(points, 1000).content_digest()
+
+    assert digest == assemble(points, 700).content_digest()
+    assert digest != assemble(points[::-1].copy(), 1000).content_digest()
+
+
+def test_field_key_only_depends_on_field_options() -> None:
+    config = SurfaceProcessingConfig()
+    retuned = config.model_copy(update={"iso_level": 0.5, "closing_radius": 2})
+    rerun = config.model_copy(update={"parallel_workers": 4, "memory_budget_mb": 64})
+
+    assert surface_field_cache_key("abc", config) == surface_field_cache_key("abc", retuned)
+    assert surface_result_cache_key("abc", config) != surface_result_cache_key("abc", retuned)
+    assert surface_result_cache_key("abc", config) == surface_result_cache_key("abc", rerun)
+    assert surface_field_cache_key("abc", config) != surface_field_cache_key(
+        "abc", config.model_copy(update={"sigma": 0.03})
+    )
+    assert surface_field_cache_key("abc", config) != surface_field_cache_key("abd", config)
+
+
+def test_cache_evicts_least_recently_used_entries_under_budget() -> None:
+    cache = SurfaceCache(max_bytes=2000)
+    for key in ("a", "b"):
+        cache.put(key, {"data": np.zeros(100, dtype=np.float64)})
+    assert cache.get("a") is not None
+
+    cache.put("c", {"data": np.zeros(100, dtype=np.float64)})
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.nbytes == 1600
+    assert not cache.get("a")["data"].flags.writeable
+
+
+def test_cache_spills_evicted_entries_to_disk(tmp_path) -> None:
+    cache = SurfaceCache(max_bytes=1000, spill_dir=tmp_path, spill_max_bytes=2000)
+    first = np.arange(100, dtype=np.float64)
+    cache.put("first", {"data": first})
+    cache.put("second", {"data": np.ones(100, dtype=np.float64)})
+
+    assert "first" not in cache
+    assert (tmp_path / "first.npz").exists()
+    assert np.array_equal(cache.get("first")["data"], first)
+
+    # The spill directory is trimmed least recently used first.
+    for key in ("third", "fourth", "fifth"):
+        cache.put(key, {"data": np.zeros(100, dtype=np.float64)})
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.npz")) <= 2000
+
+
+def test_cached_reconstruction_reuses_field_when_only_iso_level_changes() -> None:
+    points = make_sphere_points()
+    config = SurfaceProcessingConfig(voxel_size=0.02, sigma=0.02)
+    retuned = config.model_copy(update={"iso_level": 0.4})
+    cache = SurfaceCache(max_bytes=64 * 1024 * 1024)
+
+    def run(cfg: SurfaceProcessingConfig) -> tuple[np.ndarray, list[str]]:
+        stages: list[str] = []
+        result = compute_surface_points_cached(
+            points,
+            cache=cache,
+            result_key=surface_result_cache_key("digest", cfg),
+            field_key=surface_field_cache_key("digest", cfg),
+            status_cb=lambda stage, message=None: stages.append(stage),
+            voxel_size=cfg.voxel_size,
+            sigma=cfg.sigma,
+            iso_level=cfg.iso_level,
+        )
+        return result, stages
+
+    first, first_stages = run(config)
+    again, again_stages = run(config)
+    retuned_result, retuned_stages = run(retuned)
+
+    assert "build_field_start" in first_stages
+    assert again_stages == ["result_cached"]
+    assert np.array_equal(again, first)
+    assert "build_field_cached" in retuned_stages
+    assert "build_field_start" not in retuned_stages
+    expected = compute_surface_points_from_xyz(points, voxel_size=0.02, sigma=0.02, iso_level=0.4)
+    assert np.array_equal(retuned_result, expected)
+
+
+def test_cached_field_is_not_reused_below_its_band_edge() -> None:
+    points = make_sphere_points()
+    # A 1.2 sigma band is enough for iso 0.5 but cuts the field off above iso 0.1.
+    config = SurfaceProcessingConfig(
+        voxel_size=0.02, sigma=0.02, iso_level=0.5, field_band_sigmas=1.2
+    )
+    lowered = config.model_copy(update={"iso_level": 0.1})
+    cache = SurfaceCache(max_bytes=64 * 1024 * 1024)
+
+    def run(cfg: SurfaceProcessingConfig) -> np.ndarray:
+        return compute_surface_points_cached(
+            points,
+            cache=cache,
+            result_key=surface_result_cache_key("digest", cfg),
+            field_key=surface_field_cache_key("digest", cfg),
+            voxel_size=cfg.voxel_size,
+            sigma=cfg.sigma,
+            iso_level=cfg.iso_level,
+            field_band_sigmas=cfg.field_band_sigmas,
+        )
+
+    assert len(run(config)) > 0
+    assert surface_field_cache_key("digest", lowered) == surface_field_cache_key("digest", config)
+    with pytest.raises(ValueError, match="cuts the field off before iso_level"):
+        run(lowered)
+
+
+def test_cached_mesh_shares_the_field_of_point_jobs() -> None:
+    pytest.importorskip("skimage")
+    points = make_sphere_points()
+    config = SurfaceProcessingConfig(voxel_size=0.02, sigma=0.02)
+    mesh_config = config.model_copy(update={"output": "mesh"})
+    cache = SurfaceCache(max_bytes=64 * 1024 * 1024)
+
+    def run(cfg: SurfaceProcessingConfig, compute):
+        stages: list[str] = []
+        result = compute_surface_points_cached(
+            points,
+            cache=cache,
+            result_key=surface_result_cache_key("digest", cfg),
+            field_key=surface_field_cache_key("digest", cfg),
+            status_cb=lambda stage, message=None: stages.append(stage),
+            compute=compute,
+            voxel_size=cfg.voxel_size,
+            sigma=cfg.sigma,
+        )
+        return result, stages
+
+    run(config, compute_surface_points_from_xyz)
+    mesh, mesh_stages = run(mesh_config, compute_surface_mesh_from_xyz)
+    again, again_stages = run(mesh_config, compute_surface_mesh_from_xyz)
+
+    assert "build_field_cached" in mesh_stages
+    assert again_stages == ["result_cached"]
+    assert np.array_equal(again.triangles, mesh.triangles)
+    assert np.array_equal(again.vertices, mesh.vertices)
+    assert surface_result_cache_key("digest", config) == surface_result_cache_key(
+        "digest", config.model_copy(update={"mesh_step": 3})
+    )
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.runtime.surface_progress import SurfaceProgressChannel
+
+
+def make_channel(emitted: list[tuple], **kwargs) -> SurfaceProgressChannel:
+    async def emit(stage, message=None, *, eta_seconds=None, metrics=None) -> None:
+        emitted.append((stage, message, eta_seconds, metrics))
+
+    return SurfaceProgressChannel(emit, loop=asyncio.get_running_loop(), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_progress_channel_keeps_latest_update_per_stage_in_post_order() -> None:
+    emitted: list[tuple] = []
+    channel = make_channel(emitted, max_rate=1.0)
+    channel.start()
+
+    def compute() -> None:
+        channel.post("build_field_start")
+        for plane in range(1, 101):
+            channel.post("field_progress", f"{plane}/100")
+        channel.post("build_field_done", None, "metrics")
+
+    thread = threading.Thread(target=compute)
+    thread.start()
+    thread.join()
+    await channel.aclose()
+
+    assert [(stage, message) for stage, message, _eta, _metrics in emitted] == [
+        ("build_field_start", None),
+        ("field_progress", "100/100"),
+        ("build_field_done", None),
+    ]
+    assert emitted[-1][3] == "metrics"
+
+
+@pytest.mark.asyncio
+async def test_progress_channel_limits_flush_rate() -> None:
+    emitted: list[tuple] = []
+    channel = make_channel(emitted, max_rate=20.0)
+    channel.start()
+
+    def compute() -> None:
+        for plane in range(1, 201):
+            channel.post("field_progress", f"{plane}/200")
+            threading.Event().wait(0.002)
+
+    thread = threading.Thread(target=compute)
+    thread.start()
+    await asyncio.to_thread(thread.join)
+    await channel.aclose()
+
+    # About 0.4 s of ticks at one flush per 50 ms, plus the final drain.
+    assert 2 <= len(emitted) <= 14
+    assert emitted[-1][1] == "200/200"
+
+
+@pytest.mark.asyncio
+async def test_progress_channel_estimates_field_eta_from_plane_rate() -> None:
+    now = [0.0]
+    emitted: list[tuple] = []
+    channel = make_channel(emitted, max_rate=1000.0, clock=lambda: now[0])
+    channel.start()
+
+    async def post_and_flush(stage: str, message: str | None = None) -> None:
+        count = len(emitted)
+        channel.post(stage, message)
+        while len(emitted) == count:
+            await asyncio.sleep(0.001)
+
+    await post_and_flush("build_field_start")
+    await post_and_flush("field_progress", "10/100")
+    now[0] = 2.0
+    await post_and_flush("field_progress", "30/100")
+    # A new field build starts its own estimate.
+    await post_and_flush("build_field_start")
+    await post_and_flush("field_progress", "5/50")
+    await channel.aclose()
+
+    etas = [eta for stage, _message, eta, _metrics in emitted if stage == "field_progress"]
+    assert etas[0] is None
+    assert etas[1] == pytest.approx(7.0)
+    assert etas[2] is None
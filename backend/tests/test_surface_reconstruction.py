@@ -0,0 +1,491 @@
+import numpy as np
+import pytest
+
+from backend.geometry import surface_reconstruction
+from backend.geometry.surface_reconstruction import (
+    CancellationToken,
+    SurfaceReconstructionCancelled,
+    SurfaceReconstructionContext,
+    SurfaceReconstructionStats,
+    _flood_fill_outside_air_bfs,
+    _voxel_shell_of_solid_adjacent_to_loop,
+    build_field_from_points,
+    compute_surface_mesh_from_xyz,
+    compute_surface_points_from_xyz,
+    flood_fill_outside_air,
+    map_shell_voxels_to_original_points,
+    narrow_band_mask,
+    voxel_shell_of_solid_adjacent_to,
+)
+
+
+def make_sphere_points(count: int = 3000, radius: float = 0.2, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    directions = rng.normal(size=(count, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    return (directions * radius).astype(np.float32)
+
+
+def make_hollow_box(size: int = 12) -> np.ndarray:
+    solid = np.zeros((size, size, size), dtype=bool)
+    solid[2:-2, 2:-2, 2:-2] = True
+    solid[4:-4, 4:-4, 4:-4] = False
+    return solid
+
+
+def test_flood_fill_excludes_enclosed_cavity() -> None:
+    air = ~make_hollow_box()
+
+    outside = flood_fill_outside_air(air)
+
+    assert outside[0, 0, 0]
+    assert not outside[6, 6, 6]
+    assert not outside[3, 3, 3]
+    assert np.array_equal(outside, _flood_fill_outside_air_bfs(air))
+
+
+def test_flood_fill_matches_reference_on_random_grids() -> None:
+    rng = np.random.default_rng(7)
+    for shape, air_ratio in [((9, 11, 13), 0.45), ((16, 16, 16), 0.6), ((5, 20, 7), 0.3)]:
+        air = rng.random(shape) < air_ratio
+
+        assert np.array_equal(flood_fill_outside_air(air), _flood_fill_outside_air_bfs(air))
+
+
+def test_flood_fill_handles_grid_without_air() -> None:
+    air = np.zeros((4, 4, 4), dtype=bool)
+
+    assert not flood_fill_outside_air(air).any()
+
+
+def test_shell_of_hollow_box_is_outer_surface_only() -> None:
+    solid = make_hollow_box()
+    outside = flood_fill_outside_air(~solid)
+
+    shell = voxel_shell_of_solid_adjacent_to(solid, outside)
+
+    assert shell[2, 6, 6]
+    assert not shell[3, 6, 6]
+    assert not shell[3, 3, 3]
+    assert not (shell & ~solid).any()
+
+
+def test_shell_matches_reference_on_random_grids() -> None:
+    rng = np.random.default_rng(11)
+    for shape, solid_ratio in [((8, 9, 10), 0.5), ((15, 12, 6), 0.7), ((3, 3, 3), 0.4)]:
+        solid = rng.random(shape) < solid_ratio
+        adjacent_to = (rng.random(shape) < 0.5) & ~solid
+        # Adjacent voxels that overlap the solid must behave the same in both implementations.
+        adjacent_to[0] |= solid[0]
+
+        assert np.array_equal(
+            voxel_shell_of_solid_adjacent_to(solid, adjacent_to),
+            _voxel_shell_of_solid_adjacent_to_loop(solid, adjacent_to),
+        )
+
+
+@pytest.mark.parametrize("mode", ["nn", "radius"])
+def test_shell_mapping_matches_row_dedup_reference(mode) -> None:
+    cKDTree, _ndimage = surface_reconstruction._require_scipy()
+    rng = np.random.default_rng(5)
+    points = rng.uniform(0.0, 0.4, size=(20_000, 3)).astype(np.float32)
+    # Repeated coordinates at different indices collapse to one row in "nn" mode.
+    points[1::5] = points[0:-1:5]
+    shell = rng.random((20, 20, 20)) < 0.2
+    origin = np.zeros(3, dtype=np.float32)
+    centers = surface_reconstruction.voxel_centers_from_mask(shell, origin, 0.02)
+    tree = cKDTree(points)
+    if mode == "nn":
+        expected = np.unique(points[tree.query(centers, k=1)[1]], axis=0)
+    else:
+        lists = tree.query_ball_point(centers, r=0.025)
+        expected = points[np.unique(np.fromiter((i for l in lists for i in l), dtype=np.int64))]
+
+    mapped = map_shell_voxels_to_original_points(
+        shell_mask=shell, origin=origin, voxel_size=0.02, original_points=points, mode=mode
+    )
+
+    assert mapped.dtype == np.float32
+    assert np.array_equal(mapped, expected)
+
+
+def test_narrow_band_mask_covers_every_node_within_radius() -> None:
+    rng = np.random.default_rng(5)
+    points = rng.random((40, 3)).astype(np.float32) * 0.3
+    origin = np.array([-0.05, -0.05, -0.05], dtype=np.float32)
+    dims = (41, 41, 41)
+    voxel_size = 0.01
+
+    band = narrow_band_mask(points, origin, dims, voxel_size, band_radius=0.03)
+
+    nodes = origin[None, :] + np.argwhere(np.ones(dims, dtype=bool)) * voxel_size
+    nearest = np.min(np.linalg.norm(nodes[:, None, :] - points[None, :, :], axis=2), axis=1)
+    assert band.reshape(-1)[nearest <= 0.03].all()
+    assert not band.all()
+
+
+def test_narrow_band_field_matches_full_field_near_points() -> None:
+    points = make_sphere_points()
+
+    full, origin, dims = build_field_from_points(points, 0.02, 0.02, 0.05)
+    banded, banded_origin, banded_dims = build_field_from_points(
+        points, 0.02, 0.02, 0.05, band_sigmas=3.0
+    )
+
+    assert banded_dims == dims
+    assert np.array_equal(banded_origin, origin)
+    near = full >= np.exp(-9.0)
+    assert np.allclose(banded[near], full[near])
+    assert np.all(banded[~near] < np.exp(-9.0))
+
+
+def test_narrow_band_surface_matches_full_surface() -> None:
+    points = make_sphere_points()
+
+    full = compute_surface_points_from_xyz(points, voxel_size=0.02, sigma=0.02)
+    banded = compute_surface_points_from_xyz(
+        points, voxel_size=0.02, sigma=0.02, field_band_sigmas=3.0
+    )
+
+    assert full.shape[0] > 0
+    assert np.array_equal(banded, full)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"memory_budget_bytes": 64 * 1024 * 1024},
+        {"preview_voxel_factors": (2.0,)},
+    ],
+)
+def test_narrow_band_must_reach_past_the_iso_level(kwargs) -> None:
+    points = make_sphere_points()
+
+    # exp(-1.0**2) ~ 0.37 > iso_level, so the band edge would become the surface.
+    with pytest.raises(ValueError, match="cuts the field off before iso_level"):
+        compute_surface_points_from_xyz(
+            points, voxel_size=0.02, sigma=0.02, iso_level=0.3, field_band_sigmas=1.0, **kwargs
+        )
+    with pytest.raises(ValueError, match="cuts the field off before iso_level"):
+        compute_surface_mesh_from_xyz(
+            points, voxel_size=0.02, sigma=0.02, iso_level=0.3, field_band_sigmas=1.0
+        )
+
+
+def test_distance_transform_field_is_exact_for_points_on_grid_nodes() -> None:
+    rng = np.random.default_rng(9)
+    nodes = np.unique(rng.integers(0, 20, size=(300, 3)), axis=0)
+    points = (nodes * 0.02).astype(np.float32)
+
+    kdtree_field, origin, dims = build_field_from_points(points, 0.02, 0.03, 0.06)
+    edt_field, edt_origin, edt_dims = build_field_from_points(
+        points, 0.02, 0.03, 0.06, engine="edt"
+    )
+
+    assert edt_dims == dims
+    assert np.array_equal(edt_origin, origin)
+    assert edt_field.dtype == np.float32
+    assert np.allclose(edt_field, kdtree_field, atol=1e-4)
+
+
+def test_distance_transform_surface_stays_within_one_voxel_of_kdtree_surface() -> None:
+    points = make_sphere_points(count=6000)
+
+    kdtree_surface = compute_surface_points_from_xyz(points, voxel_size=0.02, sigma=0.02)
+    edt_surface = compute_surface_points_from_xyz(
+        points, voxel_size=0.02, sigma=0.02, field_engine="edt"
+    )
+
+    gaps = np.linalg.norm(edt_surface[:, None, :] - kdtree_surface[None, :, :], axis=2)
+    assert edt_surface.shape[0] > 0
+    assert gaps.min(axis=1).max() <= 0.03
+    assert gaps.min(axis=0).max() <= 0.03
+
+
+def test_unknown_field_engine_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown field engine"):
+        build_field_from_points(make_sphere_points(count=50), 0.02, 0.02, 0.05, engine="fft")
+
+
+def make_hollow_blob_points(count: int = 4000, seed: int = 4) -> np.ndarray:
+    # Two overlapping spheres give a cavity plus concave regions across tile faces.
+    first = make_sphere_points(count // 2, radius=0.2, seed=seed)
+    second = make_sphere_points(count // 2, radius=0.15, seed=seed + 1) + np.float32(0.18)
+    return np.concatenate([first, second])
+
+
+@pytest.mark.parametrize(
+    ("options", "budget"),
+    [
+        ({}, 200_000),
+        ({"closing_radius": 1}, 250_000),
+        ({"field_band_sigmas": 3.0}, 150_000),
+        ({"field_engine": "edt"}, 800_000),
+        ({"map_mode": "radius"}, 150_000),
+    ],
+)
+def test_tiled_reconstruction_matches_full_grid(options, budget) -> None:
+    points = make_hollow_blob_points()
+    kwargs = {"voxel_size": 0.02, "sigma": 0.025, **options}
+    stats = SurfaceReconstructionStats()
+
+    full = compute_surface_points_from_xyz(points, **kwargs)
+    tiled = compute_surface_points_from_xyz(
+        points, memory_budget_bytes=budget, stats=stats, **kwargs
+    )
+
+    assert stats.tile_count > 1
+    assert 0 < stats.peak_working_set_bytes <= budget
+    assert full.shape[0] > 0
+    assert np.array_equal(tiled, full)
+
+
+def test_tiled_reconstruction_rejects_budget_below_one_plane() -> None:
+    with pytest.raises(ValueError, match="memory budget"):
+        compute_surface_points_from_xyz(
+            make_hollow_blob_points(), voxel_size=0.02, sigma=0.025, memory_budget_bytes=1000
+        )
+
+
+def test_untiled_reconstruction_reports_working_set() -> None:
+    stats = SurfaceReconstructionStats()
+
+    compute_surface_points_from_xyz(make_sphere_points(), voxel_size=0.02, sigma=0.02, stats=stats)
+
+    assert stats.tile_count == 1
+    assert stats.peak_working_set_bytes > 0
+
+
+def test_reconstruction_records_stage_metrics() -> None:
+    stats = SurfaceReconstructionStats()
+    events = []
+
+    def status_cb(stage: str, message: str | None = None) -> None:
+        metrics = stats.stage_metrics_for(stage)
+        if metrics is not None:
+            events.append(stage)
+
+    result = compute_surface_points_from_xyz(
+        make_hollow_blob_points(),
+        voxel_size=0.02,
+        sigma=0.025,
+        closing_radius=1,
+        stats=stats,
+        status_cb=status_cb,
+    )
+
+    metrics = {m.stage: m for m in stats.stages}
+    assert list(metrics) == ["build_field", "closing", "flood_fill", "shell", "surface_points"]
+    assert events == [f"{stage}_done" for stage in metrics]
+    dims = metrics["build_field"].grid_dims
+    assert all(m.grid_dims == dims for m in stats.stages[:-1])
+    assert metrics["build_field"].kd_queries == dims[0] * dims[1] * dims[2]
+    assert metrics["surface_points"].kd_queries == metrics["shell"].active_voxels
+    assert metrics["flood_fill"].kd_queries == 0
+    assert 0 < result.shape[0] <= metrics["shell"].active_voxels
+    assert all(m.wall_seconds >= 0.0 and m.cpu_seconds >= 0.0 for m in stats.stages)
+
+
+@pytest.mark.parametrize("options", [{}, {"memory_budget_bytes": 150_000}])
+def test_normals_are_unit_length_and_face_outside_air(options) -> None:
+    points = make_hollow_blob_points()
+    stats = SurfaceReconstructionStats()
+
+    result = compute_surface_points_from_xyz(
+        points, voxel_size=0.02, sigma=0.025, normal_neighbors=12, stats=stats, **options
+    )
+    plain = compute_surface_points_from_xyz(points, voxel_size=0.02, sigma=0.025, **options)
+
+    assert result.shape == (plain.shape[0], 6)
+    np.testing.assert_array_equal(result[:, :3], plain)
+    normals = result[:, 3:]
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0, atol=1e-5)
+    # Every surface point lies on one of the two spheres; face away from its center.
+    on_first = np.abs(np.linalg.norm(result[:, :3], axis=1) - 0.2) < 1e-4
+    centers = np.where(on_first[:, None], np.float32(0.0), np.float32(0.18))
+    outward = np.einsum("ij,ij->i", normals, result[:, :3] - centers)
+    assert (outward > 0.0).mean() > 0.99
+    assert stats.stages[-1].stage == "normals"
+    assert stats.stages[-1].kd_queries == result.shape[0]
+
+
+def test_mesh_covers_outer_surface_only_and_winds_outward() -> None:
+    pytest.importorskip("skimage")
+    # An inner sphere sealed inside the outer one must not show up in the mesh.
+    points = np.concatenate(
+        [make_sphere_points(4000, radius=0.2), make_sphere_points(1000, radius=0.08, seed=5)]
+    )
+    stats = SurfaceReconstructionStats()
+
+    mesh = compute_surface_mesh_from_xyz(points, voxel_size=0.02, sigma=0.02, stats=stats)
+    coarse = compute_surface_mesh_from_xyz(points, voxel_size=0.02, sigma=0.02, mesh_step=2)
+
+    assert mesh.triangle_count > 0
+    assert mesh.triangles.dtype == np.uint32
+    assert int(mesh.triangles.max()) < mesh.vertex_count
+    radii = np.linalg.norm(mesh.vertices, axis=1)
+    assert radii.min() > 0.15
+    corners = mesh.vertices[mesh.triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    assert (np.einsum("ij,ij->i", normals, corners.mean(axis=1)) > 0.0).all()
+    assert 0 < coarse.triangle_count < mesh.triangle_count
+    assert [m.stage for m in stats.stages][-1] == "mesh"
+
+
+def test_mesh_output_rejects_tiled_and_parallel_runs() -> None:
+    points = make_sphere_points()
+
+    with pytest.raises(ValueError, match="parallel_workers"):
+        compute_surface_mesh_from_xyz(points, parallel_workers=2)
+    with pytest.raises(ValueError, match="memory budget"):
+        compute_surface_mesh_from_xyz(points, voxel_size=0.02, memory_budget_bytes=100_000)
+    with pytest.raises(ValueError, match="mesh_step"):
+        compute_surface_mesh_from_xyz(points, mesh_step=0)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"closing_radius": 1, "field_band_sigmas": 3.0}, {"field_engine": "edt"}],
+)
+def test_parallel_reconstruction_matches_single_process(options) -> None:
+    points = make_hollow_blob_points()
+    kwargs = {"voxel_size": 0.02, "sigma": 0.025, **options}
+    stats = SurfaceReconstructionStats()
+
+    serial = compute_surface_points_from_xyz(points, **kwargs)
+    parallel = compute_surface_points_from_xyz(points, parallel_workers=2, stats=stats, **kwargs)
+
+    assert stats.tile_count > 1
+    assert serial.shape[0] > 0
+    assert np.array_equal(parallel, serial)
+
+
+def test_parallel_jobs_share_one_tile_pool() -> None:
+    points = make_hollow_blob_points()
+    kwargs = {"voxel_size": 0.02, "sigma": 0.025, "parallel_workers": 2}
+
+    first = compute_surface_points_from_xyz(points, **kwargs)
+    pool = surface_reconstruction._tile_pool
+    second = compute_surface_points_from_xyz(points, **kwargs)
+
+    assert pool is not None
+    assert surface_reconstruction._tile_pool is pool
+    assert np.array_equal(first, second)
+    surface_reconstruction.shutdown_tile_pool()
+    assert surface_reconstruction._tile_pool is None
+
+
+@pytest.mark.parametrize("options", [{}, {"memory_budget_bytes": 200_000, "map_mode": "radius"}])
+def test_reconstruction_builds_one_kdtree_per_job(monkeypatch, options) -> None:
+    cKDTree, ndimage = surface_reconstruction._require_scipy()
+    built = []
+
+    class CountingTree(cKDTree):
+        def __init__(self, data, *args, **kwargs) -> None:
+            built.append(len(data))
+            super().__init__(data, *args, **kwargs)
+
+    monkeypatch.setattr(surface_reconstruction, "_require_scipy", lambda: (CountingTree, ndimage))
+    points = make_hollow_blob_points()
+    context = SurfaceReconstructionContext(points)
+
+    result = compute_surface_points_from_xyz(
+        points, voxel_size=0.02, sigma=0.025, context=context, **options
+    )
+
+    assert result.shape[0] > 0
+    # Radius mapping also builds small trees over batches of shell centers.
+    assert [size for size in built if size == points.shape[0]] == [points.shape[0]]
+    assert all(size <= surface_reconstruction._MAP_QUERY_BATCH for size in built[1:])
+    assert context.has_tree
+    _dists, idx = context.tree.query(result[:5])
+    assert np.array_equal(points[idx], result[:5])
+
+
+def test_progressive_passes_stream_coarse_previews_and_match_full_result() -> None:
+    points = make_hollow_blob_points()
+    previews: list[tuple[int, float, int]] = []
+    stages: list[str] = []
+
+    result = compute_surface_points_from_xyz(
+        points,
+        voxel_size=0.01,
+        sigma=0.02,
+        closing_radius=1,
+        preview_voxel_factors=(2.0, 4.0),
+        preview_cb=lambda index, voxel, pts: previews.append((index, voxel, pts.shape[0])),
+        status_cb=lambda stage, message=None: stages.append(stage),
+    )
+
+    assert [(index, voxel) for index, voxel, _count in previews] == [(0, 0.04), (1, 0.02)]
+    assert 0 < previews[0][2] < previews[1][2] < result.shape[0]
+    assert stages.count("preview_ready") == 2
+    # The guided final pass only evaluates the field near the preview shell.
+    assert stages.count("field_band") == 2
+    expected = compute_surface_points_from_xyz(
+        points, voxel_size=0.01, sigma=0.02, closing_radius=1
+    )
+    assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize("options", [{}, {"memory_budget_bytes": 200_000}])
+def test_cancelled_reconstruction_stops_at_next_field_slab(options) -> None:
+    points = make_hollow_blob_points()
+    token = CancellationToken()
+    progress: list[str] = []
+
+    def status_cb(stage: str, message: str | None = None) -> None:
+        if stage == "field_progress":
+            progress.append(message)
+            token.cancel()
+
+    with pytest.raises(SurfaceReconstructionCancelled) as excinfo:
+        compute_surface_points_from_xyz(
+            points, voxel_size=0.01, sigma=0.02, status_cb=status_cb, cancel_token=token, **options
+        )
+
+    assert excinfo.value.stage == "build_field"
+    assert 0 < excinfo.value.fraction_done < 0.7
+    assert len(progress) == 1
+
+
+def test_cancel_before_mapping_reports_most_work_done() -> None:
+    token = CancellationToken()
+
+    def status_cb(stage: str, message: str | None = None) -> None:
+        if stage == "shell_done":
+            token.cancel()
+
+    with pytest.raises(SurfaceReconstructionCancelled) as excinfo:
+        compute_surface_points_from_xyz(
+            make_sphere_points(), voxel_size=0.02, status_cb=status_cb, cancel_token=token
+        )
+
+    assert excinfo.value.stage == "map_to_original"
+    assert excinfo.value.fraction_done == pytest.approx(0.9)
+
+
+def test_preprocessing_downsamples_before_reconstruction() -> None:
+    points = np.vstack([make_sphere_points(6000), [[1.5, 1.5, 1.5]]]).astype(np.float32)
+    stats = SurfaceReconstructionStats()
+    stages: list[tuple[str, str | None]] = []
+
+    result = compute_surface_points_from_xyz(
+        points,
+        voxel_size=0.02,
+        sigma=0.02,
+        downsample_voxel_size=0.01,
+        outlier_neighbors=8,
+        stats=stats,
+        status_cb=lambda stage, message=None: stages.append((stage, message)),
+    )
+
+    names = [stage for stage, _message in stages]
+    assert names.index("downsample_done") < names.index("outlier_filter_done")
+    assert names.index("preprocess_done") < names.index("build_field_start")
+    assert stats.input_point_count == points.shape[0]
+    assert 0.2 < stats.reduction_ratio < 0.9
+    # Still a subset of the uploaded points, without the stray one.
+    assert {tuple(p) for p in result} <= {tuple(p) for p in points}
+    assert not np.any(np.all(result == points[-1], axis=1))
@@ -0,0 +1,38 @@
+import pytest
+
+from backend.runtime.surface_result_stream import ChunkSendTiming, ResultChunkSizer
+
+
+def timing(point_count: int, send_seconds: float) -> ChunkSendTiming:
+    return ChunkSendTiming(
+        stream_seq_id=1,
+        chunk_index=0,
+        point_count=point_count,
+        byte_count=point_count * 6,
+        encode_seconds=0.0,
+        send_seconds=send_seconds,
+    )
+
+
+def test_chunk_size_targets_frame_latency_within_bounds() -> None:
+    sizer = ResultChunkSizer(target_frame_seconds=0.1, points_per_second=100_000.0)
+
+    assert sizer.chunk_points(1_000_000) == 10_000
+    assert sizer.chunk_points(1_000_000, cap=4_000) == 4_000
+    assert sizer.chunk_points(500) == 500
+    assert ResultChunkSizer(points_per_second=1.0).chunk_points(1_000_000) == 2048
+    assert ResultChunkSizer(points_per_second=1e9).chunk_points(1_000_000) == 200_000
+
+
+def test_chunk_size_follows_measured_throughput() -> None:
+    sizer = ResultChunkSizer(target_frame_seconds=0.1, points_per_second=100_000.0)
+
+    for _ in range(20):
+        sizer.record(timing(10_000, 1.0))
+
+    assert sizer.points_per_second == pytest.approx(10_000.0, rel=0.01)
+    assert sizer.chunk_points(1_000_000) == 2048
+
+    for _ in range(20):
+        sizer.record(timing(10_000, 0.01))
+    assert sizer.chunk_points(1_000_000) == pytest.approx(100_000, rel=0.01)
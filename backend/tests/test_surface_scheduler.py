@@ -0,0 +1,109 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.models.surface import SurfaceProcessingConfig
+from backend.runtime.surface_scheduler import SurfaceJobScheduler, estimate_surface_grid_voxels
+
+
+async def hold_slot(
+    scheduler: SurfaceJobScheduler,
+    job_id: str,
+    owner_id: str,
+    voxels: int,
+    release: asyncio.Event,
+    admitted: list[str],
+    updates: dict[str, list[tuple[int, float]]] | None = None,
+) -> None:
+    def on_update(position: int, eta_seconds: float) -> None:
+        if updates is not None:
+            updates.setdefault(job_id, []).append((position, eta_seconds))
+
+    async with scheduler.slot(
+        job_id, owner_id=owner_id, estimated_voxels=voxels, on_update=on_update
+    ):
+        admitted.append(job_id)
+        await release.wait()
+
+
+def test_grid_estimate_matches_padded_bounds() -> None:
+    points = np.array([[0.0, 0.0, 0.0], [1.0, 0.5, 0.25]], dtype=np.float32)
+    config = SurfaceProcessingConfig(voxel_size=0.05, padding=0.05)
+
+    assert estimate_surface_grid_voxels(points, config) == 23 * 13 * 8
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_slots_and_alternates_owners() -> None:
+    scheduler = SurfaceJobScheduler(slots=1)
+    releases = {job_id: asyncio.Event() for job_id in ("a1", "a2", "a3", "b1")}
+    admitted: list[str] = []
+
+    tasks = [
+        asyncio.create_task(hold_slot(scheduler, "a1", "alice", 100, releases["a1"], admitted)),
+        asyncio.create_task(hold_slot(scheduler, "a2", "alice", 900, releases["a2"], admitted)),
+        asyncio.create_task(hold_slot(scheduler, "a3", "alice", 500, releases["a3"], admitted)),
+        asyncio.create_task(hold_slot(scheduler, "b1", "bob", 5000, releases["b1"], admitted)),
+    ]
+    await asyncio.sleep(0)
+
+    assert admitted == ["a1"]
+    # Bob has not been served yet; alice's smaller job goes before her larger one.
+    assert scheduler.queued_job_ids == ["b1", "a3", "a2"]
+
+    for job_id in ("a1", "b1", "a3", "a2"):
+        releases[job_id].set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    await asyncio.gather(*tasks)
+    assert admitted == ["a1", "b1", "a3", "a2"]
+    assert scheduler.running_job_ids == []
+
+
+@pytest.mark.asyncio
+async def test_scheduler_reports_queue_position_and_eta() -> None:
+    scheduler = SurfaceJobScheduler(slots=1, seconds_per_voxel=0.01)
+    release = asyncio.Event()
+    admitted: list[str] = []
+    updates: dict[str, list[tuple[int, float]]] = {}
+
+    tasks = [
+        asyncio.create_task(
+            hold_slot(scheduler, job_id, owner, 100, release, admitted, updates)
+        )
+        for job_id, owner in (("first", "a"), ("second", "b"), ("third", "c"))
+    ]
+    await asyncio.sleep(0)
+
+    assert "first" not in updates
+    (second_position, second_eta), = updates["second"]
+    (third_position, third_eta), = updates["third"]
+    assert (second_position, third_position) == (1, 2)
+    assert second_eta == pytest.approx(1.0, abs=0.05)
+    assert third_eta == pytest.approx(2.0, abs=0.05)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert updates["third"][-1][0] == 1
+
+
+@pytest.mark.asyncio
+async def test_withdrawn_job_leaves_the_queue() -> None:
+    scheduler = SurfaceJobScheduler(slots=1)
+    release = asyncio.Event()
+    admitted: list[str] = []
+    running = asyncio.create_task(hold_slot(scheduler, "running", "a", 1, release, admitted))
+    queued = asyncio.create_task(hold_slot(scheduler, "queued", "b", 1, release, admitted))
+    await asyncio.sleep(0)
+
+    assert scheduler.withdraw("queued", RuntimeError("aborted"))
+    with pytest.raises(RuntimeError, match="aborted"):
+        await queued
+    assert scheduler.queued_job_ids == []
+    assert not scheduler.withdraw("running", RuntimeError("aborted"))
+
+    release.set()
+    await running
+    assert admitted == ["running"]
@@ -1,8 +1,28 @@
+import json
+from contextlib import asynccontextmanager
+
 import numpy as np
+import pytest
 from fastapi.testclient import TestClient
 
 from backend.app import create_app
-from backend.geometry.pointcloud_transport import iter_encoded_pcd2_chunks
+from backend.geometry.mesh_transport import (
+    MESH_HEADER_SIZE,
+    MESH_KIND_TRIANGLES,
+    MESH_KIND_VERTICES,
+    decode_mesh_header,
+)
+from backend.geometry.pointcloud_transport import (
+    PCD_CODEC_LZMA,
+    PcdAssembly,
+    decode_normal_chunk,
+    decode_pcd2_chunk,
+    decode_pcd2_header,
+    iter_encoded_pcd2_chunks,
+    iter_encoded_pcd3_chunks,
+)
+from backend.geometry.surface_mesh import SurfaceMesh
+from backend.runtime.surface_scheduler import SurfaceJobScheduler
 from backend.websocket import surface_router
 
 
@@ -17,6 +37,8 @@ def test_surface_websocket_upload_and_process(monkeypatch) -> None:
     )
 
     app = create_app()
+    # Keep reconstruction in-process so the patched function is used.
+    app.state.surface_worker = None
     points = np.array(
         [
             [0.0, 0.0, 0.0],
@@ -91,3 +113,474 @@ def test_surface_websocket_upload_and_process(monkeypatch) -> None:
         "chunkCount": 1,
         "streamSeqId": 1,
     }
+
+
+class _QueuedOnceScheduler(SurfaceJobScheduler):
+    """Reports two queue positions, then admits the job straight away."""
+
+    @asynccontextmanager
+    async def slot(self, job_id, *, owner_id, estimated_voxels, on_update=None):
+        on_update(2, 1.5)
+        on_update(1, 0.5)
+        yield
+
+
+def test_surface_websocket_sends_queue_positions_before_processing_start(monkeypatch) -> None:
+    monkeypatch.setattr(
+        surface_router,
+        "compute_surface_points_from_xyz",
+        lambda points_xyz, **kwargs: np.asarray(points_xyz, dtype=np.float32),
+    )
+    app = create_app()
+    app.state.surface_worker = None
+    app.state.surface_scheduler = _QueuedOnceScheduler()
+    points = np.zeros((3, 3), dtype=np.float32)
+
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {"type": "beginSurfaceUpload", "requestId": "req-begin", "config": {"minPoints": 1}}
+        )
+        job_id = websocket.receive_json()["jobId"]
+        for payload, _chunk in iter_encoded_pcd2_chunks(points, chunk_points=10, seq_id=1):
+            websocket.send_bytes(payload)
+        websocket.receive_json()
+        websocket.receive_json()
+        websocket.send_json(
+            {"type": "finishSurfaceUpload", "requestId": "req-finish", "jobId": job_id}
+        )
+        stages = [websocket.receive_json() for _ in range(3)]
+
+    assert [event["stage"] for event in stages] == ["queued", "queued", "processing_start"]
+    assert [event["queuePosition"] for event in stages[:2]] == [2, 1]
+    assert stages[1]["etaSeconds"] == pytest.approx(0.5)
+
+
+def test_surface_websocket_streams_preview_passes_before_result() -> None:
+    rng = np.random.default_rng(3)
+    directions = rng.normal(size=(3000, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    points = (directions * 0.2).astype(np.float32)
+
+    app = create_app()
+    app.state.surface_worker = None
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {
+                "type": "beginSurfaceUpload",
+                "requestId": "req-begin",
+                "config": {"voxelSize": 0.02, "previewVoxelFactors": [3.0]},
+            }
+        )
+        job_id = websocket.receive_json()["jobId"]
+        for payload, _chunk in iter_encoded_pcd2_chunks(points, chunk_points=1000, seq_id=1):
+            websocket.send_bytes(payload)
+        for _ in range(4):
+            websocket.receive_json()
+        websocket.send_json(
+            {"type": "finishSurfaceUpload", "requestId": "req-finish", "jobId": job_id}
+        )
+
+        events = []
+        progress_metrics = []
+        while True:
+            message = websocket.receive()
+            if message.get("text") is None:
+                events.append("binary")
+                continue
+            event = json.loads(message["text"])
+            if event["type"] == "surfaceProcessingProgress":
+                if event.get("metrics"):
+                    progress_metrics.append(event["metrics"])
+                continue
+            events.append(event)
+            if event["type"] == "surfaceResultStreamCompleted" and event["streamSeqId"] == 1:
+                break
+
+    preview, preview_chunk, preview_completed, ready, result_chunk, completed = events
+    assert preview["type"] == "surfacePreviewReady"
+    assert preview["passIndex"] == 0 and preview["passCount"] == 1
+    assert preview["voxelSize"] == pytest.approx(0.06)
+    assert preview["streamSeqId"] == 2
+    assert preview_chunk == "binary" and result_chunk == "binary"
+    assert preview_completed["streamSeqId"] == 2
+    assert preview_completed["pointCount"] == preview["pointCount"]
+    assert ready["type"] == "surfaceJobReady"
+    assert ready["streamSeqId"] == 1
+    assert ready["resultPointCount"] > preview["pointCount"]
+    assert completed["pointCount"] == ready["resultPointCount"]
+    # Progress events may coalesce a preview stage into the final one; the ready
+    # event lists every stage of both passes.
+    assert all(metrics in ready["stageMetrics"] for metrics in progress_metrics)
+    assert [m["stage"] for m in ready["stageMetrics"]].count("build_field") == 2
+    assert progress_metrics[-1] == ready["stageMetrics"][-1]
+    assert progress_metrics[-1]["stage"] == "surface_points"
+    assert progress_metrics[-1]["kdQueries"] > 0
+
+
+def test_surface_websocket_abort_stops_processing_and_reports_saved_compute() -> None:
+    rng = np.random.default_rng(3)
+    directions = rng.normal(size=(3000, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    points = (directions * 0.2).astype(np.float32)
+
+    app = create_app()
+    app.state.surface_worker = None
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {"type": "beginSurfaceUpload", "requestId": "req-begin", "config": {"voxelSize": 0.004}}
+        )
+        job_id = websocket.receive_json()["jobId"]
+        for payload, _chunk in iter_encoded_pcd2_chunks(points, chunk_points=3000, seq_id=1):
+            websocket.send_bytes(payload)
+        websocket.receive_json()
+        websocket.receive_json()
+        websocket.send_json(
+            {"type": "finishSurfaceUpload", "requestId": "req-finish", "jobId": job_id}
+        )
+        while websocket.receive_json()["stage"] != "field_progress":
+            pass
+        websocket.send_json({"type": "abortSurfaceJob", "requestId": "req-abort", "jobId": job_id})
+
+        event = websocket.receive_json()
+        while event["type"] == "surfaceProcessingProgress":
+            event = websocket.receive_json()
+
+    assert event["type"] == "surfaceJobAborted"
+    assert event["requestId"] == "req-abort"
+    assert event["cancelledStage"] == "build_field"
+    assert 0 < event["fractionDone"] < 0.7
+    assert event["estimatedSavedSeconds"] > 0
+
+
+def test_surface_websocket_streams_result_one_chunk_at_a_time(monkeypatch) -> None:
+    def fake_compute_surface_points_from_xyz(points_xyz, **kwargs):
+        return np.asarray(points_xyz, dtype=np.float32)
+
+    monkeypatch.setattr(
+        surface_router, "compute_surface_points_from_xyz", fake_compute_surface_points_from_xyz
+    )
+
+    app = create_app()
+    app.state.surface_worker = None
+    points = np.arange(15, dtype=np.float32).reshape(5, 3)
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {
+                "type": "beginSurfaceUpload",
+                "requestId": "req-begin",
+                "config": {"minPoints": 1, "resultChunkPoints": 2},
+            }
+        )
+        job_id = websocket.receive_json()["jobId"]
+        for payload, _chunk in iter_encoded_pcd2_chunks(points, chunk_points=10, seq_id=1):
+            websocket.send_bytes(payload)
+        websocket.receive_json()
+        websocket.receive_json()
+        websocket.send_json(
+            {"type": "finishSurfaceUpload", "requestId": "req-finish", "jobId": job_id}
+        )
+
+        assert websocket.receive_json()["stage"] == "processing_start"
+        ready = websocket.receive_json()
+        chunks = [decode_pcd2_chunk(websocket.receive_bytes()) for _ in range(3)]
+        completed = websocket.receive_json()
+
+    assert ready["chunkCount"] == 3
+    assert [chunk.point_count for chunk in chunks] == [2, 2, 1]
+    assert [chunk.chunk_index for chunk in chunks] == [0, 1, 2]
+    assert completed["chunkCount"] == 3
+    assert completed["pointCount"] == 5
+
+
+def test_surface_websocket_streams_normals_after_each_chunk(monkeypatch) -> None:
+    calls = []
+
+    def fake_compute_surface_points_from_xyz(points_xyz, **kwargs):
+        calls.append(kwargs)
+        pts = np.asarray(points_xyz, dtype=np.float32)
+        normals = np.tile(np.array([[0.0, 0.0, 1.0]], dtype=np.float32), (len(pts), 1))
+        return np.concatenate([pts, normals], axis=1)
+
+    monkeypatch.setattr(
+        surface_router, "compute_surface_points_from_xyz", fake_compute_surface_points_from_xyz
+    )
+
+    app = create_app()
+    app.state.surface_worker = None
+    points = np.arange(15, dtype=np.float32).reshape(5, 3)
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {
+                "type": "beginSurfaceUpload",
+                "requestId": "req-begin",
+                "config": {"minPoints": 1, "resultChunkPoints": 3, "normalNeighbors": 8},
+            }
+        )
+        job_id = websocket.receive_json()["jobId"]
+        for payload, _chunk in iter_encoded_pcd2_chunks(points, chunk_points=10, seq_id=1):
+            websocket.send_bytes(payload)
+        websocket.receive_json()
+        websocket.receive_json()
+        websocket.send_json(
+            {"type": "finishSurfaceUpload", "requestId": "req-finish", "jobId": job_id}
+        )
+
+        assert websocket.receive_json()["stage"] == "processing_start"
+        ready = websocket.receive_json()
+        frames = [websocket.receive_bytes() for _ in range(2 * ready["chunkCount"])]
+        completed = websocket.receive_json()
+
+    assert calls[0]["normal_neighbors"] == 8
+    assert ready["normalFormat"] == "oct16"
+    assert ready["resultPointCount"] == 5
+    chunks = [decode_pcd2_chunk(frame) for frame in frames[::2]]
+    normals = [decode_normal_chunk(frame) for frame in frames[1::2]]
+    assert [chunk.point_count for chunk in chunks] == [3, 2]
+    assert [(n.chunk_index, n.point_count) for n in normals] == [(0, 3), (1, 2)]
+    np.testing.assert_allclose(np.concatenate([n.normals for n in normals]), [[0, 0, 1]] * 5)
+    assert completed["chunkCount"] == 2
+
+
+def test_surface_websocket_refuses_mesh_output_without_scikit_image(monkeypatch) -> None:
+    def missing_skimage() -> None:
+        raise RuntimeError("Mesh output requires scikit-image.")
+
+    monkeypatch.setattr(surface_router, "ensure_mesh_support", missing_skimage)
+
+    app = create_app()
+    app.state.surface_worker = None
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {"type": "beginSurfaceUpload", "requestId": "req-mesh", "config": {"output": "mesh"}}
+        )
+        error = websocket.receive_json()
+        websocket.send_json({"type": "beginSurfaceUpload", "requestId": "req-points"})
+        started = websocket.receive_json()
+
+    assert error["type"] == "surfaceJobError"
+    assert error["code"] == "surfaceMeshUnavailable"
+    assert error["requestId"] == "req-mesh"
+    assert "scikit-image" in error["message"]
+    assert started["type"] == "surfaceUploadStarted"
+
+
+def test_surface_websocket_streams_mesh_output(monkeypatch) -> None:
+    calls = []
+
+    def fake_compute_surface_mesh_from_xyz(points_xyz, **kwargs):
+        calls.append(kwargs)
+        pts = np.asarray(points_xyz, dtype=np.float32)
+        return SurfaceMesh(
+            vertices=pts[:4], triangles=np.array([[0, 1, 2], [0, 2, 3]], dtype=np.uint32)
+        )
+
+    monkeypatch.setattr(
+        surface_router, "compute_surface_mesh_from_xyz", fake_compute_surface_mesh_from_xyz
+    )
+    monkeypatch.setattr(surface_router, "ensure_mesh_support", lambda: None)
+
+    app = create_app()
+    app.state.surface_worker = None
+    points = np.arange(15, dtype=np.float32).reshape(5, 3)
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {
+                "type": "beginSurfaceUpload",
+                "requestId": "req-begin",
+                "config": {"minPoints": 1, "output": "mesh", "meshStep": 2},
+            }
+        )
+        job_id = websocket.receive_json()["jobId"]
+        for payload, _chunk in iter_encoded_pcd2_chunks(points, chunk_points=10, seq_id=1):
+            websocket.send_bytes(payload)
+        websocket.receive_json()
+        websocket.receive_json()
+        websocket.send_json(
+            {"type": "finishSurfaceUpload", "requestId": "req-finish", "jobId": job_id}
+        )
+
+        assert websocket.receive_json()["stage"] == "processing_start"
+        ready = websocket.receive_json()
+        payloads = [websocket.receive_bytes() for _ in range(ready["chunkCount"])]
+        completed = websocket.receive_json()
+
+    assert calls[0]["mesh_step"] == 2
+    assert "map_mode" not in calls[0]
+    assert ready["output"] == "mesh"
+    assert ready["resultPointCount"] == 4
+    assert ready["triangleCount"] == 2
+    headers = [decode_mesh_header(payload) for payload in payloads]
+    assert [header.kind for header in headers] == [MESH_KIND_VERTICES, MESH_KIND_TRIANGLES]
+    quantized = np.frombuffer(payloads[0], dtype=np.uint16, offset=MESH_HEADER_SIZE)
+    triangles = np.frombuffer(payloads[1], dtype=np.uint32, offset=MESH_HEADER_SIZE)
+    vertices = quantized.reshape(-1, 3).astype(np.float32) * headers[0].scale + headers[0].minv
+    np.testing.assert_array_equal(triangles.reshape(-1, 3), [[0, 1, 2], [0, 2, 3]])
+    np.testing.assert_allclose(vertices, points[:4], atol=1e-3)
+    assert completed["type"] == "surfaceResultStreamCompleted"
+    assert completed["chunkCount"] == ready["chunkCount"]
+
+
+def test_surface_websocket_negotiates_compressed_transport(monkeypatch) -> None:
+    def fake_compute_surface_points_from_xyz(points_xyz, **kwargs):
+        return np.asarray(points_xyz, dtype=np.float32)
+
+    monkeypatch.setattr(
+        surface_router, "compute_surface_points_from_xyz", fake_compute_surface_points_from_xyz
+    )
+
+    app = create_app()
+    app.state.surface_worker = None
+    points = np.random.default_rng(2).uniform(-1.0, 1.0, size=(100, 3)).astype(np.float32)
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {
+                "type": "beginSurfaceUpload",
+                "requestId": "req-begin",
+                "config": {"minPoints": 1, "resultChunkPoints": 40},
+                "resultFormats": ["pcd9", "pcd3", "pcd2"],
+                "resultCodecs": ["brotli", "lzma"],
+            }
+        )
+        started = websocket.receive_json()
+        for payload, _chunk in iter_encoded_pcd3_chunks(points, chunk_points=30, seq_id=1):
+            websocket.send_bytes(payload)
+        uploaded = [websocket.receive_json() for _ in range(5)][-1]
+        websocket.send_json(
+            {"type": "finishSurfaceUpload", "requestId": "req-finish", "jobId": started["jobId"]}
+        )
+
+        assert websocket.receive_json()["stage"] == "processing_start"
+        ready = websocket.receive_json()
+        payloads = [websocket.receive_bytes() for _ in range(ready["chunkCount"])]
+        websocket.receive_json()
+
+    assert started["resultFormat"] == "pcd3"
+    assert started["resultCodec"] == "lzma"
+    assert "pcd3" in started["uploadFormats"]
+    assert uploaded["type"] == "surfaceUploadCompleted"
+    assert ready["resultFormat"] == "pcd3"
+    assert all(payload[:4] == b"PCD3" for payload in payloads)
+    assert {decode_pcd2_header(payload).codec for payload in payloads} == {PCD_CODEC_LZMA}
+    assembly = PcdAssembly.from_header(decode_pcd2_header(payloads[0]))
+    for payload in payloads:
+        result = assembly.add_payload(payload)
+    # Compressed results come back Morton-sorted; the point set is unchanged.
+    scale = float(assembly.scale.max())
+    assert result.shape == points.shape
+    assert np.allclose(np.sort(result, axis=0), np.sort(points, axis=0), atol=2 * scale)
+
+
+@pytest.mark.parametrize(
+    "offer",
+    [{"resultFormats": ["pcd9"]}, {"resultFormats": ["pcd3"], "resultCodecs": ["brotli"]}],
+)
+def test_surface_websocket_rejects_results_it_cannot_encode(offer) -> None:
+    app = create_app()
+    app.state.surface_worker = None
+    with TestClient(app).websocket_connect("/ws/surface") as websocket:
+        websocket.send_json({"type": "beginSurfaceUpload", "requestId": "req-begin", **offer})
+        error = websocket.receive_json()
+
+    assert error["type"] == "surfaceJobError"
+    assert error["code"] == "surfaceResultFormatUnsupported"
+    assert error["requestId"] == "req-begin"
+    assert app.state.registry.surface_jobs == {}
+
+
+def test_surface_websocket_resumes_an_interrupted_upload(monkeypatch) -> None:
+    monkeypatch.setattr(
+        surface_router,
+        "compute_surface_points_from_xyz",
+        lambda points_xyz, **kwargs: np.asarray(points_xyz, dtype=np.float32),
+    )
+
+    app = create_app()
+    app.state.surface_worker = None
+    client = TestClient(app)
+    points = np.arange(30, dtype=np.float32).reshape(10, 3)
+    payloads = [
+        payload for payload, _chunk in iter_encoded_pcd2_chunks(points, chunk_points=3, seq_id=1)
+    ]
+    with client.websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {"type": "beginSurfaceUpload", "requestId": "req-begin", "config": {"minPoints": 1}}
+        )
+        started = websocket.receive_json()
+        job_id = started["jobId"]
+        for payload in (payloads[0], payloads[2]):
+            websocket.send_bytes(payload)
+            websocket.receive_json()
+    detached_at = app.state.registry.get_surface_job(job_id).detached_at
+
+    with client.websocket_connect("/ws/surface") as websocket:
+        websocket.send_json(
+            {
+                "type": "resumeSurfaceUpload",
+                "requestId": "req-resume",
+                "jobId": job_id,
+                "resumeToken": started["resumeToken"],
+            }
+        )
+        resumed = websocket.receive_json()
+
+        websocket.send_bytes(payloads[2])
+        duplicate = websocket.receive_json()
+        for index in resumed["missingChunkIndices"]:
+            websocket.send_bytes(payloads[index])
+            progress = websocket.receive_json()
+        completed = websocket.receive_json()
+
+    assert detached_at is not None
+    assert resumed["type"] == "surfaceUploadResumed"
+    assert resumed["chunkCount"] == 4
+    assert resumed["chunksReceived"] == 2
+    assert resumed["missingChunkIndices"] == [1, 3]
+    assert duplicate["code"] == "surfaceUploadChunkInvalid"
+    assert progress["chunksReceived"] == 4
+    assert completed["type"] == "surfaceUploadCompleted"
+    assert completed["pointCount"] == 10
+
+
+def test_surface_websocket_resume_requires_the_token_and_detaches_the_old_connection() -> None:
+    app = create_app()
+    app.state.surface_worker = None
+    client = TestClient(app)
+    points = np.arange(30, dtype=np.float32).reshape(10, 3)
+    payloads = [
+        payload for payload, _chunk in iter_encoded_pcd2_chunks(points, chunk_points=3, seq_id=1)
+    ]
+    with client.websocket_connect("/ws/surface") as first:
+        first.send_json({"type": "beginSurfaceUpload", "requestId": "req-begin"})
+        started = first.receive_json()
+        first.send_bytes(payloads[0])
+        first.receive_json()
+
+        with client.websocket_connect("/ws/surface") as second:
+            resume = {
+                "type": "resumeSurfaceUpload",
+                "requestId": "req-resume",
+                "jobId": started["jobId"],
+                "resumeToken": "guessed",
+            }
+            second.send_json(resume)
+            denied = second.receive_json()
+            second.send_json(dict(resume, resumeToken=started["resumeToken"]))
+            resumed = second.receive_json()
+
+            first.send_bytes(payloads[1])
+            stale_chunk = first.receive_json()
+            first.send_json(
+                {"type": "abortSurfaceJob", "requestId": "req-abort", "jobId": started["jobId"]}
+            )
+            stale_abort = first.receive_json()
+
+            second.send_bytes(payloads[1])
+            progress = second.receive_json()
+
+    assert denied["type"] == "surfaceJobError"
+    assert denied["code"] == "surfaceResumeDenied"
+    assert resumed["type"] == "surfaceUploadResumed"
+    assert resumed["missingChunkIndices"] == [1, 2, 3]
+    assert stale_chunk["code"] == "surfaceJobNotOwned"
+    assert stale_abort["code"] == "surfaceJobNotOwned"
+    assert progress["chunksReceived"] == 2
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from backend.geometry.surface_reconstruction import (
+    CancellationToken,
+    SurfaceReconstructionCancelled,
+    SurfaceReconstructionStats,
+    compute_surface_points_from_xyz,
+)
+from backend.runtime.surface_worker import SurfaceReconstructionWorker
+
+
+def make_sphere_points(count: int = 3000, radius: float = 0.2) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    directions = rng.normal(size=(count, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    return (directions * radius).astype(np.float32)
+
+
+@pytest.mark.asyncio
+async def test_worker_process_matches_in_process_reconstruction() -> None:
+    points = make_sphere_points()
+    stages: list[str] = []
+    live_stats = SurfaceReconstructionStats()
+    measured: list[str] = []
+    worker = SurfaceReconstructionWorker()
+
+    def status_cb(stage: str, message: str | None = None) -> None:
+        stages.append(stage)
+        if live_stats.stage_metrics_for(stage) is not None:
+            measured.append(stage)
+
+    try:
+        result, stats = await worker.run(
+            points, voxel_size=0.02, sigma=0.02, status_cb=status_cb, stats=live_stats
+        )
+    finally:
+        worker.shutdown()
+
+    expected = compute_surface_points_from_xyz(points, voxel_size=0.02, sigma=0.02)
+    assert np.array_equal(result, expected)
+    assert stats.peak_working_set_bytes > 0
+    assert stages[0] == "build_field_start"
+    assert stages[-1] == "surface_points_done"
+    # Stage metrics reach the caller's stats with their `_done` events.
+    assert live_stats.stages == stats.stages
+    assert measured == [f"{metrics.stage}_done" for metrics in stats.stages]
+
+
+@pytest.mark.asyncio
+async def test_worker_process_reports_reconstruction_errors() -> None:
+    worker = SurfaceReconstructionWorker()
+
+    try:
+        with pytest.raises(ValueError, match="Too few points"):
+            await worker.run(make_sphere_points(count=10), min_points=200)
+    finally:
+        worker.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_worker_process_forwards_preview_passes() -> None:
+    points = make_sphere_points()
+    previews: list[tuple[int, float, np.ndarray]] = []
+    worker = SurfaceReconstructionWorker()
+
+    try:
+        result, _stats = await worker.run(
+            points,
+            voxel_size=0.02,
+            sigma=0.02,
+            preview_voxel_factors=(3.0,),
+            preview_cb=lambda index, voxel, pts: previews.append((index, voxel, pts)),
+        )
+    finally:
+        worker.shutdown()
+
+    assert len(previews) == 1
+    index, voxel, preview = previews[0]
+    assert index == 0 and voxel == pytest.approx(0.06)
+    assert 0 < preview.shape[0] < result.shape[0]
+
+
+@pytest.mark.asyncio
+async def test_worker_process_stops_when_cancelled() -> None:
+    token = CancellationToken()
+    worker = SurfaceReconstructionWorker()
+
+    def status_cb(stage: str, message: str | None = None) -> None:
+        if stage == "field_progress":
+            token.cancel()
+
+    try:
+        with pytest.raises(SurfaceReconstructionCancelled) as excinfo:
+            await worker.run(
+                make_sphere_points(),
+                voxel_size=0.004,
+                sigma=0.02,
+                status_cb=status_cb,
+                cancel_token=token,
+            )
+    finally:
+        worker.shutdown()
+
+    assert excinfo.value.stage == "build_field"
+    assert excinfo.value.fraction_done < 0.7
@@ -56,6 +56,9 @@ const WORKSPACE_RESOLUTIONS: Record<
 
 const DEFAULT_SURFACE_WS_URL = "ws://127.0.0.1:8000/ws/surface";
 const PCD_HEADER_BYTES = 52;
+const UPLOAD_CHUNK_POINTS = 200_000;
+const MAX_UPLOAD_RESUMES = 3;
+const UPLOAD_RESUME_DELAY_MS = 1000;
 const MIN_WORKSPACE_SAMPLE_COUNT = 1000;
 const MAX_WORKSPACE_SAMPLE_COUNT = 8_000_000;
 
@@ -135,12 +138,40 @@ function createAbortError(message = "Workspace generation aborted") {
   return error;
 }
 
+function createSocketClosedError(message = "Surface WebSocket closed.") {
+  const error = new Error(message);
+  error.name = "SurfaceSocketClosed";
+  return error;
+}
+
+function isSocketClosedError(error: unknown) {
+  return error instanceof Error && error.name === "SurfaceSocketClosed";
+}
+
 function throwIfAborted(signal?: AbortSignal) {
   if (signal?.aborted) {
     throw createAbortError();
   }
 }
 
+function delay(ms: number, signal?: AbortSignal) {
+  return new Promise<void>((resolve, reject) => {
+    if (signal?.aborted) {
+      reject(createAbortError());
+      return;
+    }
+    const handleAbort = () => {
+      clearTimeout(timer);
+      reject(createAbortError());
+    };
+    const timer = setTimeout(() => {
+      signal?.removeEventListener("abort", handleAbort);
+      resolve();
+    }, ms);
+    signal?.addEventListener("abort", handleAbort, { once: true });
+  });
+}
+
 function nextFrame() {
   return new Promise<void>((resolve) => {
     requestAnimationFrame(() => resolve());
@@ -159,6 +190,8 @@ function describeSurfaceClientMessage(message: SurfaceClientMessage): string {
       return `surface sent finishSurfaceUpload -> ${message.jobId}`;
     case "abortSurfaceJob":
       return `surface sent abortSurfaceJob -> ${message.jobId}`;
+    case "resumeSurfaceUpload":
+      return `surface sent resumeSurfaceUpload -> ${message.jobId}`;
     default:
       return `surface sent ${JSON.stringify(message)}`;
   }
@@ -170,12 +203,16 @@ function describeSurfaceServerMessage(message: SurfaceServerMessage): string {
       return `surface received surfaceUploadStarted <- ${message.jobId}`;
     case "surfaceUploadProgress":
       return `surface received surfaceUploadProgress <- ${message.jobId} ${message.chunksReceived}/${message.chunkCount}`;
+    case "surfaceUploadResumed":
+      return `surface received surfaceUploadResumed <- ${message.jobId} missing=${message.missingChunkIndices.length}`;
     case "surfaceUploadCompleted":
       return `surface received surfaceUploadCompleted <- ${message.jobId} points=${message.pointCount}`;
     case "surfaceProcessingProgress":
       return `surface received surfaceProcessingProgress <- ${message.jobId} ${message.stage}${message.message ? ` (${message.message})` : ""}`;
     case "surfaceJobReady":
       return `surface received surfaceJobReady <- ${message.jobId} result=${message.resultPointCount}`;
+    case "surfacePreviewReady":
+      return `surface received surfacePreviewReady <- ${message.jobId} pass=${message.passIndex + 1}/${message.passCount} points=${message.pointCount}`;
     case "surfaceResultStreamCompleted":
       return `surface received surfaceResultStreamCompleted <- ${message.jobId} points=${message.pointCount}`;
     case "surfaceJobAborted":
@@ -360,7 +397,7 @@ function encodePcd2Chunk(
     scalez: number;
   },
 ) {
-  const end = Math.min(startIndex + 200_000, totalPoints);
+  const end = Math.min(startIndex + UPLOAD_CHUNK_POINTS, totalPoints);
   const pointCount = end - startIndex;
   const buf = new ArrayBuffer(PCD_HEADER_BYTES + pointCount * 3 * 2);
   const dv = new DataView(buf);
@@ -406,43 +443,63 @@ function encodePcd2Chunk(
   return buf;
 }
 
-async function sendPointCloud(
-  ws: WebSocket,
+interface PointCloudUpload {
+  points: THREE.Vector3[];
+  seqId: number;
+  chunkCount: number;
+  totalPoints: number;
+  minx: number;
+  miny: number;
+  minz: number;
+  scalex: number;
+  scaley: number;
+  scalez: number;
+}
+
+function createPointCloudUpload(
   points: THREE.Vector3[],
   seqId: number,
+): PointCloudUpload {
+  const totalPoints = points.length >>> 0;
+  const { minx, miny, minz, maxx, maxy, maxz } = computeBBox(points);
+  return {
+    points,
+    seqId,
+    chunkCount: Math.ceil(totalPoints / UPLOAD_CHUNK_POINTS) >>> 0,
+    totalPoints,
+    minx,
+    miny,
+    minz,
+    scalex: (maxx - minx || 1e-9) / 65535.0,
+    scaley: (maxy - miny || 1e-9) / 65535.0,
+    scalez: (maxz - minz || 1e-9) / 65535.0,
+  };
+}
+
+function encodeUploadChunk(upload: PointCloudUpload, chunkIndex: number) {
+  const { points, ...layout } = upload;
+  return encodePcd2Chunk(points, {
+    ...layout,
+    chunkIndex,
+    startIndex: chunkIndex * UPLOAD_CHUNK_POINTS,
+  });
+}
+
+async function sendPointCloud(
+  ws: WebSocket,
+  upload: PointCloudUpload,
   signal?: AbortSignal,
   onProgress?: (progress: WorkspaceProgress) => void,
 ) {
   throwIfAborted(signal);
-  const chunkPoints = 200_000;
-  const totalPoints = points.length >>> 0;
-  const { minx, miny, minz, maxx, maxy, maxz } = computeBBox(points);
-  const dx = maxx - minx || 1e-9;
-  const dy = maxy - miny || 1e-9;
-  const dz = maxz - minz || 1e-9;
-  const scalex = dx / 65535.0;
-  const scaley = dy / 65535.0;
-  const scalez = dz / 65535.0;
-  const chunkCount = Math.ceil(totalPoints / chunkPoints) >>> 0;
+  const { chunkCount } = upload;
 
   for (let chunkIndex = 0; chunkIndex < chunkCount; chunkIndex += 1) {
     throwIfAborted(signal);
-    const startIndex = chunkIndex * chunkPoints;
-    ws.send(
-      encodePcd2Chunk(points, {
-        seqId,
-        chunkIndex,
-        chunkCount,
-        totalPoints,
-        startIndex,
-        minx,
-        miny,
-        minz,
-        scalex,
-        scaley,
-        scalez,
-      }),
-    );
+    if (ws.readyState !== WebSocket.OPEN) {
+      throw createSocketClosedError();
+    }
+    ws.send(encodeUploadChunk(upload, chunkIndex));
     onProgress?.({
       percent: 60 + Math.round(((chunkIndex + 1) / chunkCount) * 30),
       label: "Uploading workspace",
@@ -451,6 +508,162 @@ async function sendPointCloud(
   }
 }
 
+interface UploadSession {
+  jobId: string;
+  resumeToken: string;
+}
+
+function waitForUploadCompleted(
+  ws: WebSocket,
+  session: UploadSession,
+  upload: PointCloudUpload,
+  signal?: AbortSignal,
+  onProgress?: (progress: WorkspaceProgress) => void,
+) {
+  return new Promise<void>((resolve, reject) => {
+    const cleanup = () => {
+      ws.removeEventListener("message", handleMessage);
+      ws.removeEventListener("close", handleClose);
+      ws.removeEventListener("error", handleClose);
+      signal?.removeEventListener("abort", handleAbort);
+    };
+
+    const fail = (error: Error) => {
+      cleanup();
+      reject(error);
+    };
+
+    const handleAbort = () => {
+      if (ws.readyState === WebSocket.OPEN) {
+        sendMessage(ws, {
+          type: "abortSurfaceJob",
+          requestId: nextRequestId("surface-abort"),
+          jobId: session.jobId,
+        });
+      }
+      fail(createAbortError());
+    };
+
+    const handleClose = () => {
+      emitSurfaceMessageLog("surface socket closed during upload");
+      fail(createSocketClosedError());
+    };
+
+    const handleMessage = (event: MessageEvent) => {
+      if (typeof event.data !== "string") {
+        return;
+      }
+      const message = parseServerMessage(event.data);
+      switch (message.type) {
+        case "surfaceUploadProgress":
+          onProgress?.({
+            percent:
+              60 +
+              Math.round(
+                (message.chunksReceived / Math.max(1, message.chunkCount)) * 20,
+              ),
+            label: "Uploading workspace",
+          });
+          return;
+        case "surfaceUploadResumed": {
+          onProgress?.({
+            percent:
+              60 +
+              Math.round(
+                (message.chunksReceived / Math.max(1, upload.chunkCount)) * 20,
+              ),
+            label: "Resuming workspace upload",
+          });
+          if (message.uploadComplete) {
+            cleanup();
+            resolve();
+            return;
+          }
+          // Without a chunk count the server has nothing yet; resend everything.
+          const missing =
+            message.chunkCount == null
+              ? Array.from({ length: upload.chunkCount }, (_, index) => index)
+              : message.missingChunkIndices;
+          for (const chunkIndex of missing) {
+            ws.send(encodeUploadChunk(upload, chunkIndex));
+          }
+          return;
+        }
+        case "surfaceUploadCompleted":
+          cleanup();
+          resolve();
+          return;
+        case "surfaceJobAborted":
+          fail(createAbortError());
+          return;
+        case "surfaceJobError":
+          fail(new Error(message.message));
+          return;
+        default:
+          return;
+      }
+    };
+
+    ws.addEventListener("message", handleMessage);
+    ws.addEventListener("close", handleClose);
+    ws.addEventListener("error", handleClose);
+    signal?.addEventListener("abort", handleAbort, { once: true });
+  });
+}
+
+/**
+ * Uploads the cloud and waits until the server holds all of it. When the
+ * socket drops mid-upload, reconnects and resumes the job with its token so
+ * only the missing chunks are sent again. Resolves with the live socket.
+ */
+async function uploadPointCloud(
+  ws: WebSocket,
+  session: UploadSession,
+  upload: PointCloudUpload,
+  signal?: AbortSignal,
+  onProgress?: (progress: WorkspaceProgress) => void,
+) {
+  let socket = ws;
+  for (let attempt = 0; ; attempt += 1) {
+    const completed = waitForUploadCompleted(
+      socket,
+      session,
+      upload,
+      signal,
+      onProgress,
+    );
+    // Observed below; keeps an early rejection from going unhandled.
+    completed.catch(() => undefined);
+    try {
+      if (attempt === 0) {
+        await sendPointCloud(socket, upload, signal, onProgress);
+      } else {
+        sendMessage(socket, {
+          type: "resumeSurfaceUpload",
+          requestId: nextRequestId("surface-resume"),
+          jobId: session.jobId,
+          resumeToken: session.resumeToken,
+        });
+      }
+      await completed;
+      return socket;
+    } catch (error) {
+      if (!isSocketClosedError(error) || attempt >= MAX_UPLOAD_RESUMES) {
+        if (socket !== ws) {
+          socket.close();
+        }
+        throw error;
+      }
+    }
+    socket.close();
+    emitSurfaceMessageLog(
+      `surface reconnecting to resume upload -> ${session.jobId} (attempt ${attempt + 1})`,
+    );
+    await delay(UPLOAD_RESUME_DELAY_MS * (attempt + 1), signal);
+    socket = await openSurfaceSocket(signal);
+  }
+}
+
 function decodePcdChunk(buf: ArrayBuffer, assemblies: Map<number, PcdAssembly>) {
   const dv = new DataView(buf);
   const magic = String.fromCharCode(
@@ -459,7 +672,10 @@ function decodePcdChunk(buf: ArrayBuffer, assemblies: Map<number, PcdAssembly>)
     dv.getUint8(2),
     dv.getUint8(3),
   );
-  if (magic !== "PCD2") return null;
+  if (magic !== "PCD2") {
+    // Fail instead of waiting forever on a stream this client cannot assemble.
+    throw new Error(`Unsupported surface result frame: ${magic}`);
+  }
 
   const seqId = dv.getUint32(4, true);
   const chunkCount = dv.getUint32(12, true);
@@ -581,7 +797,7 @@ export async function generateWorkspaceSurface({
     ws = await openSurfaceSocket(signal);
     emitSurfaceMessageLog("surface connected");
 
-    const startedPromise = new Promise<string>((resolve, reject) => {
+    const startedPromise = new Promise<UploadSession>((resolve, reject) => {
       const handleMessage = (event: MessageEvent) => {
           if (typeof event.data !== "string") {
             return;
@@ -589,7 +805,7 @@ export async function generateWorkspaceSurface({
         const message = parseServerMessage(event.data);
         if (message.type === "surfaceUploadStarted") {
           cleanup();
-          resolve(message.jobId);
+          resolve({ jobId: message.jobId, resumeToken: message.resumeToken });
           return;
         }
         if (message.type === "surfaceJobError") {
@@ -621,8 +837,22 @@ export async function generateWorkspaceSurface({
       type: "beginSurfaceUpload",
       requestId: nextRequestId("surface-begin"),
       config: surfaceConfig,
+      // decodePcdChunk only reads PCD2; PCD3 is for backend clients.
+      resultFormats: ["pcd2"],
     });
-    jobId = await startedPromise;
+    const session = await startedPromise;
+    jobId = session.jobId;
+
+    const sampledPoints = await sampleWorkspacePointCloud(
+      robot,
+      localRoot,
+      resolvedSampleCount,
+      signal,
+      onProgress,
+    );
+    emitSurfaceMessageLog(`surface sampled local cloud -> points=${sampledPoints.length}`);
+    const upload = createPointCloudUpload(sampledPoints, seqId);
+    ws = await uploadPointCloud(ws, session, upload, signal, onProgress);
 
     const resultPromise = new Promise<THREE.Vector3[]>((resolve, reject) => {
       let expectedSeqId: number | null = null;
@@ -671,19 +901,6 @@ export async function generateWorkspaceSurface({
           if (typeof event.data === "string") {
             const message = parseServerMessage(event.data);
             switch (message.type) {
-              case "surfaceUploadProgress":
-                onProgress?.({
-                  percent:
-                    60 +
-                    Math.round(
-                      (message.chunksReceived / Math.max(1, message.chunkCount)) *
-                        20,
-                    ),
-                  label: "Uploading workspace",
-                });
-                return;
-              case "surfaceUploadCompleted":
-                return;
               case "surfaceProcessingProgress":
                 onProgress?.({
                   percent: 90,
@@ -740,15 +957,6 @@ export async function generateWorkspaceSurface({
       signal?.addEventListener("abort", handleAbort, { once: true });
     });
 
-    const sampledPoints = await sampleWorkspacePointCloud(
-      robot,
-      localRoot,
-      resolvedSampleCount,
-      signal,
-      onProgress,
-    );
-    emitSurfaceMessageLog(`surface sampled local cloud -> points=${sampledPoints.length}`);
-    await sendPointCloud(ws, sampledPoints, seqId, signal, onProgress);
     sendMessage(ws, {
       type: "finishSurfaceUpload",
       requestId: nextRequestId("surface-finish"),
@@ -1,3 +1,8 @@
+export type PcdFormat = "pcd2" | "pcd3";
+export type PcdCodec = "zlib" | "lzma";
+export type SurfaceOutput = "points" | "mesh";
+export type NormalFormat = "oct16";
+
 export interface SurfaceProcessingConfig {
   voxelSize?: number;
   sigma?: number;
@@ -7,6 +12,33 @@ export interface SurfaceProcessingConfig {
   minPoints?: number;
   mapMode?: "nn" | "radius";
   mapRadius?: number | null;
+  fieldEngine?: "kdtree" | "edt";
+  fieldBandSigmas?: number | null;
+  memoryBudgetMb?: number | null;
+  parallelWorkers?: number | null;
+  previewVoxelFactors?: number[];
+  downsampleVoxelSize?: number | null;
+  downsampleMode?: "representative" | "centroid";
+  outlierNeighbors?: number | null;
+  outlierStdRatio?: number;
+  // Per-point normals (NRM1 frames) are for backend clients; the viewport never requests them.
+  normalNeighbors?: number | null;
+  resultPrecision?: number | null;
+  resultChunkPoints?: number | null;
+  progressMaxRate?: number | null;
+  // Mesh output (MSH1 frames) is for backend clients; the viewport only decodes PCD2 points.
+  output?: SurfaceOutput;
+  meshStep?: number;
+}
+
+export interface SurfaceStageReport {
+  stage: string;
+  wallSeconds: number;
+  cpuSeconds: number;
+  gridDims?: [number, number, number] | null;
+  activeVoxels?: number | null;
+  kdQueries: number;
+  peakRssDeltaBytes?: number | null;
 }
 
 export type SurfaceClientMessage =
@@ -14,6 +46,9 @@ export type SurfaceClientMessage =
       type: "beginSurfaceUpload";
       requestId: string;
       config?: SurfaceProcessingConfig;
+      // Most preferred first; the server picks the first one it supports.
+      resultFormats?: PcdFormat[];
+      resultCodecs?: PcdCodec[];
     }
   | {
       type: "finishSurfaceUpload";
@@ -24,6 +59,12 @@ export type SurfaceClientMessage =
       type: "abortSurfaceJob";
       requestId: string;
       jobId: string;
+    }
+  | {
+      type: "resumeSurfaceUpload";
+      requestId: string;
+      jobId: string;
+      resumeToken: string;
     };
 
 export type SurfaceServerMessage =
@@ -32,6 +73,10 @@ export type SurfaceServerMessage =
       requestId?: string | null;
       jobId: string;
       config: Required<SurfaceProcessingConfig>;
+      resultFormat: PcdFormat;
+      resultCodec: PcdCodec;
+      uploadFormats: PcdFormat[];
+      resumeToken: string;
     }
   | {
       type: "surfaceUploadProgress";
@@ -40,6 +85,15 @@ export type SurfaceServerMessage =
       chunkCount: number;
       pointCount: number;
     }
+  | {
+      type: "surfaceUploadResumed";
+      requestId?: string | null;
+      jobId: string;
+      chunkCount?: number | null;
+      chunksReceived: number;
+      missingChunkIndices: number[];
+      uploadComplete: boolean;
+    }
   | {
       type: "surfaceUploadCompleted";
       jobId: string;
@@ -51,6 +105,9 @@ export type SurfaceServerMessage =
       jobId: string;
       stage: string;
       message?: string | null;
+      queuePosition?: number | null;
+      etaSeconds?: number | null;
+      metrics?: SurfaceStageReport | null;
     }
   | {
       type: "surfaceJobReady";
@@ -58,7 +115,26 @@ export type SurfaceServerMessage =
       jobId: string;
       originalPointCount: number;
       resultPointCount: number;
-      resultFormat: "pcd2";
+      resultFormat: PcdFormat;
+      streamSeqId: number;
+      chunkCount?: number | null;
+      peakWorkingSetBytes?: number | null;
+      reductionRatio?: number | null;
+      stageMetrics?: SurfaceStageReport[];
+      output?: SurfaceOutput;
+      // Mesh output only; resultPointCount is then the vertex count.
+      triangleCount?: number | null;
+      // Set when every result chunk is followed by its NRM1 normals frame.
+      normalFormat?: NormalFormat | null;
+    }
+  | {
+      type: "surfacePreviewReady";
+      jobId: string;
+      passIndex: number;
+      passCount: number;
+      voxelSize: number;
+      pointCount: number;
+      resultFormat: PcdFormat;
       streamSeqId: number;
     }
   | {
@@ -72,6 +148,10 @@ export type SurfaceServerMessage =
       type: "surfaceJobAborted";
       requestId?: string | null;
       jobId: string;
+      cancelledStage?: string | null;
+      fractionDone?: number | null;
+      elapsedSeconds?: number | null;
+      estimatedSavedSeconds?: number | null;
     }
   | {
       type: "surfaceJobError";